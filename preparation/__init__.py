@@ -1,5 +1,72 @@
-from .data_clean import *
-from .data_load import *
-from .data_stats import *
-from .data_transform import *
-from .utils import *
+"""
+Data preparation package.
+
+Submodules, and the heavy dependencies they import (pandas, numpy, ...), are loaded lazily (PEP 562): the first
+access to a public name, e.g. preparation.load_from_csv, imports the submodule defining it.
+"""
+import importlib
+
+# public names, by defining submodule
+_SUBMODULES_ATTRIBUTES = {
+    "data_clean": ["clean_data", "calculate_time_between_dates", "NGRAM_SIZE", "SIMILARITY_THRESHOLD",
+                   "MIN_FUZZY_LENGTH", "DEFAULT_LANGUAGE_ALIASES", "normalize_language_name",
+                   "LanguageNameMatcher"],
+    "data_cube": ["LanguagesPlatformCube"],
+    "data_load": ["FALLBACK_ENCODING", "ENCODING_SAMPLE_SIZE", "CSV_ENGINES", "SURVEY_ARCHIVE_NAMES",
+                  "SURVEY_ARCHIVE_MEMBER", "SURVEY_YEARS", "is_archive", "find_archive_member", "detect_encoding",
+                  "load_from_csv", "get_survey_source", "load_surveys_data_from_csv", "iter_surveys",
+                  "aiter_surveys", "get_dataset_max_shapes", "get_intersection", "get_common_feature_list",
+                  "merge_dataframes", "get_10most_popular_languages_by_year"],
+    "data_memo": ["DEFAULT_CACHE_DIR", "DEFAULT_MAX_BYTES", "FINGERPRINT_BLOCK_ROWS", "frame_fingerprint",
+                  "fingerprint", "StatsMemo"],
+    "data_polars": ["BACKENDS", "TRANSCODE_BLOCK_SIZE", "check_backend", "scan_survey_csv", "read_survey_csv",
+                    "split_indicators", "binarize_columns", "concat_frames", "column_sums", "count_rows"],
+    "data_profile": ["PROFILE_CHUNK_SIZE", "TOP_VALUES", "SEPARATORS", "MULTI_SELECT_MIN_SHARE",
+                     "MULTI_SELECT_MAX_TOKENS_RATIO", "RENAME_MIN_SIMILARITY", "profile_source", "profile_surveys",
+                     "diff_profiles"],
+    "data_source": ["PANDAS_NA_VALUES", "open_source"],
+    "data_stats": ["map_any_case_to_lower", "drop_columns_from_map", "select_columns", "ColumnsRulesPlan",
+                   "compile_columns_rules", "LanguagesStatsExtractor", "LanguagesRankingExtractor",
+                   "LanguagesProficienciesPercentages", "LanguagesStatsSnapshot", "compute_sharded_snapshot",
+                   "LanguagesTransitionExtractor", "compute_transitions_by_year", "EXPERIENCE_BINS",
+                   "EXPERIENCE_LABELS", "parse_experience_value", "parse_experience_column", "experience_buckets",
+                   "build_experience_language_cube",
+                   "distinct_profiles", "align_language_indicators", "LanguagesCommunitiesExtractor",
+                   "LanguagesCombinationsExtractor", "compute_frequent_combinations_by_year"],
+    "data_transform": ["transform_unnamed_cols_base", "transform_unnamed_cols_range", "binarize_column",
+                       "binarize_columns_range", "first_valid_value_index", "feature_split", "column_split",
+                       "optimized_column_split", "feature_split_sparse", "feature_split_batch", "string_found",
+                       "df_2015_survey_preprocessing", "build_shared_categories", "encode_shared_categories",
+                       "drop_first_row", "find_colum_name"],
+    "data_weights": ["align_weights", "compute_marginals", "rake"],
+    "plotting": ["PLOTS_MANIFEST_NAME", "DEFAULT_FIGSIZE", "DEFAULT_FONT", "render_top_ten_plot",
+                 "render_top_ten_plots"],
+    "query_service": ["LRUCache", "QueryError", "SurveyStatsQueryService", "run_query_service"],
+    "trends": ["MIN_SEGMENT_SIZE", "fit_trends", "forecast_trends", "rank_by_momentum"],
+    "utils": ["map_languages_to_color_list"],
+}
+
+_ATTRIBUTES_SUBMODULE = {name: submodule
+                         for submodule, names in _SUBMODULES_ATTRIBUTES.items() for name in names}
+
+__all__ = sorted(_ATTRIBUTES_SUBMODULE)
+
+
+def __getattr__(name: str):
+    """
+    Loads a submodule, or a public name from its defining submodule, on first access
+    :param name: attribute name
+    :return: requested submodule or attribute
+    """
+    if name in _SUBMODULES_ATTRIBUTES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _ATTRIBUTES_SUBMODULE:
+        value = getattr(importlib.import_module(f".{_ATTRIBUTES_SUBMODULE[name]}", __name__), name)
+        # caching the attribute, so that next accesses do not go through __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_SUBMODULES_ATTRIBUTES) | set(__all__))
@@ -6,8 +6,28 @@ Date: October 2021
 """
 
 
+import re
+
+import numpy as np
 import pandas as pd
 
+# characters n-grams size of the language names index
+NGRAM_SIZE = 2
+# minimum Dice similarity of n-grams sets, for a raw value to be matched to a language name
+SIMILARITY_THRESHOLD = 0.55
+# minimum length of normalized names matched through n-grams: shorter ones (e.g. 'sql', 'go') share too few n-grams
+# with unrelated values (e.g. 'mysql', 'nosql') to tell them apart, and they are only matched exactly
+MIN_FUZZY_LENGTH = 4
+# common abbreviations and spelling variants, that n-grams alone cannot match, mapped to a language name or to a
+# tuple of the names it got over the survey years, the first one in the vocabulary being used
+_SHELL_NAMES = ("Bash/Shell/PowerShell", "Bash/Shell", "Bash/Shell (all shells)")
+DEFAULT_LANGUAGE_ALIASES = {
+    "Obj-C": "Objective-C", "ObjC": "Objective-C", "JS": "JavaScript", "ECMAScript": "JavaScript",
+    "TS": "TypeScript", "Golang": "Go", "CPP": "C++", "C plus plus": "C++", "C sharp": "C#", "F sharp": "F#",
+    "VB": ("VB.NET", "Visual Basic (.Net)", "Visual Basic 6", "Visual Basic"), "Shell": _SHELL_NAMES,
+    "Sh": _SHELL_NAMES, "Bash": _SHELL_NAMES, "PowerShell": ("PowerShell", "Bash/Shell/PowerShell"), "Py": "Python",
+}
+
 
 def clean_data(input_dataframe, target_feature: str):
     """Clean a dataframe with respect to a target feature.
@@ -67,3 +87,194 @@ def calculate_time_between_dates(date1, date2):
     """
     time_between_dates = abs(date1 - date2)
     return time_between_dates.days
+
+
+def normalize_language_name(value: str) -> str:
+    """Normalize a language name, before it is matched.
+
+    Names are lower cased, trailing versions are dropped (e.g. 'C++11', 'Python 3'), as well as whitespaces,
+    hyphens, dots and underscores (e.g. 'java script', 'Node.js'), while symbols such as '+', '#' and '/' are kept.
+
+    Args:
+        value: (str) raw language name
+
+    Returns:
+        normalized_name: (str) normalized language name
+    """
+    normalized_name = re.sub(r"\s*\d+(\.\d+)*$", "", str(value).strip().lower())
+    return re.sub(r"[\s\-._]+", "", normalized_name)
+
+
+def _ngrams(normalized_name: str, ngram_size: int) -> set:
+    """Compute the characters n-grams of a normalized name, padded to mark its beginning and end."""
+    padded = f"^{normalized_name}$"
+    return {padded[i:i + ngram_size] for i in range(max(1, len(padded) - ngram_size + 1))}
+
+
+class LanguageNameMatcher:
+    """Match raw language names (free-text answers, spelling variants) to canonical language names.
+
+    Canonical names, and their aliases, are indexed by characters n-grams: raw values are normalized (see
+    normalize_language_name), looked up exactly, then matched to the canonical name sharing most n-grams with them,
+    all the distinct values at once, through a sparse matrix product. Each distinct raw value is matched once,
+    results being cached.
+    """
+
+    # number of values matched at once
+    MATCH_BATCH_SIZE = 10000
+
+    def __init__(self, vocabulary: list, aliases: dict = None, ngram_size: int = NGRAM_SIZE,
+                 threshold: float = SIMILARITY_THRESHOLD, min_fuzzy_length: int = MIN_FUZZY_LENGTH):
+        """Build the n-grams index of canonical names.
+
+        Args:
+            vocabulary: (list) canonical language names, e.g. a ranking index
+            aliases: (dict) alias to canonical name, or to a tuple of candidate canonical names, mapping, defaults
+                to DEFAULT_LANGUAGE_ALIASES; an alias is mapped to its first candidate in vocabulary, aliases with
+                no candidate in vocabulary are ignored
+            ngram_size: (int) characters n-grams size
+            threshold: (float) minimum Dice similarity (0 to 1) of a raw value and a canonical name n-grams
+            min_fuzzy_length: (int) minimum length of normalized names and aliases matched through n-grams,
+                shorter ones being only matched exactly
+        """
+        from scipy import sparse
+
+        if aliases is None:
+            aliases = DEFAULT_LANGUAGE_ALIASES
+        self.__vocabulary = list(vocabulary)
+        self.__ngram_size = ngram_size
+        self.__threshold = threshold
+        self.__cache = {}
+
+        # exact lookup of normalized names, canonical names taking precedence over aliases
+        self.__exact = {}
+        for alias, names in aliases.items():
+            candidates = [name for name in ((names,) if isinstance(names, str) else names) if name in self.__vocabulary]
+            if candidates:
+                self.__exact.setdefault(normalize_language_name(alias), candidates[0])
+        for name in reversed(self.__vocabulary):
+            self.__exact[normalize_language_name(name)] = name
+
+        keys = list(self.__exact)
+        self.__keys_name = [self.__exact[key] for key in keys]
+        self.__ngrams_column = {}
+        rows, columns = [], []
+        for row, key in enumerate(keys):
+            for ngram in _ngrams(key, ngram_size):
+                rows.append(row)
+                columns.append(self.__ngrams_column.setdefault(ngram, len(self.__ngrams_column)))
+        self.__index = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)),
+                                         shape=(len(keys), len(self.__ngrams_column)))
+        self.__keys_size = np.asarray(self.__index.sum(axis=1)).ravel()
+        self.__fuzzy_keys = np.array([len(key) >= min_fuzzy_length for key in keys], dtype=bool)
+
+    def _match_normalized(self, normalized_values: list) -> list:
+        """Match normalized values with no exact match to canonical names, through the n-grams index.
+
+        Args:
+            normalized_values: (list) distinct normalized values
+
+        Returns:
+            names: (list) matched canonical names, None for values under the similarity threshold
+        """
+        from scipy import sparse
+
+        if not self.__keys_name:
+            return [None] * len(normalized_values)
+        names = []
+        for start in range(0, len(normalized_values), self.MATCH_BATCH_SIZE):
+            batch = normalized_values[start:start + self.MATCH_BATCH_SIZE]
+            rows, columns, values_size = [], [], np.zeros(len(batch))
+            for row, value in enumerate(batch):
+                value_ngrams = _ngrams(value, self.__ngram_size)
+                values_size[row] = len(value_ngrams)
+                for ngram in value_ngrams:
+                    column = self.__ngrams_column.get(ngram)
+                    if column is not None:
+                        rows.append(row)
+                        columns.append(column)
+            queries = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)),
+                                        shape=(len(batch), len(self.__ngrams_column)))
+            shared = (queries @ self.__index.T).toarray()
+            similarity = 2 * shared / (values_size[:, np.newaxis] + self.__keys_size[np.newaxis, :])
+            similarity[:, ~self.__fuzzy_keys] = 0
+            best = similarity.argmax(axis=1)
+            for row, key in enumerate(best):
+                names.append(self.__keys_name[key] if similarity[row, key] >= self.__threshold else None)
+        return names
+
+    def match_many(self, values) -> list:
+        """Match raw values to canonical names, each distinct value being matched once.
+
+        Args:
+            values: (iterable) raw language names; missing values are not matched
+
+        Returns:
+            names: (list) matched canonical names, None for unmatched values
+        """
+        values = list(values)
+        distinct_values = {value for value in values if isinstance(value, str) and value not in self.__cache}
+        pending = {}
+        for value in distinct_values:
+            normalized_value = normalize_language_name(value)
+            if normalized_value in self.__exact:
+                self.__cache[value] = self.__exact[normalized_value]
+            else:
+                pending.setdefault(normalized_value, []).append(value)
+        for normalized_value, name in zip(pending, self._match_normalized(list(pending))):
+            for value in pending[normalized_value]:
+                self.__cache[value] = name
+        return [self.__cache.get(value) if isinstance(value, str) else None for value in values]
+
+    def match(self, value: str):
+        """Match a raw value to a canonical name, see match_many."""
+        return self.match_many([value])[0]
+
+    def match_series(self, series: pd.Series) -> pd.Series:
+        """Match a column of raw values to canonical names.
+
+        Args:
+            series: (pandas.Series) raw language names
+
+        Returns:
+            names: (pandas.Series) matched canonical names, NaN for missing or unmatched values
+        """
+        codes, distinct_values = pd.factorize(series)
+        names = np.array(self.match_many(distinct_values) + [np.nan], dtype=object)
+        names[pd.isna(names)] = np.nan
+        # missing values (code -1) take the last element
+        return pd.Series(names[codes], index=series.index, name=series.name)
+
+    def normalize_answers(self, series: pd.Series, sep: str = ";") -> pd.Series:
+        """Normalize multi-select or free-text answers, such as 'Javascript, C++11', to canonical names.
+
+        Args:
+            series: (pandas.Series) answers, each one holding one or more language names
+            sep: (str) language names separator within answers
+
+        Returns:
+            answers: (pandas.Series) canonical names of each answer, in order and joined by sep, unmatched names
+                being dropped; NaN for answers with no matched name
+        """
+        # positional index, as series index may hold duplicates
+        tokens = pd.Series(series.to_numpy(), dtype=object).str.split(sep).explode()
+        names = self.match_series(tokens.str.strip()).dropna()
+        answers = names.groupby(level=0, sort=False).agg(lambda answer_names: sep.join(dict.fromkeys(answer_names)))
+        return pd.Series(answers.reindex(range(series.shape[0])).to_numpy(), index=series.index, name=series.name)
+
+    def get_vocabulary(self) -> list:
+        """Retrieve the canonical names matched to.
+
+        Returns:
+            vocabulary: (list) canonical names, in the given order
+        """
+        return list(self.__vocabulary)
+
+    def cache_info(self) -> dict:
+        """Retrieve the matches cache statistics.
+
+        Returns:
+            info: (dict) number of cached raw names ('size') and number of them matched to a canonical name
+                ('matched')
+        """
+        return {"size": len(self.__cache), "matched": sum(name is not None for name in self.__cache.values())}
@@ -0,0 +1,205 @@
+"""This module contains a precomputed year x platform x language aggregate cube, answering rankings, percentages and
+trends queries by slicing and summing, with no scan of respondents data."""
+import numpy as np
+import pandas as pd
+
+from .data_stats import select_columns
+
+
+class LanguagesPlatformCube:
+    """
+    Year x platform x language respondents count cube, along with respondents totals for each (year, platform) cell.
+
+    Platform answers are multiple choice, so that the whole population of a year is stored as a dedicated
+    ALL_PLATFORMS platform slice, rather than computed as a sum over platforms.
+    """
+
+    ALL_PLATFORMS = "(all)"
+
+    def __init__(self, years: list, platforms: list, languages: list, counts: np.ndarray, respondents: np.ndarray):
+        """
+        :param years: cube years
+        :param platforms: cube platforms, ALL_PLATFORMS included
+        :param languages: cube languages
+        :param counts: respondents count array, shaped (years, platforms, languages)
+        :param respondents: respondents totals array, shaped (years, platforms)
+        """
+        self.__years = [int(y) for y in years]
+        self.__platforms = [str(p) for p in platforms]
+        self.__languages = pd.Index([str(lang) for lang in languages])
+        self.__counts = counts
+        self.__respondents = respondents
+        self.__year_position = {y: i for i, y in enumerate(self.__years)}
+        self.__platform_position = {p: i for i, p in enumerate(self.__platforms)}
+
+    @classmethod
+    def from_surveys(cls, data_frames_dict: dict, platform_columns="PlatformWorkedWith", columns_selection_criteria=None,
+                     prefix_to_remove='', sep: str = ";") -> "LanguagesPlatformCube":
+        """
+        Builds the cube from preprocessed survey data, aggregating each year in a single matrix product between
+        platforms and languages indicators.
+        :param data_frames_dict: dataframe dictionary in the form of {year : dataframe}, with split languages columns
+        :param platform_columns: platform column name, or a dictionary in the form of {year : column name}. Years
+        with no platform column only get the ALL_PLATFORMS slice.
+        :param columns_selection_criteria: languages columns selection criteria (see data_stats.select_columns), or a
+        dictionary in the form of {year : selection criteria}
+        :param prefix_to_remove: a string to be removed from languages column names, or a dictionary in the form of
+        {year : prefix}
+        :param sep: separator of multiple platforms answers. If None, each answer is taken as a single platform.
+        :return: a LanguagesPlatformCube
+        """
+        years_aggregates = {}
+        for year, df in data_frames_dict.items():
+            platform_column = platform_columns.get(year) if isinstance(platform_columns, dict) else platform_columns
+            criteria = columns_selection_criteria[year] \
+                if isinstance(columns_selection_criteria, dict) else columns_selection_criteria
+            prefix = prefix_to_remove[year] if isinstance(prefix_to_remove, dict) else prefix_to_remove
+
+            df_languages = select_columns(df, criteria).select_dtypes(include="number")
+            languages = df_languages.columns.str.replace(prefix, '')
+            df_indicators = pd.DataFrame(df_languages.to_numpy() > 0, columns=languages)
+            if languages.has_duplicates:
+                # columns named alike once prefix is removed are a single language, used if any of them is set
+                df_indicators = df_indicators.T.groupby(level=0, sort=False).any().T
+                languages = df_indicators.columns
+            languages_indicators = df_indicators.to_numpy(dtype=float)
+
+            platforms = [cls.ALL_PLATFORMS]
+            counts = [languages_indicators.sum(axis=0)]
+            respondents = [df.shape[0]]
+            if platform_column is not None and platform_column in df.columns:
+                platforms_names, platforms_indicators = _platforms_indicators(df[platform_column], sep)
+                platforms += platforms_names
+                counts += list(platforms_indicators.T @ languages_indicators)
+                respondents += list(platforms_indicators.sum(axis=0))
+            years_aggregates[year] = (platforms, languages, np.array(counts), np.array(respondents))
+
+        # aligning years aggregates on the union of platforms and languages
+        all_platforms = pd.Index([cls.ALL_PLATFORMS])
+        all_languages = pd.Index([])
+        for platforms, languages, _, _ in years_aggregates.values():
+            all_platforms = all_platforms.append(pd.Index(platforms)).unique()
+            all_languages = all_languages.append(pd.Index(languages)).unique()
+
+        counts_cube = np.zeros((len(years_aggregates), len(all_platforms), len(all_languages)), dtype=np.int64)
+        respondents_cube = np.zeros((len(years_aggregates), len(all_platforms)), dtype=np.int64)
+        for i, (platforms, languages, counts, respondents) in enumerate(years_aggregates.values()):
+            platforms_positions = all_platforms.get_indexer(platforms)
+            languages_positions = all_languages.get_indexer(languages)
+            counts_cube[i][np.ix_(platforms_positions, languages_positions)] = counts
+            respondents_cube[i, platforms_positions] = respondents
+        return cls(list(years_aggregates), list(all_platforms), list(all_languages), counts_cube, respondents_cube)
+
+    def save(self, file_path: str) -> None:
+        """
+        Stores the cube on disk, as a numpy .npz archive
+        :param file_path: destination file path
+        """
+        np.savez(file_path, years=np.array(self.__years), platforms=np.array(self.__platforms),
+                 languages=np.array(self.__languages, dtype=str), counts=self.__counts, respondents=self.__respondents)
+
+    @classmethod
+    def load(cls, file_path: str) -> "LanguagesPlatformCube":
+        """
+        Loads a cube stored through save
+        :param file_path: source file path
+        :return: a LanguagesPlatformCube
+        """
+        with np.load(file_path) as stored:
+            return cls(stored["years"], stored["platforms"], stored["languages"], stored["counts"],
+                       stored["respondents"])
+
+    def get_years(self) -> list:
+        return list(self.__years)
+
+    def get_platforms(self) -> list:
+        return list(self.__platforms)
+
+    def get_languages(self) -> list:
+        return list(self.__languages)
+
+    def _cell(self, year: int, platform: str = None) -> tuple:
+        """
+        Finds a (year, platform) cell position
+        :param year: cube year
+        :param platform: cube platform, None standing for ALL_PLATFORMS
+        :return: year and platform positions
+        """
+        if platform is None:
+            platform = self.ALL_PLATFORMS
+        try:
+            return self.__year_position[year], self.__platform_position[platform]
+        except KeyError as e:
+            raise KeyError(f"No cube cell for year {year} and platform '{platform}'") from e
+
+    def ranking(self, year: int, platform: str = None, top: int = None) -> pd.Series:
+        """
+        Computes languages ranking, by number of respondents, in a year and on a platform
+        :param year: cube year
+        :param platform: cube platform. If None, the whole population of the year is considered.
+        :param top: if provided, only the first top languages are returned
+        :return: a series of languages respondents count, in descending order
+        """
+        y, p = self._cell(year, platform)
+        ranking = pd.Series(self.__counts[y, p], index=self.__languages).sort_values(ascending=False, kind="stable")
+        return ranking if top is None else ranking.iloc[:top]
+
+    def percentages(self, year: int, platform: str = None, top: int = None) -> pd.Series:
+        """
+        Computes languages percentages, with respect to the number of respondents in a year and on a platform
+        :param year: cube year
+        :param platform: cube platform. If None, the whole population of the year is considered.
+        :param top: if provided, only the first top languages are returned
+        :return: a series of languages percentages, in descending order, all 0 if there is no respondent in the year
+        and on the platform
+        """
+        y, p = self._cell(year, platform)
+        ranking = self.ranking(year, platform, top)
+        if self.__respondents[y, p] == 0:
+            return ranking.astype(float)
+        return (ranking / self.__respondents[y, p]) * 100
+
+    def trend(self, languages: list = None, platform: str = None, percentage: bool = True,
+              years: list = None) -> pd.DataFrame:
+        """
+        Computes languages trends over the years, on a platform
+        :param languages: languages to be considered. If None, all the languages are.
+        :param platform: cube platform. If None, the whole population of each year is considered.
+        :param percentage: if True, trends are expressed as percentages of respondents, otherwise as counts
+        :param years: years to be considered. If None, all the cube years are.
+        :return: a dataframe indexed by year, with a column for each language
+        """
+        if years is None:
+            years = self.__years
+        if platform is None:
+            platform = self.ALL_PLATFORMS
+        if languages is None:
+            languages = list(self.__languages)
+        years_positions = [self.__year_position[y] for y in years]
+        languages_positions = self.__languages.get_indexer(languages)
+        if (languages_positions < 0).any():
+            raise KeyError(f"Languages not in cube: {[lang for lang in languages if lang not in self.__languages]}")
+        p = self.__platform_position[platform]
+        values = self.__counts[years_positions, p][:, languages_positions]
+        if percentage:
+            totals = self.__respondents[years_positions, p].astype(float)
+            # years with no respondent on the platform have no meaningful percentage
+            totals[totals == 0] = np.nan
+            values = (values / totals[:, np.newaxis]) * 100
+        return pd.DataFrame(values, index=pd.Index(years, name="year"), columns=languages)
+
+
+def _platforms_indicators(platforms_answers: pd.Series, sep: str = None) -> tuple:
+    """
+    Builds platforms indicators matrix from platforms answers
+    :param platforms_answers: platforms answers
+    :param sep: separator of multiple platforms answers. If None, each answer is taken as a single platform.
+    :return: platform names list and respondents x platforms indicators matrix
+    """
+    answers = platforms_answers.reset_index(drop=True).dropna().astype(str)
+    if sep is not None:
+        answers = answers.str.split(sep).explode().str.strip()
+    codes, platforms = pd.factorize(answers)
+    indicators = np.zeros((platforms_answers.shape[0], len(platforms)))
+    indicators[answers.index.to_numpy(), codes] = 1
+    return list(platforms), indicators
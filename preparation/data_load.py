@@ -1,46 +1,436 @@
 """
 This file contains functions needed to load data from sources
 """
+import asyncio
+import codecs
 import os
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
 
+from .data_polars import check_backend, concat_frames, read_survey_csv
+from .data_source import PANDAS_NA_VALUES, open_source
+from .data_transform import build_shared_categories, encode_shared_categories
 
-def load_from_csv(file_path: str, encoding: str):
+# encoding used when a source file cannot be decoded as UTF-8
+FALLBACK_ENCODING = "ISO-8859-1"
+
+# number of bytes read from the beginning of a file to detect its encoding
+ENCODING_SAMPLE_SIZE = 1 << 20
+
+# CSV parser backends accepted by load_from_csv
+CSV_ENGINES = ("auto", "pyarrow", "c", "polars")
+
+# archive names, as shipped by Stack Overflow or renamed after the CSV naming convention, looked up by year
+SURVEY_ARCHIVE_NAMES = ("{year}_results.zip", "stack-overflow-developer-survey-{year}.zip",
+                        "developer_survey_{year}.zip")
+
+# results file inside the archives from 2017 onwards; older archives hold a single, differently named, CSV file
+SURVEY_ARCHIVE_MEMBER = "survey_results_public.csv"
+
+# survey years available, loaded by default
+SURVEY_YEARS = [2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024]
+
+# detected encodings, keyed by source signature (absolute path, size, modification time, archive member)
+_detected_encodings = {}
+
+
+def _source_signature(file_path: str, member: str = None) -> tuple:
+    """
+    Builds a key identifying a source content version, used to cache per-file results
+    :param file_path: path of the file
+    :param member: archive member name, if file_path is a zip archive
+    :return: a tuple made of absolute path, size and modification time of the file, and archive member
+    """
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, member
+
+
+def is_archive(file_path: str) -> bool:
+    """
+    Tells whether a source file is a zip archive
+    :param file_path: path of the file
+    :return: True if the file has a '.zip' extension
+    """
+    return str(file_path).lower().endswith(".zip")
+
+
+def find_archive_member(file_path: str) -> str:
+    """
+    Finds the survey results CSV file inside a zip archive
+    :param file_path: zip archive path
+    :return: SURVEY_ARCHIVE_MEMBER if present in the archive, otherwise the largest CSV file, skipping schema files
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        csv_members = [info for info in archive.infolist()
+                       if info.filename.lower().endswith(".csv") and not info.filename.startswith("__MACOSX")]
+    if not csv_members:
+        raise FileNotFoundError(f"No CSV file found in archive '{file_path}'")
+    for info in csv_members:
+        if os.path.basename(info.filename) == SURVEY_ARCHIVE_MEMBER:
+            return info.filename
+    results_members = [info for info in csv_members if "schema" not in os.path.basename(info.filename).lower()]
+    return max(results_members or csv_members, key=lambda info: info.file_size).filename
+
+
+def detect_encoding(file_path: str, member: str = None) -> str:
+    """
+    Detects source file encoding, looking at its first bytes. The result is cached, so that each file
+    is inspected only once, until it changes on disk.
+    :param file_path: file path to be inspected
+    :param member: archive member name, if file_path is a zip archive
+    :return: 'utf-8-sig' or 'utf-8' if the sample decodes as UTF-8, FALLBACK_ENCODING otherwise
+    """
+    signature = _source_signature(file_path, member)
+    if signature not in _detected_encodings:
+        with open_source(file_path, member) as source:
+            _detect_source_encoding(source, signature)
+    return _detected_encodings[signature]
+
+
+def _detect_source_encoding(source, signature: tuple) -> str:
+    """
+    Detects an opened source encoding, see detect_encoding. The source is rewound after its first bytes are read.
+    :param source: binary file object of the source
+    :param signature: source signature, see _source_signature
+    :return: detected encoding name
+    """
+    if signature not in _detected_encodings:
+        _detected_encodings[signature] = _detect_sample_encoding(source.read(ENCODING_SAMPLE_SIZE))
+        source.seek(0)
+    return _detected_encodings[signature]
+
+
+def _detect_sample_encoding(sample: bytes) -> str:
+    """
+    Detects encoding of a bytes sample, taken from the beginning of a file
+    :param sample: leading bytes of a file
+    :return: detected encoding name
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # a multibyte character may be truncated at the end of the sample, hence final=False
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+    return "utf-8"
+
+
+def load_from_csv(file_path: str, encoding: str = None, engine: str = "auto", usecols: list = None,
+                  member: str = None):
     """
     Loads single year survey data from CSV file
-    :param file_path: file path to get data from
-    :param encoding: cvs source file encoding
+    :param file_path: file path to get data from. It can also be a zip archive, read without extracting it.
+    :param encoding: cvs source file encoding. If None, it is detected (and cached) through detect_encoding
+    :param engine: CSV parser backend, one of CSV_ENGINES. 'pyarrow' uses the multi-threaded Arrow CSV reader,
+    'c' the pandas C parser, 'auto' uses Arrow when available, falling back to the pandas C parser otherwise.
+    'polars' uses a multi-threaded Polars lazy scan (see data_polars).
+    :param usecols: optional list of column names (or positions) to be loaded, all the others are skipped by the parser
+    :param member: CSV file to be read, if file_path is a zip archive. If None, it is found by find_archive_member.
     :return: a dataframe containing raw data from survey from a single year
     """
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"engine must be one of {CSV_ENGINES}, got '{engine}'")
+    if member is None and is_archive(file_path):
+        member = find_archive_member(file_path)
 
-    # in case no path is provided, assuming default path
-    return pd.read_csv(file_path, encoding=encoding)
+    encoding_detected = encoding is None
+    signature = _source_signature(file_path, member)
+    # the source is opened, and archive members decompressed, once: every read rewinds it
+    with open_source(file_path, member) as source:
+        if encoding_detected:
+            encoding = _detect_source_encoding(source, signature)
+        try:
+            return _read_csv(source, file_path, member, encoding, engine, usecols)
+        except UnicodeDecodeError:
+            # detection only looks at the beginning of the file: invalid bytes may appear later on
+            if not encoding_detected or encoding == FALLBACK_ENCODING:
+                raise
+            _detected_encodings[signature] = FALLBACK_ENCODING
+            return _read_csv(source, file_path, member, FALLBACK_ENCODING, engine, usecols)
 
 
-def load_surveys_data_from_csv(years=None, data_path="data", encoding="ISO-8859-1"):
+def _read_csv(source, file_path: str, member: str, encoding: str, engine: str, usecols: list) -> pd.DataFrame:
+    """
+    Reads a CSV file with the selected parser backend
+    :param source: binary file object of the source, see data_source.open_source
+    :param file_path: file path to get data from, scanned by path with the Polars backend
+    :param member: archive member name, if file_path is a zip archive
+    :param encoding: csv source file encoding
+    :param engine: CSV parser backend, one of CSV_ENGINES
+    :param usecols: optional list of columns to be loaded
+    :return: a dataframe containing file data
+    """
+    if engine == "polars":
+        return read_survey_csv(file_path, encoding, usecols, member)
+    if engine != "c":
+        try:
+            import pyarrow as pa
+        except ImportError:
+            if engine == "pyarrow":
+                raise
+        else:
+            try:
+                return _read_csv_arrow(source, encoding, usecols)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, UnicodeDecodeError):
+                # Arrow is stricter than pandas (e.g. on ragged rows): leaving the file to the pandas C parser
+                if engine == "pyarrow":
+                    raise
+    source.seek(0)
+    return pd.read_csv(source, encoding=encoding, usecols=usecols)
+
+
+def _read_csv_arrow(source, encoding: str, usecols: list) -> pd.DataFrame:
+    """
+    Reads a CSV file through the multi-threaded Arrow CSV reader, returning the same dataframe the pandas C parser
+    would return (same column names, missing values and dtypes). Columns the C parser would read differently, i.e.
+    temporal columns (as strings) and integers overflowing int64 (as uint64 or strings), take a second pass over
+    the file, restricted to them.
+    :param source: binary file object of the source, see data_source.open_source
+    :param encoding: csv source file encoding
+    :param usecols: optional list of columns to be loaded
+    :return: a dataframe containing file data
     """
-    Loads multiple years survey data from CSV files
+    import pyarrow as pa
+    from pyarrow import csv
+
+    # pandas header, so that unnamed and duplicated columns get the usual 'Unnamed: n' and '.n' names
+    source.seek(0)
+    column_names = list(pd.read_csv(source, encoding=encoding, nrows=0).columns)
+    read_options = csv.ReadOptions(column_names=column_names, skip_rows=1, encoding=encoding, use_threads=True)
+    convert_options = csv.ConvertOptions(null_values=PANDAS_NA_VALUES, strings_can_be_null=True,
+                                         true_values=["True", "TRUE", "true"],
+                                         false_values=["False", "FALSE", "false"])
+    if usecols is not None:
+        # pandas keeps file order, whatever the usecols order is
+        selected = {column_names[c] if isinstance(c, int) else c for c in usecols}
+        missing = selected.difference(column_names)
+        if missing:
+            raise ValueError(f"Usecols do not match columns, columns expected but not found: {sorted(missing)}")
+        convert_options.include_columns = [name for name in column_names if name in selected]
+
+    # pandas does not parse dates by default: columns holding temporal values in the first bytes are read as strings
+    source.seek(0)
+    sample = source.read(ENCODING_SAMPLE_SIZE)
+    if len(sample) == ENCODING_SAMPLE_SIZE:
+        # leaving out the last, truncated, row
+        sample = sample[:sample.rfind(b"\n") + 1]
+    try:
+        sample_table = csv.read_csv(pa.py_buffer(sample), read_options=read_options, convert_options=convert_options)
+        convert_options.column_types = {field.name: pa.string() for field in sample_table.schema
+                                        if pa.types.is_temporal(field.type)}
+    except pa.ArrowInvalid:
+        # e.g. a quoted value spanning the end of the sample
+        pass
+    source.seek(0)
+    table = csv.read_csv(source, read_options=read_options, convert_options=convert_options)
+
+    # columns holding temporal values past the first bytes only are read again, as strings
+    temporal_columns = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+    if temporal_columns:
+        convert_options.include_columns = temporal_columns
+        convert_options.column_types = {name: pa.string() for name in temporal_columns}
+        source.seek(0)
+        temporal_table = csv.read_csv(source, read_options=read_options, convert_options=convert_options)
+        for name in temporal_columns:
+            table = table.set_column(table.schema.get_field_index(name), name, temporal_table.column(name))
+
+    # all-missing columns are float columns for pandas
+    for i, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+
+    df = table.to_pandas()
+    # Arrow nulls become None in object columns, whereas pandas uses NaN
+    object_columns = df.select_dtypes(include="object").columns
+    if len(object_columns) > 0:
+        df[object_columns] = df[object_columns].where(df[object_columns].notna(), np.nan)
+
+    # Arrow reads integers overflowing int64 as floats: reading them again through the C parser
+    float_columns = df.select_dtypes(include="float").columns
+    overflowing = [name for name in float_columns if np.nanmax(np.abs(df[name].to_numpy()), initial=0) >= 2 ** 63]
+    if overflowing:
+        source.seek(0)
+        df_overflowing = pd.read_csv(source, encoding=encoding,
+                                     usecols=[column_names.index(name) for name in overflowing])
+        for name in overflowing:
+            df[name] = df_overflowing[name]
+    return df
+
+
+def get_survey_source(year: int, data_path: str = "data") -> str:
+    """
+    Locates a single year survey source, in data_path: the extracted '{year}_results.csv' file if present,
+    otherwise the zip archive containing it (see SURVEY_ARCHIVE_NAMES).
+    :param year: survey year
+    :param data_path: data folder where sources are expected to be located
+    :return: source file path. If no source is found, the expected CSV file path.
+    """
+    csv_path = os.path.join(data_path, f"{year}_results.csv")
+    if os.path.isfile(csv_path):
+        return csv_path
+    for archive_name in SURVEY_ARCHIVE_NAMES:
+        archive_path = os.path.join(data_path, archive_name.format(year=year))
+        if os.path.isfile(archive_path):
+            return archive_path
+    return csv_path
+
+
+def load_surveys_data_from_csv(years=None, data_path="data", encoding=None, engine="auto", usecols=None):
+    """
+    Loads multiple years survey data from CSV files, or straight from the zip archives they are shipped in
     :param years: a list of multiple years in integer format
     :param data_path: data folder where CSV files is expected to be located
-    :param encoding: csv files encoding
+    :param encoding: csv files encoding. If None, it is detected once per file.
+    :param engine: CSV parser backend, see load_from_csv
+    :param usecols: optional dictionary, in the form of {year: columns list}, of columns to be loaded
     :return: a dictionary of dataframes containing raw data from surveys from multiple years
     """
     if years is None:
-        years = [2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024]
+        years = SURVEY_YEARS
+    if usecols is None:
+        usecols = {}
 
     # dictionary containing years data
     surveys_years_df = {}
-    # retrieving base directory where data folder is expected to be located 
-    base_dir = os.getcwd()
-    # base_dir = os.path.split(os.getcwd())[0]
     for y in years:
-        surveys_years_df[y] = load_from_csv(os.path.join(base_dir, data_path,
-                                                         f"{y}_results.csv"),
-                                                         encoding)
+        surveys_years_df[y] = _load_survey_year(y, data_path, encoding, engine, usecols.get(y))
     return surveys_years_df
 
 
+def _load_survey_year(year: int, data_path: str, encoding: str, engine: str, usecols: list) -> pd.DataFrame:
+    """
+    Loads a single year survey data, from data_path
+    :param year: survey year
+    :param data_path: data folder, relative to the current working directory
+    :param encoding: csv file encoding. If None, it is detected.
+    :param engine: CSV parser backend, see load_from_csv
+    :param usecols: optional list of columns to be loaded
+    :return: a dataframe containing raw data from the year survey
+    """
+    # retrieving base directory where data folder is expected to be located
+    base_dir = os.getcwd()
+    return load_from_csv(get_survey_source(year, os.path.join(base_dir, data_path)), encoding, engine,
+                         usecols=usecols)
+
+
+def _apply_stages(year: int, df: pd.DataFrame, stages):
+    """
+    Applies processing stages to a year survey data
+    :param year: survey year
+    :param df: year survey data
+    :param stages: a list of functions, or a dictionary in the form of {year : list of functions}, each one being
+    called with the output of the previous one. Functions returning None (inplace transformations) pass their
+    input on to the next one.
+    :return: the output of the last stage
+    """
+    if isinstance(stages, dict):
+        stages = stages.get(year, [])
+    result = df
+    for stage in stages or []:
+        stage_result = stage(result)
+        if stage_result is not None:
+            result = stage_result
+    return result
+
+
+def iter_surveys(years=None, stages=None, data_path="data", encoding=None, engine="auto", usecols=None,
+                 prefetch: int = 1):
+    """
+    Iterates over multiple years survey data, yielding each year processed result as soon as it is ready. Next years
+    files are loaded in a background thread while the current year is processed, so that loading and processing
+    overlap, and at most prefetch raw years are held in memory besides the current one.
+    :param years: a list of multiple years in integer format, defaults to SURVEY_YEARS
+    :param stages: processing stages, see _apply_stages. If None, raw data is yielded.
+    :param data_path: data folder where CSV files (or archives) are expected to be located
+    :param encoding: csv files encoding. If None, it is detected once per file.
+    :param engine: CSV parser backend, see load_from_csv
+    :param usecols: optional dictionary, in the form of {year: columns list}, of columns to be loaded
+    :param prefetch: number of years loaded ahead of the one being processed
+    :return: a generator of (year, processed result) couples, in years order
+    """
+    if years is None:
+        years = SURVEY_YEARS
+    if usecols is None:
+        usecols = {}
+    years_to_load = iter(years)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=max(prefetch, 1), thread_name_prefix="survey-loader")
+
+    def submit_next() -> None:
+        for year in years_to_load:
+            pending.append((year, executor.submit(_load_survey_year, year, data_path, encoding, engine,
+                                                  usecols.get(year))))
+            return
+
+    try:
+        for _ in range(max(prefetch, 1)):
+            submit_next()
+        while pending:
+            year, future = pending.popleft()
+            df = future.result()
+            # loading next year while the current one is processed
+            submit_next()
+            result = _apply_stages(year, df, stages)
+            del df
+            yield year, result
+    finally:
+        # not yet started loads are cancelled (shutdown cancel_futures requires Python 3.9)
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+async def aiter_surveys(years=None, stages=None, data_path="data", encoding=None, engine="auto", usecols=None,
+                        prefetch: int = 1):
+    """
+    Asynchronous version of iter_surveys: both loading and processing run in worker threads, so that the event loop
+    is never blocked
+    :param years: a list of multiple years in integer format, defaults to SURVEY_YEARS
+    :param stages: processing stages, see _apply_stages. If None, raw data is yielded.
+    :param data_path: data folder where CSV files (or archives) are expected to be located
+    :param encoding: csv files encoding. If None, it is detected once per file.
+    :param engine: CSV parser backend, see load_from_csv
+    :param usecols: optional dictionary, in the form of {year: columns list}, of columns to be loaded
+    :param prefetch: number of years loaded ahead of the one being processed
+    :return: an asynchronous generator of (year, processed result) couples, in years order
+    """
+    if years is None:
+        years = SURVEY_YEARS
+    if usecols is None:
+        usecols = {}
+    loop = asyncio.get_running_loop()
+    years_to_load = iter(years)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=max(prefetch, 1), thread_name_prefix="survey-loader")
+
+    def submit_next() -> None:
+        for year in years_to_load:
+            pending.append((year, loop.run_in_executor(executor, _load_survey_year, year, data_path, encoding,
+                                                       engine, usecols.get(year))))
+            return
+
+    try:
+        for _ in range(max(prefetch, 1)):
+            submit_next()
+        while pending:
+            year, future = pending.popleft()
+            df = await future
+            submit_next()
+            result = await loop.run_in_executor(None, _apply_stages, year, df, stages)
+            del df
+            yield year, result
+    finally:
+        # cancelling asyncio futures cancels the wrapped executor futures not yet started
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
 def get_dataset_max_shapes(df_dict):
     """
     This function will extract max shapes values from dataset
@@ -87,14 +477,28 @@ def get_common_feature_list(data_frames_dict: dict) -> list:
     return features
 
 
-def merge_dataframes(data_frames_dict):
+def merge_dataframes(data_frames_dict, categorical_columns=None, backend="pandas"):
     """
     Merges dataframes based on least common feature set
     :param data_frames_dict: a dataframes dictionary data to be merged, based on least common features
+    :param categorical_columns: optional list of column names, or dictionary mapping semantic names to per-year
+    column names, to be encoded against categories shared by all the years (see build_shared_categories), so that
+    merged columns hold integer codes with consistent categories.
+    :param backend: 'pandas', or 'polars' to concatenate all the years at once, in a multi-threaded query (see
+    data_polars)
     :return: a single, merged dataframe based on least common feature set
     """
+    check_backend(backend)
+    if categorical_columns is not None:
+        shared_categories = build_shared_categories(data_frames_dict, categorical_columns)
+        data_frames_dict = {year: encode_shared_categories(df, shared_categories, categorical_columns)
+                            for year, df in data_frames_dict.items()}
     merged_df = None
     common_features_list = get_common_feature_list(data_frames_dict)
+    if backend == "polars" and len(data_frames_dict) > 1:
+        for year, df in data_frames_dict.items():
+            df['year'] = year
+        return concat_frames(list(data_frames_dict.values()), common_features_list)
     for i, (year, df) in enumerate(data_frames_dict.items()):
         df['year'] = year
         if i == 0:
@@ -0,0 +1,302 @@
+"""
+This module contains a disk memoization layer for stats computations.
+
+Results are keyed on a fingerprint of the input data and of the call parameters: dataframes are fingerprinted through
+their schema and the hashes of every row, index included, fed block after block to a single digest, functions
+through their code, constants, default values and closure values, and stats extractors through their methods code
+and parameters. Any change to input data, or to parameters, gives
+a different key, so that stale results are never returned: they are evicted, least recently used first, once cached
+results exceed the cache size.
+
+Typical usage, in a notebook:
+
+    memo = StatsMemo()
+    s_2011_proficiencies_stats = memo.get_stats(lre_11)
+    s_2011_proficiencies_percentages = memo.get_stats(LanguagesProficienciesPercentages(lre_11))
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import types
+from functools import lru_cache, partial
+
+import numpy as np
+import pandas as pd
+
+from .data_load import get_10most_popular_languages_by_year
+from .data_stats import LanguagesStatsExtractor
+
+DEFAULT_CACHE_DIR = ".stats_cache"
+# maximum size of cached results on disk, in bytes
+DEFAULT_MAX_BYTES = 512 * 2 ** 20
+# number of rows hashed at once by frame fingerprints
+FINGERPRINT_BLOCK_ROWS = 100_000
+CACHE_FILE_EXTENSION = ".pkl"
+
+
+def frame_fingerprint(data) -> str:
+    """
+    Computes the fingerprint of a dataframe or series: its schema (shape, columns, dtypes) and the hashes of every
+    row, index included, in order
+    :param data: a dataframe or a series
+    :return: fingerprint, as a hexadecimal string
+    """
+    df = data.to_frame() if isinstance(data, pd.Series) else data
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((type(data).__name__, df.shape, list(df.columns), [str(t) for t in df.dtypes],
+                   str(df.index.dtype))).encode())
+    # positional column names, as columns names may be duplicated
+    df = df.set_axis(range(df.shape[1]), axis=1)
+    for start in range(0, df.shape[0], FINGERPRINT_BLOCK_ROWS):
+        block = df.iloc[start:start + FINGERPRINT_BLOCK_ROWS]
+        h.update(pd.util.hash_pandas_object(block, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _update_code_fingerprint(h, code: types.CodeType) -> None:
+    """
+    Feeds a function code to a fingerprint hash: bytecode, referenced names and constants, nested code included
+    :param h: hashlib hash object
+    :param code: function code object
+    """
+    h.update(code.co_code)
+    h.update(repr((code.co_names, code.co_varnames, code.co_freevars)).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_code_fingerprint(h, const)
+        else:
+            h.update(repr(const).encode())
+    h.update(b";")
+
+
+@lru_cache(maxsize=None)
+def _class_code_fingerprint(cls: type) -> str:
+    """
+    Computes the fingerprint of a class methods code, inherited methods included, so that results of a changed
+    extractor are not served from the cache
+    :param cls: a class
+    :return: fingerprint, as a hexadecimal string
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for klass in cls.__mro__:
+        if klass.__module__ in ("builtins", "abc"):
+            continue
+        h.update(f"{klass.__module__}.{klass.__qualname__}".encode())
+        for name, attribute in sorted(vars(klass).items()):
+            function = attribute.__func__ if isinstance(attribute, (staticmethod, classmethod)) else attribute
+            function = function.fget if isinstance(function, property) else function
+            if isinstance(function, types.FunctionType):
+                h.update(name.encode())
+                _update_code_fingerprint(h, function.__code__)
+    return h.hexdigest()
+
+
+def _update_fingerprint(h, value) -> None:
+    """
+    Feeds a value to a fingerprint hash, recursively
+    :param h: hashlib hash object
+    :param value: value to be fingerprinted
+    """
+    h.update(type(value).__qualname__.encode())
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        h.update(frame_fingerprint(value).encode())
+    elif isinstance(value, pd.Index):
+        h.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(repr((value.dtype.str, value.shape)).encode())
+        if value.dtype == object:
+            h.update(pd.util.hash_pandas_object(pd.Series(value.ravel()), index=False).to_numpy().tobytes())
+        else:
+            h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, LanguagesStatsExtractor):
+        h.update(_class_code_fingerprint(type(value)).encode())
+        _update_fingerprint(h, value.get_params())
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            _update_fingerprint(h, key)
+            _update_fingerprint(h, value[key])
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in (sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value):
+            _update_fingerprint(h, item)
+    elif value is None or isinstance(value, (str, bytes, bool, int, float, complex, range, np.generic)):
+        h.update(repr(value).encode())
+    elif isinstance(value, partial):
+        _update_fingerprint(h, (value.func, value.args, value.keywords))
+    elif isinstance(value, types.MethodType):
+        _update_fingerprint(h, (value.__func__, value.__self__))
+    elif isinstance(value, types.FunctionType):
+        # functions redefined, or lambdas sharing a name, are told apart by their code and bound values
+        h.update(f"{value.__module__}.{value.__qualname__}".encode())
+        _update_code_fingerprint(h, value.__code__)
+        _update_fingerprint(h, (value.__defaults__, value.__kwdefaults__,
+                                tuple(cell.cell_contents for cell in value.__closure__ or ())))
+    elif callable(value) and hasattr(value, "__name__"):
+        # builtin functions, numpy ufuncs and classes
+        h.update(f"{getattr(value, '__module__', None)}.{getattr(value, '__qualname__', value.__name__)}".encode())
+    else:
+        raise TypeError(f"values of type {type(value).__name__} cannot be fingerprinted")
+    h.update(b";")
+
+
+def fingerprint(*values) -> str:
+    """
+    Computes the fingerprint of values: dataframes, series, arrays, stats extractors (through their parameters),
+    containers of them, plain values or functions (through their code, default and closure values, partial
+    functions through their function and arguments)
+    :param values: values to be fingerprinted
+    :return: fingerprint, as a hexadecimal string
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _update_fingerprint(h, values)
+    return h.hexdigest()
+
+
+class StatsMemo:
+    """
+    Disk memoization of stats computations, keyed on inputs fingerprints, with size bounded eviction of least
+    recently used results
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        :param cache_dir: cached results folder, created if missing
+        :param max_bytes: maximum size of cached results, least recently used results being evicted first
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.__cache_dir = cache_dir
+        self.__max_bytes = max_bytes
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.__cache_dir, key + CACHE_FILE_EXTENSION)
+
+    def _load(self, key: str):
+        """
+        Loads a cached result, marking it as the most recently used
+        :param key: result key
+        :return: a (found, result) tuple
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.__misses += 1
+            return False, None
+        os.utime(path)
+        self.__hits += 1
+        return True, result
+
+    def _store(self, key: str, result) -> None:
+        """
+        Stores a result, atomically, then evicts least recently used results exceeding the cache size
+        :param key: result key
+        :param result: picklable result
+        """
+        with tempfile.NamedTemporaryFile(dir=self.__cache_dir, suffix=".tmp", delete=False) as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, self._path(key))
+        with self.__lock:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.__cache_dir):
+            if entry.name.endswith(CACHE_FILE_EXTENSION):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.__max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    @staticmethod
+    def key(name, *args, **kwargs) -> str:
+        """
+        Computes the key of a computation
+        :param name: computation name, or function
+        :param args: computation positional inputs
+        :param kwargs: computation keyword inputs
+        :return: computation key
+        """
+        return fingerprint(name, args, kwargs)
+
+    def call(self, func, *args, **kwargs):
+        """
+        Calls a function, or returns its cached result for the same inputs
+        :param func: a function, whose result is picklable, keyed on its code and bound values (see fingerprint)
+        :param args: function positional arguments
+        :param kwargs: function keyword arguments
+        :return: function result
+        """
+        key = self.key(func, *args, **kwargs)
+        found, result = self._load(key)
+        if not found:
+            result = func(*args, **kwargs)
+            self._store(key, result)
+        return result
+
+    def get_stats(self, extractor: LanguagesStatsExtractor) -> dict:
+        """
+        Retrieves the stats of an extractor, or their cached value for the same data and parameters
+        :param extractor: a stats extractor, exposing its parameters (see LanguagesStatsExtractor.get_params)
+        :return: extractor stats, see the extractor get_stats method
+        """
+        key = self.key(f"{type(extractor).__module__}.{type(extractor).__qualname__}.get_stats", extractor)
+        found, result = self._load(key)
+        if not found:
+            result = extractor.get_stats()
+            self._store(key, result)
+        return result
+
+    def get_10most_popular_languages_by_year(self, languages_popularity_df: pd.DataFrame,
+                                             proficiencies_by_year_data: dict, top10languages: list) -> None:
+        """
+        Memoized data_load.get_10most_popular_languages_by_year: languages_popularity_df is filled in place, from
+        cached values for the same inputs
+        :param languages_popularity_df: year x language dataframe to be filled
+        :param proficiencies_by_year_data: stats and percentages, by year
+        :param top10languages: languages to be retrieved
+        """
+        def compute_popularity(df, stats_by_year, languages, fill_popularity):
+            df = df.copy()
+            fill_popularity(df, stats_by_year, languages)
+            return df
+
+        # the filling function is an argument, so that its code is part of the key
+        filled_df = self.call(compute_popularity, languages_popularity_df, proficiencies_by_year_data,
+                              top10languages, get_10most_popular_languages_by_year)
+        # filled_df holds every cell of languages_popularity_df: enlarging it, then assigning all the values at once
+        for column in filled_df.columns.difference(languages_popularity_df.columns, sort=False):
+            languages_popularity_df[column] = np.nan
+        for year in filled_df.index.difference(languages_popularity_df.index, sort=False):
+            languages_popularity_df.loc[year] = np.nan
+        languages_popularity_df.loc[filled_df.index, filled_df.columns] = filled_df
+
+    def clear(self) -> None:
+        """
+        Removes all the cached results
+        """
+        with self.__lock:
+            for entry in os.scandir(self.__cache_dir):
+                if entry.name.endswith(CACHE_FILE_EXTENSION):
+                    os.remove(entry.path)
+
+    def cache_info(self) -> dict:
+        """
+        Retrieves cache statistics
+        :return: a dictionary of 'hits' and 'misses' counts of this instance, number of cached results ('size'),
+        their 'bytes' size on disk and the cache 'max bytes' size
+        """
+        entries = [entry for entry in os.scandir(self.__cache_dir) if entry.name.endswith(CACHE_FILE_EXTENSION)]
+        return {"hits": self.__hits, "misses": self.__misses, "size": len(entries),
+                "bytes": sum(entry.stat().st_size for entry in entries), "max bytes": self.__max_bytes}
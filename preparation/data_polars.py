@@ -0,0 +1,331 @@
+"""
+This module contains the Polars backend of the hot preparation operations: loading, feature split, binarization,
+dataframes merge, ranking sums and share masks.
+
+Each operation is run as a Polars lazy query, so that only the needed columns are read or converted (projection
+pushdown), row filters are applied while scanning (predicate pushdown), and execution is spread over all the
+cores. Inputs and outputs are pandas objects, so that results are the ones of the pandas backend.
+
+Polars is an optional dependency, imported on first use: the backend is selected at call time, through the
+'backend' parameter of feature_split, binarize_columns_range, merge_dataframes,
+LanguagesRankingExtractor.compute_language_proficiency_ranking and LanguagesProficienciesPercentages.joint_share,
+or through engine='polars' for load_from_csv and load_surveys_data_from_csv.
+"""
+import atexit
+import io
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from .data_source import PANDAS_NA_VALUES, open_source
+
+# backends accepted by the 'backend' parameter of preparation operations
+BACKENDS = ("pandas", "polars")
+
+# number of characters transcoded at once, for sources that are not plain UTF-8 files
+TRANSCODE_BLOCK_SIZE = 1 << 20
+
+
+def _polars():
+    """
+    Imports polars
+    :return: polars module
+    """
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise ImportError("the polars backend requires polars to be installed (pip install polars)") from e
+    return pl
+
+
+def check_backend(backend: str) -> str:
+    """
+    Validates a backend name
+    :param backend: backend name
+    :return: the backend name, if it is one of BACKENDS
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got '{backend}'")
+    return backend
+
+
+def _is_plain_utf8(encoding: str, member: str) -> bool:
+    """
+    Tells whether a source can be scanned by polars straight from disk
+    :param encoding: csv source file encoding
+    :param member: archive member name, if the source is a zip archive
+    :return: True for UTF-8 files out of archives
+    """
+    return member is None and encoding.lower().replace("_", "-") in ("utf-8", "utf8")
+
+
+def _transcode(file_path: str, encoding: str, member: str = None) -> str:
+    """
+    Transcodes a source to a temporary UTF-8 file, TRANSCODE_BLOCK_SIZE characters at a time, so that the source is
+    never held in memory as a whole
+    :param file_path: CSV file path or zip archive path
+    :param encoding: csv source file encoding
+    :param member: archive member name, if file_path is a zip archive
+    :return: temporary file path, to be removed by the caller
+    """
+    with open_source(file_path, member) as source, \
+            tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="", suffix=".csv", delete=False) as target:
+        # utf-8-sig drops the byte order mark
+        shutil.copyfileobj(io.TextIOWrapper(source, encoding=encoding, newline=""), target, TRANSCODE_BLOCK_SIZE)
+    return target.name
+
+
+def _remove_file(path: str) -> None:
+    """
+    Removes a file, if it still exists
+    :param path: file path
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _scan(pl, source_path: str, column_names: list):
+    """
+    Builds a lazy scan of a UTF-8 CSV file
+    :param pl: polars module
+    :param source_path: UTF-8 CSV file path
+    :param column_names: column names, see scan_survey_csv
+    :return: a polars LazyFrame
+    """
+    # pandas infers column types from all the rows
+    return pl.scan_csv(source_path, new_columns=column_names, null_values=PANDAS_NA_VALUES, infer_schema_length=None)
+
+
+def _header(file_path: str, encoding: str, member: str) -> list:
+    """
+    Reads column names the way pandas does, so that unnamed and duplicated columns get the usual 'Unnamed: n' and
+    '.n' names
+    :param file_path: CSV file path or zip archive path
+    :param encoding: csv source file encoding
+    :param member: archive member name, if file_path is a zip archive
+    :return: column names
+    """
+    with open_source(file_path, member) as source:
+        return list(pd.read_csv(source, encoding=encoding, nrows=0).columns)
+
+
+@contextmanager
+def _scan_survey_csv(file_path: str, encoding: str, member: str):
+    """
+    Context manager version of scan_survey_csv, removing the transcoded file, if any, on exit
+    """
+    pl = _polars()
+    column_names = _header(file_path, encoding, member)
+    if _is_plain_utf8(encoding, member):
+        yield _scan(pl, file_path, column_names)
+        return
+    source_path = _transcode(file_path, encoding, member)
+    try:
+        yield _scan(pl, source_path, column_names)
+    finally:
+        _remove_file(source_path)
+
+
+def scan_survey_csv(file_path: str, encoding: str = "utf-8", member: str = None):
+    """
+    Builds a lazy scan of a survey CSV file, with the column names and missing values the pandas C parser would
+    produce. Plain UTF-8 files are scanned straight from disk; other encodings, and archive members, are transcoded
+    block by block to a temporary UTF-8 file first, removed when the interpreter exits (read_survey_csv removes it
+    as soon as data is collected).
+    :param file_path: CSV file path or zip archive path
+    :param encoding: csv source file encoding
+    :param member: archive member name, if file_path is a zip archive
+    :return: a polars LazyFrame
+    """
+    pl = _polars()
+    column_names = _header(file_path, encoding, member)
+    if _is_plain_utf8(encoding, member):
+        return _scan(pl, file_path, column_names)
+    source_path = _transcode(file_path, encoding, member)
+    # the lazy frame, and the ones derived from it, read the file when collected
+    atexit.register(_remove_file, source_path)
+    return _scan(pl, source_path, column_names)
+
+
+def read_survey_csv(file_path: str, encoding: str = "utf-8", usecols: list = None, member: str = None) -> pd.DataFrame:
+    """
+    Reads a survey CSV file through a Polars lazy scan, see scan_survey_csv
+    :param file_path: CSV file path or zip archive path
+    :param encoding: csv source file encoding
+    :param usecols: optional list of column names (or positions) to be loaded, all the others are not parsed
+    :param member: archive member name, if file_path is a zip archive
+    :return: a dataframe containing file data
+    """
+    pl = _polars()
+    with _scan_survey_csv(file_path, encoding, member) as lazy_frame:
+        if usecols is not None:
+            column_names = lazy_frame.collect_schema().names()
+            selected = {column_names[c] if isinstance(c, int) else c for c in usecols}
+            missing = selected.difference(column_names)
+            if missing:
+                raise ValueError(f"Usecols do not match columns, columns expected but not found: {sorted(missing)}")
+            # pandas keeps file order, whatever the usecols order is
+            lazy_frame = lazy_frame.select([name for name in column_names if name in selected])
+        df_polars = lazy_frame.collect()
+    # all-missing columns are float columns for pandas
+    empty_columns = [name for name in df_polars.columns if df_polars[name].null_count() == df_polars.height]
+    if empty_columns:
+        df_polars = df_polars.with_columns(pl.col(empty_columns).cast(pl.Float64))
+    return _to_pandas(df_polars)
+
+
+def _to_pandas(df_polars) -> pd.DataFrame:
+    """
+    Converts a polars dataframe to pandas, with NaN as missing value in object columns, as pandas does
+    :param df_polars: polars dataframe
+    :return: a pandas dataframe
+    """
+    df = df_polars.to_pandas()
+    object_columns = df.select_dtypes(include="object").columns
+    if len(object_columns) > 0:
+        df[object_columns] = df[object_columns].where(df[object_columns].notna(), np.nan)
+    return df
+
+
+def _from_pandas(df: pd.DataFrame):
+    """
+    Converts a pandas dataframe to polars. Object columns holding mixed types are kept as polars Object columns.
+    :param df: pandas dataframe
+    :return: a polars dataframe
+    """
+    pl = _polars()
+    columns = []
+    for name, series in df.reset_index(drop=True).items():
+        try:
+            columns.append(pl.from_pandas(series).alias(name))
+        except (TypeError, ValueError):
+            columns.append(pl.Series(name, series.tolist(), dtype=pl.Object))
+    return pl.DataFrame(columns)
+
+
+def _strings_series(series: pd.Series):
+    """
+    Converts a pandas series to a polars string series, non string values becoming nulls
+    :param series: pandas series
+    :return: a polars series
+    """
+    pl = _polars()
+    try:
+        converted = pl.from_pandas(series.reset_index(drop=True))
+        if converted.dtype == pl.String:
+            return converted
+    except (TypeError, ValueError):
+        pass
+    strings = series.where(series.map(lambda value: isinstance(value, str)))
+    return pl.from_pandas(strings.reset_index(drop=True).astype(object)).cast(pl.String)
+
+
+def split_indicators(joint_column: pd.Series, separator: str = ";", split_column_prefix: str = None) -> pd.DataFrame:
+    """
+    Splits a column of joint features into an indicator column for each feature, named after split_column_prefix
+    :param joint_column: column holding joint features, as strings
+    :param separator: joint features separator
+    :param split_column_prefix: prefix of split columns names, defaults to joint_column name
+    :return: a dataframe with an indicator column (1.0 or 0.0) for each feature, in order of first appearance,
+    sharing joint_column index
+    """
+    pl = _polars()
+    if split_column_prefix is None:
+        split_column_prefix = joint_column.name
+    tokens = pl.LazyFrame({"joint": _strings_series(joint_column)}).select(
+        pl.col("joint").str.split(separator).list.eval(pl.element().str.strip_chars()).alias("tokens"))
+    features = tokens.select(pl.col("tokens").explode().drop_nulls().unique(maintain_order=True)).collect()
+    indicators = tokens.select([pl.col("tokens").list.contains(feature).fill_null(False).cast(pl.Float64)
+                               .alias(f"{split_column_prefix}: {feature}")
+                                for feature in features.to_series().to_list()]).collect()
+    df_indicators = indicators.to_pandas()
+    df_indicators.index = joint_column.index
+    return df_indicators
+
+
+def binarize_columns(df: pd.DataFrame, columns_positions: list, true_values: list) -> pd.DataFrame:
+    """
+    Binarizes columns, converting specific values to 1 and all the other values to 0
+    :param df: input dataframe
+    :param columns_positions: positions of the columns to be binarized
+    :param true_values: values to be converted to 1, one for each column
+    :return: a dataframe holding binarized columns, as integers, sharing df index
+    """
+    pl = _polars()
+    data = {}
+    expressions = []
+    for i, (position, true_value) in enumerate(zip(columns_positions, true_values)):
+        # positional names, as columns names may be duplicated
+        name = f"c{i}"
+        column = df.iloc[:, position]
+        data[name] = _strings_series(column) if isinstance(true_value, str) else pl.from_pandas(
+            column.reset_index(drop=True))
+        if (data[name].dtype == pl.String) != isinstance(true_value, str):
+            # values of a different type than the true value are all converted to 0
+            expressions.append(pl.lit(0, dtype=pl.Int64).alias(name))
+        else:
+            expressions.append((pl.col(name) == true_value).fill_null(False).cast(pl.Int64).alias(name))
+    binarized = pl.LazyFrame(data).select(expressions).collect().to_pandas()
+    binarized.columns = df.columns[list(columns_positions)[:len(expressions)]]
+    binarized.index = df.index
+    return binarized
+
+
+def concat_frames(data_frames: list, columns: list) -> pd.DataFrame:
+    """
+    Concatenates dataframes on a common set of columns, keeping their index values
+    :param data_frames: dataframes to be concatenated
+    :param columns: columns to be kept, in order
+    :return: concatenated dataframe
+    """
+    pl = _polars()
+    columns = list(columns)
+    merged = pl.concat([_from_pandas(df[columns]).lazy() for df in data_frames], how="vertical_relaxed").collect()
+    df_merged = _to_pandas(merged)
+    df_merged.index = pd.Index(np.concatenate([df.index.to_numpy() for df in data_frames]))
+    # Polars categories are in order of appearance: restoring pandas categories, and codes, shared by every dataframe
+    for column in columns:
+        dtype = data_frames[0][column].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and all(df[column].dtype == dtype for df in data_frames):
+            df_merged[column] = df_merged[column].cat.set_categories(dtype.categories)
+    return df_merged
+
+
+def column_sums(df: pd.DataFrame) -> pd.Series:
+    """
+    Sums numeric columns
+    :param df: input dataframe
+    :return: a series holding each numeric column sum
+    """
+    pl = _polars()
+    df_numeric = df.select_dtypes(include=["number", "bool"])
+    sums = pl.from_pandas(df_numeric).lazy().select(pl.all().sum()).collect()
+    return pd.Series(sums.row(0), index=df_numeric.columns)
+
+
+def count_rows(df: pd.DataFrame, languages: list, unison: bool = False, platform_key: str = None,
+               platform: str = None) -> tuple:
+    """
+    Counts respondents using some languages, and the population they are taken from
+    :param df: respondents dataframe, holding languages indicator columns
+    :param languages: languages columns
+    :param unison: if True, respondents using all the languages are counted, otherwise respondents using any of them
+    :param platform_key: platform column
+    :param platform: if provided, only respondents on the platform are counted
+    :return: the number of respondents using the languages, and the population size
+    """
+    pl = _polars()
+    columns = list(languages) if platform is None else list(languages) + [platform_key]
+    lazy_frame = _from_pandas(df[columns]).lazy()
+    languages_condition = pl.all_horizontal if unison else pl.any_horizontal
+    share_condition = languages_condition([pl.col(lang).fill_null(1) != 0 for lang in languages])
+    if platform is not None:
+        lazy_frame = lazy_frame.filter(pl.col(platform_key) == platform)
+    counts = lazy_frame.select(population=pl.len(), share=share_condition.sum()).collect()
+    return counts["share"][0], counts["population"][0]
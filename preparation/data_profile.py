@@ -0,0 +1,220 @@
+"""
+This module contains a columns profiler of survey sources, used to find each year columns of interest (e.g. languages
+proficiency ranges, unnamed columns following a question, multi-select columns to be split) and the schema drift
+across years.
+
+Each year source is read once, as strings, in chunks of PROFILE_CHUNK_SIZE rows, per column statistics being
+accumulated chunk after chunk, so that no more than a chunk is loaded at once; years are profiled in parallel, by
+worker processes.
+"""
+import difflib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .data_load import (FALLBACK_ENCODING, SURVEY_YEARS, detect_encoding, find_archive_member, get_survey_source,
+                        is_archive)
+from .data_source import open_source
+
+# number of rows read at once
+PROFILE_CHUNK_SIZE = 50_000
+# number of most frequent values reported for each column
+TOP_VALUES = 5
+# candidate separators of multi-select answers
+SEPARATORS = (";", ",", "|")
+# minimum share of non-missing values holding a separator, for a column to be a multi-select one
+MULTI_SELECT_MIN_SHARE = 0.05
+# maximum ratio between distinct tokens and distinct values, for a column to be a multi-select one
+MULTI_SELECT_MAX_TOKENS_RATIO = 0.5
+# minimum similarity (0 to 1) of a removed column and a new one, for the latter to be reported as renamed
+RENAME_MIN_SIMILARITY = 0.6
+
+
+def _accumulate_chunk(chunk: pd.DataFrame, accumulators: list) -> None:
+    """
+    Adds a chunk statistics to columns accumulators
+    :param chunk: chunk of rows, read as strings
+    :param accumulators: a list holding, for each column, a dictionary of 'nulls' count, 'values' counts, and
+    'separators' counts (values holding each separator, and their tokens counts)
+    """
+    nulls = chunk.isna().sum().to_numpy()
+    for position, accumulator in enumerate(accumulators):
+        accumulator["nulls"] += nulls[position]
+        accumulator["values"] = accumulator["values"].add(chunk.iloc[:, position].value_counts(), fill_value=0)
+
+
+def _accumulate_separators(accumulator: dict) -> None:
+    """
+    Counts values holding each separator, and their tokens, from a column distinct values counts: tokens of each
+    distinct value are counted once, whatever its number of occurrences
+    :param accumulator: column accumulator, see _accumulate_chunk
+    """
+    distinct_values = pd.Series(accumulator["values"].index, dtype=object)
+    for sep in SEPARATORS:
+        holding = distinct_values.str.contains(sep, regex=False).to_numpy()
+        tokens = distinct_values.str.split(sep).explode().str.strip()
+        accumulator["separators"][sep] = (accumulator["values"].to_numpy()[holding].sum(), tokens.nunique())
+
+
+def _infer_dtype(distinct_values: pd.Index) -> str:
+    """
+    Infers a column type from its distinct values
+    :param distinct_values: column distinct values, as strings
+    :return: 'empty', 'integer', 'float' or 'string'
+    """
+    if len(distinct_values) == 0:
+        return "empty"
+    numbers = pd.to_numeric(pd.Series(distinct_values, dtype=object), errors="coerce")
+    if numbers.isna().any():
+        return "string"
+    return "integer" if (numbers == np.round(numbers)).all() else "float"
+
+
+def _column_profile(name: str, position: int, accumulator: dict, rows: int) -> dict:
+    """
+    Builds a column profile from its accumulator
+    :param name: column name
+    :param position: column position
+    :param accumulator: column accumulator, see _accumulate_chunk
+    :param rows: number of rows
+    :return: a dictionary of column stats
+    """
+    # most frequent values first, ties in values order
+    value_counts = accumulator["values"].sort_index().sort_values(ascending=False, kind="stable")
+    inferred_dtype = _infer_dtype(value_counts.index)
+    separator = None
+    if inferred_dtype == "string":
+        _accumulate_separators(accumulator)
+        non_missing = rows - accumulator["nulls"]
+        best_share = 0
+        for sep, (holding, distinct_tokens) in accumulator["separators"].items():
+            share = holding / non_missing
+            if (share >= MULTI_SELECT_MIN_SHARE and share > best_share
+                    and distinct_tokens <= MULTI_SELECT_MAX_TOKENS_RATIO * len(value_counts)):
+                separator, best_share = sep, share
+    return {"column": name, "position": position, "null rate": accumulator["nulls"] / rows if rows else np.nan,
+            "cardinality": len(value_counts),
+            "top values": list(zip(value_counts.index[:TOP_VALUES], value_counts.iloc[:TOP_VALUES].astype(int))),
+            "inferred dtype": inferred_dtype, "separator": separator}
+
+
+def profile_source(file_path: str, encoding: str = None, chunk_size: int = PROFILE_CHUNK_SIZE,
+                   member: str = None) -> pd.DataFrame:
+    """
+    Profiles every column of a survey source, read once in chunks
+    :param file_path: CSV file path, or zip archive path
+    :param encoding: csv source file encoding. If None, it is detected (see data_load.detect_encoding)
+    :param chunk_size: number of rows read at once
+    :param member: CSV file to be read, if file_path is a zip archive. If None, it is found by find_archive_member.
+    :return: a dataframe holding a row for each column, in source order: 'column' name, 'position', 'null rate',
+    'cardinality' (number of distinct values), 'top values' (list of (value, count) tuples), 'inferred dtype'
+    ('empty', 'integer', 'float' or 'string') and 'separator' of multi-select answers, if any
+    """
+    if member is None and is_archive(file_path):
+        member = find_archive_member(file_path)
+    encoding_detected = encoding is None
+    if encoding_detected:
+        encoding = detect_encoding(file_path, member)
+    try:
+        return _profile_source(file_path, member, encoding, chunk_size)
+    except UnicodeDecodeError:
+        # detection only looks at the beginning of the file: invalid bytes may appear later on
+        if not encoding_detected or encoding == FALLBACK_ENCODING:
+            raise
+        return _profile_source(file_path, member, FALLBACK_ENCODING, chunk_size)
+
+
+def _profile_source(file_path: str, member: str, encoding: str, chunk_size: int) -> pd.DataFrame:
+    """
+    Profiles every column of a survey source, with a known encoding, see profile_source
+    """
+    columns, accumulators = None, None
+    rows = 0
+    with open_source(file_path, member) as source:
+        # a header only source still yields an empty chunk, holding the columns
+        for chunk in pd.read_csv(source, encoding=encoding, dtype=str, chunksize=chunk_size):
+            if columns is None:
+                columns = list(chunk.columns)
+                accumulators = [{"nulls": 0, "values": pd.Series(dtype=np.int64), "separators": {}} for _ in columns]
+            rows += chunk.shape[0]
+            _accumulate_chunk(chunk, accumulators)
+    profile = pd.DataFrame([_column_profile(name, position, accumulator, rows)
+                            for position, (name, accumulator) in enumerate(zip(columns, accumulators))],
+                           columns=["column", "position", "null rate", "cardinality", "top values",
+                                    "inferred dtype", "separator"])
+    profile.attrs["rows"] = rows
+    return profile
+
+
+def profile_surveys(years=None, data_path: str = "data", chunk_size: int = PROFILE_CHUNK_SIZE,
+                    max_workers: int = None) -> dict:
+    """
+    Profiles multiple years surveys, each year being profiled by a worker process (see profile_source)
+    :param years: a list of years, defaults to SURVEY_YEARS
+    :param data_path: data folder where sources are expected to be located (see data_load.get_survey_source)
+    :param chunk_size: number of rows read at once
+    :param max_workers: number of worker processes, 1 to profile years in the calling process
+    :return: a dictionary in the form of {year : profile dataframe}
+    """
+    if years is None:
+        years = SURVEY_YEARS
+    sources = [get_survey_source(year, data_path) for year in years]
+    if max_workers == 1:
+        return {year: profile_source(source, chunk_size=chunk_size) for year, source in zip(years, sources)}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(profile_source, source, chunk_size=chunk_size) for source in sources]
+        return {year: future.result() for year, future in zip(years, futures)}
+
+
+def _columns_similarity(removed: pd.Series, added: pd.Series) -> float:
+    """
+    Similarity of two columns profiles, from their names and most frequent values
+    :param removed: profile of a column missing from the next year
+    :param added: profile of a column missing from the previous year
+    :return: a similarity from 0 to 1, 0 when inferred types or separators are different
+    """
+    if removed["inferred dtype"] != added["inferred dtype"] or removed["separator"] != added["separator"]:
+        return 0.0
+    name_similarity = difflib.SequenceMatcher(None, str(removed["column"]).lower(),
+                                              str(added["column"]).lower()).ratio()
+    removed_values = {value for value, _ in removed["top values"]}
+    added_values = {value for value, _ in added["top values"]}
+    union = removed_values | added_values
+    values_similarity = len(removed_values & added_values) / len(union) if union else 1.0
+    return (name_similarity + values_similarity) / 2
+
+
+def diff_profiles(profiles: dict) -> pd.DataFrame:
+    """
+    Compares columns of consecutive years profiles, reporting new, removed and renamed columns. A new column is
+    reported as renamed when it is the most similar to a removed one (see RENAME_MIN_SIMILARITY), from their names,
+    inferred types, separators and most frequent values.
+    :param profiles: a dictionary in the form of {year : profile dataframe}, see profile_surveys
+    :return: a dataframe holding a row for each change: 'year', 'change' ('new', 'removed' or 'renamed'),
+    'column' (the new name for renamed columns), 'previous column' and 'similarity' of renamed columns
+    """
+    changes = []
+    years = sorted(profiles)
+    for previous_year, year in zip(years, years[1:]):
+        previous_profile = profiles[previous_year].set_index("column", drop=False)
+        profile = profiles[year].set_index("column", drop=False)
+        removed = [c for c in previous_profile.index if c not in profile.index]
+        added = [c for c in profile.index if c not in previous_profile.index]
+        candidates = sorted(((_columns_similarity(previous_profile.loc[r], profile.loc[a]), r, a)
+                             for r in removed for a in added), key=lambda candidate: -candidate[0])
+        renamed = {}
+        matched_removed = set()
+        for similarity, r, a in candidates:
+            if similarity < RENAME_MIN_SIMILARITY:
+                break
+            if a not in renamed and r not in matched_removed:
+                renamed[a] = (r, similarity)
+                matched_removed.add(r)
+        for a in added:
+            if a in renamed:
+                changes.append((year, "renamed", a, renamed[a][0], renamed[a][1]))
+            else:
+                changes.append((year, "new", a, None, np.nan))
+        changes.extend((year, "removed", r, None, np.nan) for r in removed if r not in matched_removed)
+    return pd.DataFrame(changes, columns=["year", "change", "column", "previous column", "similarity"])
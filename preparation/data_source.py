@@ -0,0 +1,26 @@
+"""
+This file contains the source files helpers shared by the CSV parser backends (see data_load and data_polars)
+"""
+import zipfile
+
+# values recognized as missing by the pandas C parser, replicated for the Arrow and Polars readers
+PANDAS_NA_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+                    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+
+
+def open_source(file_path: str, member: str = None):
+    """
+    Opens a source for binary reading. Archive members are decompressed while they are read, with no temporary file.
+    :param file_path: CSV file path or zip archive path
+    :param member: archive member name, if file_path is a zip archive
+    :return: a binary file object
+    """
+    if member is None:
+        return open(file_path, "rb")
+    archive = zipfile.ZipFile(file_path)
+    try:
+        source = archive.open(member)
+    finally:
+        # the member file object keeps its own reference to the underlying file
+        archive.close()
+    return source
@@ -1,10 +1,21 @@
 """This module contains statistics on data."""
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, reduce
+import json
+import os
+import re
+from typing import Optional
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 
+from .data_polars import check_backend, column_sums, count_rows
+from .data_transform import feature_split_sparse
+from .data_weights import align_weights
+
 
 def map_any_case_to_lower(any_case_input: list) -> dict:
     """Map a list of strings values, given as input in any kind of casing combination, to a lower case corresponding key.
@@ -36,6 +47,143 @@ def drop_columns_from_map(df: object, dropping_map: object, column_to_drop: str)
     return df
 
 
+def select_columns(df: pd.DataFrame, columns_selection_criteria=None) -> pd.DataFrame:
+    """
+    Selects the columns holding languages data
+    :param df: input dataframe
+    :param columns_selection_criteria: a range variable, used to slice columns by position, or a string, used to
+    filter columns whose name contains it. If None, all the columns are selected.
+    :return: a dataframe holding selected columns
+    """
+    # filtering dataframe in case of string value as input languages_proficiency_columns parameter
+    if isinstance(columns_selection_criteria, str):
+        return df.filter(like=columns_selection_criteria)
+    # slicing features columns containing language proficiencies data
+    # in case of range value as input as languages_proficiency_columns parameter
+    if isinstance(columns_selection_criteria, range):
+        return df.iloc[:, columns_selection_criteria]
+    return df
+
+
+class ColumnsRulesPlan:
+    """
+    Exclusion and entries merge rules, compiled against a columns schema into columns positions: applying the plan
+    takes a single columns projection, followed by vectorized merges.
+    """
+
+    def __init__(self, keep_positions: list, merge_steps: list, report: dict):
+        """
+        :param keep_positions: positions of the columns kept, in order
+        :param merge_steps: (merger position, mergee position) couples, applied in order
+        :param report: rules that did not match any column, see get_report
+        """
+        self.__keep_positions = keep_positions
+        self.__merge_steps = merge_steps
+        self.__report = report
+
+    def get_keep_positions(self) -> list:
+        return list(self.__keep_positions)
+
+    def get_report(self) -> dict:
+        """
+        :return: a dictionary holding 'unmatched exclusions' (exclusion list items matching no column) and
+        'unmatched merges' (merge couples whose merger or mergee matches no remaining column)
+        """
+        return {key: list(value) for key, value in self.__report.items()}
+
+    def apply(self, df: pd.DataFrame, inplace: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Applies the plan to a dataframe having the columns schema the plan was compiled against. A merge fills the
+        rows where the merger column is set to 0 with the mergee column values.
+        :param df: input dataframe
+        :param inplace: If False, return a new dataframe. Otherwise, do operation inplace and return None.
+        :return: optionally returns a dataframe holding kept columns, merges applied
+        """
+        merged = {}
+        for merger, mergee in self.__merge_steps:
+            merger_values = merged[merger] if merger in merged else df.iloc[:, merger].to_numpy()
+            mergee_values = merged[mergee] if mergee in merged else df.iloc[:, mergee].to_numpy()
+            merged[merger] = np.where(merger_values == 0, mergee_values, merger_values)
+
+        if inplace:
+            for position, values in merged.items():
+                df.isetitem(position, values)
+            if len(self.__keep_positions) < df.shape[1]:
+                # dropping by position, as columns names may be duplicated
+                columns = df.columns
+                df.columns = pd.RangeIndex(len(columns))
+                df.drop(columns=df.columns.difference(self.__keep_positions), inplace=True)
+                df.columns = columns[self.__keep_positions]
+            return None
+
+        df_out = df.iloc[:, self.__keep_positions]
+        output_positions = {position: i for i, position in enumerate(self.__keep_positions)}
+        for position, values in merged.items():
+            df_out.isetitem(output_positions[position], values)
+        return df_out
+
+
+@lru_cache(maxsize=128)
+def compile_columns_rules(columns: tuple, exclusion_list: tuple = (), entries_merge_list: tuple = (),
+                          prefix: str = '', ignore_case: bool = True) -> ColumnsRulesPlan:
+    """
+    Compiles exclusion and entries merge rules against a columns schema. Plans are cached by schema and rules.
+    :param columns: columns names, as a tuple
+    :param exclusion_list: columns to be excluded, as a tuple
+    :param entries_merge_list: tuple of (merger, mergee) couples, named without prefix: mergee values are added to
+    merger where merger is set to 0, then mergee is dropped
+    :param prefix: prefix of merge entries columns names
+    :param ignore_case: if True, exclusion list items match columns in any case combination
+    :return: a ColumnsRulesPlan
+    """
+    columns_positions = defaultdict(list)
+    for i, column in enumerate(columns):
+        columns_positions[column.lower() if ignore_case else column].append(i)
+
+    excluded = set()
+    unmatched_exclusions = []
+    for to_be_excluded in exclusion_list:
+        positions = columns_positions.get(to_be_excluded.lower() if ignore_case else to_be_excluded)
+        if positions:
+            excluded.update(positions)
+        else:
+            unmatched_exclusions.append(to_be_excluded)
+
+    # merges are matched by exact name, among remaining columns
+    remaining_positions = {}
+    for i, column in enumerate(columns):
+        if i not in excluded:
+            remaining_positions.setdefault(column, i)
+    merge_steps = []
+    dropped = []
+    unmatched_merges = []
+    for merger_entry, mergee_entry in entries_merge_list:
+        merger = remaining_positions.get(prefix + merger_entry)
+        mergee = remaining_positions.get(prefix + mergee_entry)
+        if merger is None or mergee is None or merger == mergee:
+            unmatched_merges.append((merger_entry, mergee_entry))
+            continue
+        merge_steps.append((merger, mergee))
+        dropped.append(mergee)
+        del remaining_positions[prefix + mergee_entry]
+
+    dropped_set = set(dropped)
+    keep_positions = [i for i in range(len(columns)) if i not in excluded and i not in dropped_set]
+    return ColumnsRulesPlan(keep_positions, merge_steps,
+                            {"unmatched exclusions": unmatched_exclusions, "unmatched merges": unmatched_merges})
+
+
+def _weighted_column_sums(df: pd.DataFrame, weights: np.ndarray) -> pd.Series:
+    """
+    Sums numeric columns, each row being multiplied by its weight, missing values being skipped
+    :param df: input dataframe
+    :param weights: rows weights
+    :return: a series holding each numeric column weighted sum
+    """
+    df_numeric = df.select_dtypes(include=["number", "bool"])
+    return pd.Series(weights @ np.nan_to_num(df_numeric.to_numpy(dtype=float)), index=df_numeric.columns)
+
+
 class LanguagesStatsExtractor(ABC):
     """
     This is just an abstract base class that allows to define specific kind of stats extraction from a Dataframe
@@ -53,11 +201,18 @@ class LanguagesStatsExtractor(ABC):
     def get_stats(self) -> dict:
         pass
 
+    @abstractmethod
+    def get_params(self) -> dict:
+        """
+        Retrieves the data and parameters stats depend on, e.g. to key memoized stats (see data_memo)
+        :return: a dictionary of parameters, by name
+        """
+
 
 class LanguagesRankingExtractor(LanguagesStatsExtractor):
 
     def __init__(self, source_data: pd.DataFrame, columns_selection_criteria=None,
-                 exclusion_list=None, entries_merge_list=None, prefix_to_remove=''):
+                 exclusion_list=None, entries_merge_list=None, prefix_to_remove='', weights=None):
         """
 
         :type entries_merge_list: list
@@ -68,6 +223,9 @@ class LanguagesRankingExtractor(LanguagesStatsExtractor):
         :param prefix_to_remove: an optional string to be removed from returned series index
         :param entries_merge_list: this should be a list of couples. If provided, it will add values from tuple second
         element label to tuple first element label.
+        :param weights: optional respondents weights (e.g. fitted by data_weights.rake), as a series aligned on source
+        data index, every respondent having a weight, or as an array (see data_weights.align_weights): rankings,
+        percentages and shares then sum weights instead of counting respondents
         """
         if entries_merge_list is None:
             entries_merge_list = []
@@ -80,6 +238,8 @@ class LanguagesRankingExtractor(LanguagesStatsExtractor):
         self.__entries_merge_list = entries_merge_list
         self.__language_proficiency_ranking = None
         self.__top_ten_languages = None
+        self.__rules_report = None
+        self.__weights = None if weights is None else align_weights(weights, source_data.index)
 
     def compute_top_ten_languages(self, ignore_case=True) -> pd.Series:
         """
@@ -107,48 +267,57 @@ class LanguagesRankingExtractor(LanguagesStatsExtractor):
 
         return self.__top_ten_languages
 
-    def compute_language_proficiency_ranking(self, ignore_case=True, ascending=False) -> pd.Series:
+    def compute_proficiencies_frame(self, ignore_case=True) -> pd.DataFrame:
+        """
+        Selects language proficiencies data from source data, excluding values from exclusion list and merging
+        entries from entries merge list. Rules are compiled once for each columns schema (see compile_columns_rules),
+        and those not matching any column are reported by get_rules_report.
+        :param ignore_case: if True, the method will look for elements in exclusion_list to be in source dataframe,
+        ignoring occurrences casing (upper or lower case).
+        :return: a dataframe holding a column for each language taken into account by the ranking
+        """
+        df_proficiencies: pd.DataFrame = select_columns(self.__source_data, self.__columns_selection_criteria)
+
+        # excluding selected columns, representing proficiency
+        # (when not relevant, e.g. not a programming language) from final computation, and merging entries
+        plan = compile_columns_rules(tuple(df_proficiencies.columns), tuple(self.__exclusion_list),
+                                     tuple(tuple(t) for t in self.__entries_merge_list), self.__prefix_to_remove,
+                                     ignore_case)
+        self.__rules_report = plan.get_report()
+        return plan.apply(df_proficiencies)
+
+    def get_rules_report(self) -> dict:
+        """
+        Reports exclusion and merge rules not matching any column of source data, see ColumnsRulesPlan.get_report
+        :return: a dictionary holding 'unmatched exclusions' and 'unmatched merges' lists
+        """
+        if self.__rules_report is None:
+            self.compute_proficiencies_frame()
+        return self.__rules_report
+
+    def compute_language_proficiency_ranking(self, ignore_case=True, ascending=False,
+                                             backend="pandas") -> pd.Series:
         """
         Computes language proficiency ranking on source data, given a selected column range containing
         language proficiencies data.
         :param ignore_case: if True, the method will look for elements in exclusion_list to be in source dataframe,
         ignoring occurrences casing (upper or lower case).
         :param ascending: if True, the returning value will be ordered in ascending order.
+        :param backend: 'pandas', or 'polars' to sum columns in a multi-threaded query (see data_polars); weighted
+        rankings are always computed as a single matrix product
 
         :return: a Pandas Series containing language proficiency ranking, obtained through summation of values.
         from selected range, excepting values from exclusion list.
         """
-        # filtering dataframe in case of string value as input languages_proficiency_columns parameter
-        if isinstance(self.__columns_selection_criteria, str):
-            df_proficiencies: pd.DataFrame = self.__source_data.filter(like=self.__columns_selection_criteria)
-        # slicing features columns containing language proficiencies data
-        # in case of range value as input as languages_proficiency_columns parameter
-        elif isinstance(self.__columns_selection_criteria, range):
-            df_proficiencies: pd.DataFrame = self.__source_data.iloc[:, self.__columns_selection_criteria]
-        else:
-            df_proficiencies: pd.DataFrame = self.__source_data
-
-        # populating lower case version of column list, if requested
-        # proficiencies_column_names_lower_case = [column.lower() for column in df.columns]
-        proficiencies_lower_to_original_map = map_any_case_to_lower(list(df_proficiencies.columns))
-
-        # excluding selected columns, representing proficiency
-        # (when not relevant, e.g. not a programming language) from final computation
-        for to_be_excluded in self.__exclusion_list:
-            if ignore_case and (to_be_excluded.lower() in proficiencies_lower_to_original_map.keys()):
-                df_proficiencies = drop_columns_from_map(df_proficiencies, proficiencies_lower_to_original_map,
-                                      to_be_excluded.lower())
-            elif not ignore_case and (to_be_excluded in df_proficiencies.columns):
-                df_proficiencies.drop(to_be_excluded, axis=1, inplace=True)
-            else:
-                print(f"Error finding feature '{to_be_excluded}' in axis")
-
-        # merging entries from entries_merge_list, if not empty
-        if self.__entries_merge_list:
-            self.merge_entries(df_proficiencies, self.__entries_merge_list)
+        df_proficiencies = self.compute_proficiencies_frame(ignore_case=ignore_case)
 
         # computing total proficiencies
-        s_proficiencies_clean_sum: pd.Series = df_proficiencies.sum(axis=0, numeric_only=True)
+        if check_backend(backend) == "polars" and self.__weights is None:
+            s_proficiencies_clean_sum: pd.Series = column_sums(df_proficiencies)
+        elif self.__weights is not None:
+            s_proficiencies_clean_sum: pd.Series = _weighted_column_sums(df_proficiencies, self.__weights)
+        else:
+            s_proficiencies_clean_sum: pd.Series = df_proficiencies.sum(axis=0, numeric_only=True)
 
         # sorting values by popularity
         self.__language_proficiency_ranking = s_proficiencies_clean_sum.sort_values(ascending=ascending)
@@ -158,20 +327,15 @@ class LanguagesRankingExtractor(LanguagesStatsExtractor):
 
     def merge_entries(self, df_proficiencies: pd.DataFrame, entries_merge_list: list) -> None:
         """
-        Method that merges proficiencies entries
+        Method that merges proficiencies entries, inplace: mergee values fill the rows where reference data (merger)
+        used in final statistics has a "miss", i.e. is set to '0', then mergee is dropped
         :param df_proficiencies: input dataframe
         :param entries_merge_list: entries tuples merge list
         """
-        for t in entries_merge_list:
-            # summing columns to be merged
-            merger = self.__prefix_to_remove + t[0]
-            mergee = self.__prefix_to_remove + t[1]
-            # rows where reference data (merger) used in final statistics has a "miss", i.e. is set to '0'
-            condition_row = df_proficiencies.loc[:, merger] == 0
-
-            df_proficiencies.loc[condition_row, merger] = df_proficiencies.loc[condition_row, mergee]
-            # dropping merged column
-            df_proficiencies.drop(mergee, axis=1, inplace=True)
+        plan = compile_columns_rules(tuple(df_proficiencies.columns),
+                                     entries_merge_list=tuple(tuple(t) for t in entries_merge_list),
+                                     prefix=self.__prefix_to_remove)
+        plan.apply(df_proficiencies, inplace=True)
 
     def get_stats(self) -> dict:
         """
@@ -188,8 +352,42 @@ class LanguagesRankingExtractor(LanguagesStatsExtractor):
     def get_data_source(self):
         return self.__source_data
 
-    
-    
+    def get_prefix_to_remove(self) -> str:
+        return self.__prefix_to_remove
+
+    def get_weights(self) -> Optional[np.ndarray]:
+        """
+        Retrieves respondents weights, in source data order
+        :return: an array of weights, or None if the extractor is unweighted
+        """
+        return self.__weights
+
+    def get_params(self) -> dict:
+        return {"source_data": self.__source_data, "columns_selection_criteria": self.__columns_selection_criteria,
+                "exclusion_list": self.__exclusion_list, "entries_merge_list": self.__entries_merge_list,
+                "prefix_to_remove": self.__prefix_to_remove, "weights": self.__weights}
+
+    def count_respondents(self, mask=None) -> float:
+        """
+        Counts respondents, or sums their weights if the extractor is weighted
+        :param mask: optional boolean mask (or True) selecting respondents, all the respondents are counted otherwise
+        :return: number of respondents, or total weight
+        """
+        if mask is None or mask is True:
+            return self.__source_data.shape[0] if self.__weights is None else self.__weights.sum()
+        mask = np.asarray(mask, dtype=bool)
+        return int(mask.sum()) if self.__weights is None else self.__weights[mask].sum()
+
+    def export_stats(self, stats_path: str, platform_key: str = None) -> "LanguagesStatsSnapshot":
+        """
+        Stores derived stats only (no respondents data) on disk, see LanguagesStatsSnapshot
+        :param stats_path: destination folder
+        :param platform_key: optional platform column, used to store per platform aggregates
+        :return: the stored LanguagesStatsSnapshot
+        """
+        snapshot = LanguagesStatsSnapshot.from_extractor(self, platform_key=platform_key)
+        snapshot.save(stats_path)
+        return snapshot
 
 
 class LanguagesProficienciesPercentages(LanguagesStatsExtractor):
@@ -203,12 +401,31 @@ class LanguagesProficienciesPercentages(LanguagesStatsExtractor):
     def __init__(self, languages_ranking_extractor: LanguagesRankingExtractor):
         self.__lre = languages_ranking_extractor
 
+    def get_params(self) -> dict:
+        return {"languages_ranking_extractor": self.__lre}
+
+    def export_stats(self, stats_path: str, platform_key: str = None) -> "LanguagesStatsSnapshot":
+        """
+        Stores derived stats only (no respondents data) on disk, see LanguagesStatsSnapshot
+        :param stats_path: destination folder
+        :param platform_key: optional platform column, used to store per platform aggregates
+        :return: the stored LanguagesStatsSnapshot
+        """
+        return self.__lre.export_stats(stats_path, platform_key=platform_key)
+
+    def compute_language_proficiency_ranking(self) -> pd.Series:
+        """
+        Retrieves language proficiency ranking from the underlying LanguagesRankingExtractor
+        :return: a Pandas Series containing language proficiency ranking
+        """
+        return self.__lre.compute_language_proficiency_ranking()
+
     def get_percentages(self) -> pd.Series:
         """
         Retrieves programmers proficiency percentages, using  all languages as reference
         :return: full input data proficiency percentages
         """
-        percentages = (self.__lre.compute_language_proficiency_ranking() / self.__lre.get_data_source().shape[0]) * 100
+        percentages = (self.__lre.compute_language_proficiency_ranking() / self.__lre.count_respondents()) * 100
         return percentages
 
     def get_top_ten_percentages(self) -> pd.Series:
@@ -216,7 +433,7 @@ class LanguagesProficienciesPercentages(LanguagesStatsExtractor):
         Retrieves programmers proficiency percentages, using top ten languages only as reference
         :return: top ten languages data proficiency percentages
         """
-        percentages = (self.__lre.compute_top_ten_languages() / self.__lre.get_data_source().shape[0]) * 100
+        percentages = (self.__lre.compute_top_ten_languages() / self.__lre.count_respondents()) * 100
         return percentages
 
     def get_stats(self) -> dict:
@@ -225,7 +442,7 @@ class LanguagesProficienciesPercentages(LanguagesStatsExtractor):
         Description
         :return: number of respondents, proficiency percentages and top ten languages percentages
         """
-        return {'number respondents': self.get_data_source().shape[1],
+        return {'number respondents': self.__lre.count_respondents(),
                 'proficiency percentages': self.get_percentages(),
                 'top ten proficiency percentages': self.get_top_ten_percentages()}
 
@@ -249,13 +466,18 @@ class LanguagesProficienciesPercentages(LanguagesStatsExtractor):
         df_languages_shares = df_languages_filtered[df_languages_filtered.eq(1).any(axis=1) & platform_condition]
         # sum on columns
         # computing total proficiencies
-        s_proficiencies_clean_sum: pd.Series = df_languages_shares.sum(axis=0, numeric_only=True)
+        if self.__lre.get_weights() is None:
+            s_proficiencies_clean_sum: pd.Series = df_languages_shares.sum(axis=0, numeric_only=True)
+        else:
+            shares_mask = (df_languages_filtered.eq(1).any(axis=1) & platform_condition).to_numpy()
+            s_proficiencies_clean_sum: pd.Series = _weighted_column_sums(df_languages_shares,
+                                                                         self.__lre.get_weights()[shares_mask])
         languages_proficiency_on_platform_ranking = s_proficiencies_clean_sum.sort_values(ascending=False)
 
         return languages_proficiency_on_platform_ranking
 
     def joint_share(self, languages: list, unison: bool=False,
-                    platform_key: str="PlatformWorkedWith", platform: str=None) -> float:
+                    platform_key: str="PlatformWorkedWith", platform: str=None, backend: str="pandas") -> float:
         """Compute languages experience joint share with reference to a platform.
 
         A percentage value that expresses the size of the languages list share on a selected platform is
@@ -265,21 +487,27 @@ class LanguagesProficienciesPercentages(LanguagesStatsExtractor):
             languages (list): list of languages considered in the share computation
             unison (bool, optional): If true, will indi. Defaults to False.
             platform (str, optional): _description_. Defaults to None.
+            backend (str, optional): 'pandas', or 'polars' to count respondents in a multi-threaded query
+                (see data_polars), unless respondents are weighted. Defaults to 'pandas'.
 
         Returns:
             float: share percentage of the languges
         """
+        if check_backend(backend) == "polars" and self.__lre.get_weights() is None:
+            share_sum, population_size = count_rows(self.__lre.get_data_source(), languages, unison=unison,
+                                                    platform_key=platform_key, platform=platform)
+            return (share_sum/population_size) * 100
         if platform is None:
             platform_condition = True
-            population_size = self.__lre.get_data_source().shape[0]
+            population_size = self.__lre.count_respondents()
         else:
             platform_condition = self.__lre.get_data_source()[platform_key] == platform
-            population_size = self.__lre.get_data_source()[platform_condition].shape[0]
+            population_size = self.__lre.count_respondents(platform_condition)
         
         if unison:
-            share_sum = self.__lre.get_data_source()[((self.__lre.get_data_source()[languages] !=0).all(axis=1)) & platform_condition].shape[0]
+            share_sum = self.__lre.count_respondents(((self.__lre.get_data_source()[languages] !=0).all(axis=1)) & platform_condition)
         else:
-            share_sum = self.__lre.get_data_source()[((self.__lre.get_data_source()[languages] !=0).any(axis=1)) & platform_condition].shape[0]
+            share_sum = self.__lre.count_respondents(((self.__lre.get_data_source()[languages] !=0).any(axis=1)) & platform_condition)
 
         return (share_sum/population_size) * 100
     
@@ -292,14 +520,14 @@ class LanguagesProficienciesPercentages(LanguagesStatsExtractor):
         """
         if platform is None:
             platform_condition = True
-            population_size = self.__lre.get_data_source().shape[0]
+            population_size = self.__lre.count_respondents()
         else:
             platform_condition = self.__lre.get_data_source()["PlatformWorkedWith"] == platform
-            population_size = self.__lre.get_data_source()[platform_condition].shape[0]
+            population_size = self.__lre.count_respondents(platform_condition)
         
         reference_language_mask = self.__lre.get_data_source()[ref_language] != 0
 
-        ref_share = self.__lre.get_data_source()[reference_language_mask & (self.__lre.get_data_source()[excluded_languages] == 0).all(axis=1) & platform_condition].shape[0]
+        ref_share = self.__lre.count_respondents(reference_language_mask & (self.__lre.get_data_source()[excluded_languages] == 0).all(axis=1) & platform_condition)
 
         return (ref_share/population_size) * 100
 
@@ -311,12 +539,12 @@ class LanguagesProficienciesPercentages(LanguagesStatsExtractor):
         :return: overlap cardinality, in percentage
         """
         if overall:
-            base_count = self.__lre.get_data_source().shape[0]
+            base_count = self.__lre.count_respondents()
         else:
-            base_count = self.__lre.get_data_source()[self.__lre.get_data_source()[language_1] != 0].shape[0] 
+            base_count = self.__lre.count_respondents(self.__lre.get_data_source()[language_1] != 0)
             
         
-        overlap_count = self.__lre.get_data_source()[(self.__lre.get_data_source()[language_1] != 0)  &  (self.__lre.get_data_source()[language_2] != 0)].shape[0]
+        overlap_count = self.__lre.count_respondents((self.__lre.get_data_source()[language_1] != 0)  &  (self.__lre.get_data_source()[language_2] != 0))
 
         overlap = (overlap_count / base_count) * 100
         return overlap
@@ -327,12 +555,983 @@ class LanguagesProficienciesPercentages(LanguagesStatsExtractor):
         :param: union_relative if true, the base to compute the percentage, will be the cardinality of union of language_1 and language_2 respondents, otherwise it will be language_1 population cardinality
         """
         if union_relative:
-            base_count = self.__lre.get_data_source()[(self.__lre.get_data_source()[language_1] != 0)  &  (self.__lre.get_data_source()[language_2] != 0)].shape[0]
+            base_count = self.__lre.count_respondents((self.__lre.get_data_source()[language_1] != 0)  &  (self.__lre.get_data_source()[language_2] != 0))
         else:
-            base_count = self.__lre.get_data_source()[self.__lre.get_data_source()[language_1] != 0].shape[0] 
+            base_count = self.__lre.count_respondents(self.__lre.get_data_source()[language_1] != 0)
             
-        difference_count = (self.__lre.get_data_source()[(self.__lre.get_data_source()[language_1] != 0)  &  (self.__lre.get_data_source()[language_2] == 0)].shape[0])
+        difference_count = self.__lre.count_respondents((self.__lre.get_data_source()[language_1] != 0)  &  (self.__lre.get_data_source()[language_2] == 0))
 
         difference = (difference_count / base_count) * 100
         return difference
 
+
+
+
+class LanguagesStatsSnapshot:
+    """
+    This class holds languages stats derived from a LanguagesRankingExtractor, with no respondents data: per language
+    counts, pairwise co-occurrence counts and per platform counts, along with respondents totals.
+
+    Snapshots are stored as a folder of .npy arrays, plus a small metadata.json file, so that they can be reopened
+    memory-mapped. They answer the same percentages and shares queries as LanguagesProficienciesPercentages.
+
+    Snapshots are partial aggregates too: snapshots of disjoint shards of respondents (e.g. chunks of a year, or
+    different years) are combined, through combine or combine_all, into the exact snapshot of all the respondents
+    (see compute_sharded_snapshot).
+    """
+
+    METADATA_FILE_NAME = "metadata.json"
+    ARRAYS_NAMES = ("counts", "co_occurrence", "platform_counts", "platform_respondents")
+
+    def __init__(self, languages: list, counts: np.ndarray, respondents: int, co_occurrence: np.ndarray,
+                 platforms: list = None, platform_counts: np.ndarray = None, platform_respondents: np.ndarray = None,
+                 prefix_to_remove: str = ''):
+        """
+        :param languages: languages column names
+        :param counts: per language sum of values
+        :param respondents: number of respondents
+        :param co_occurrence: languages x languages count of respondents having both languages
+        :param platforms: platform names
+        :param platform_counts: platforms x languages sum of values
+        :param platform_respondents: per platform number of respondents
+        :param prefix_to_remove: string removed from top ten languages index, as in LanguagesRankingExtractor
+        """
+        if platforms is None:
+            platforms = []
+            platform_counts = np.zeros((0, len(languages)))
+            platform_respondents = np.zeros(0, dtype=np.int64)
+        self.__languages = pd.Index(languages)
+        self.__counts = counts
+        self.__respondents = int(respondents)
+        self.__co_occurrence = co_occurrence
+        self.__platforms = pd.Index(platforms)
+        self.__platform_counts = platform_counts
+        self.__platform_respondents = platform_respondents
+        self.__prefix_to_remove = prefix_to_remove
+
+    @classmethod
+    def from_extractor(cls, lre: LanguagesRankingExtractor, platform_key: str = None) -> "LanguagesStatsSnapshot":
+        """
+        Computes a snapshot from a LanguagesRankingExtractor
+        :param lre: source extractor
+        :param platform_key: optional platform column, used to compute per platform aggregates
+        :return: a LanguagesStatsSnapshot
+        """
+        if lre.get_weights() is not None:
+            raise ValueError("snapshots hold respondents counts, they cannot be computed from a weighted extractor")
+        df_proficiencies = lre.compute_proficiencies_frame().select_dtypes(include="number")
+        values = df_proficiencies.to_numpy(dtype=float)
+        counts = np.nansum(values, axis=0)
+        # matching LanguagesProficienciesPercentages shares, where any non-zero value counts as proficiency
+        indicators = (values != 0).astype(float)
+        co_occurrence = (indicators.T @ indicators).astype(np.int64)
+
+        platforms = None
+        platform_counts = None
+        platform_respondents = None
+        if platform_key is not None:
+            codes, platforms = pd.factorize(lre.get_data_source()[platform_key])
+            platforms_one_hot = np.zeros((len(codes), len(platforms)))
+            platforms_one_hot[np.flatnonzero(codes >= 0), codes[codes >= 0]] = 1
+            platform_counts = platforms_one_hot.T @ np.nan_to_num(values)
+            platform_respondents = platforms_one_hot.sum(axis=0).astype(np.int64)
+            platforms = list(platforms)
+        return cls(list(df_proficiencies.columns), counts, values.shape[0], co_occurrence, platforms,
+                   platform_counts, platform_respondents, prefix_to_remove=lre.get_prefix_to_remove())
+
+    def combine(self, other: "LanguagesStatsSnapshot") -> "LanguagesStatsSnapshot":
+        """
+        Combines the snapshots of two disjoint sets of respondents. Languages and platforms are aligned by name, those
+        missing from a snapshot counting 0 in it, and are kept in order of first appearance, so that combination is
+        associative.
+        :param other: snapshot to be combined with this one
+        :return: a new LanguagesStatsSnapshot, holding the stats of both sets of respondents
+        """
+        if self.__prefix_to_remove != other.get_prefix_to_remove():
+            raise ValueError(f"snapshots with different prefixes to remove cannot be combined: "
+                             f"'{self.__prefix_to_remove}' and '{other.get_prefix_to_remove()}'")
+        other_languages, other_platforms = pd.Index(other.get_languages()), pd.Index(other.get_platforms())
+        languages = self.__languages.append(other_languages[~other_languages.isin(self.__languages)])
+        platforms = self.__platforms.append(other_platforms[~other_platforms.isin(self.__platforms)])
+
+        def aligned(snapshot: "LanguagesStatsSnapshot") -> dict:
+            languages_positions = languages.get_indexer(snapshot.get_languages())
+            platforms_positions = platforms.get_indexer(snapshot.get_platforms())
+            snapshot_arrays = snapshot.get_arrays()
+            counts = np.zeros(len(languages))
+            counts[languages_positions] = snapshot_arrays["counts"]
+            co_occurrence = np.zeros((len(languages), len(languages)), dtype=np.int64)
+            co_occurrence[np.ix_(languages_positions, languages_positions)] = snapshot_arrays["co_occurrence"]
+            platform_counts = np.zeros((len(platforms), len(languages)))
+            platform_counts[np.ix_(platforms_positions, languages_positions)] = snapshot_arrays["platform_counts"]
+            platform_respondents = np.zeros(len(platforms), dtype=np.int64)
+            platform_respondents[platforms_positions] = snapshot_arrays["platform_respondents"]
+            return {"counts": counts, "co_occurrence": co_occurrence, "platform_counts": platform_counts,
+                    "platform_respondents": platform_respondents}
+
+        arrays, other_arrays = aligned(self), aligned(other)
+        combined = {name: arrays[name] + other_arrays[name] for name in self.ARRAYS_NAMES}
+        return LanguagesStatsSnapshot(list(languages), combined["counts"],
+                                      self.__respondents + other.get_number_respondents(),
+                                      combined["co_occurrence"], list(platforms), combined["platform_counts"],
+                                      combined["platform_respondents"], prefix_to_remove=self.__prefix_to_remove)
+
+    @classmethod
+    def combine_all(cls, snapshots) -> "LanguagesStatsSnapshot":
+        """
+        Combines the snapshots of disjoint sets of respondents, see combine
+        :param snapshots: a non-empty iterable of LanguagesStatsSnapshot
+        :return: a LanguagesStatsSnapshot, holding the stats of all the respondents
+        """
+        snapshots = iter(snapshots)
+        try:
+            first = next(snapshots)
+        except StopIteration:
+            raise ValueError("at least one snapshot is required") from None
+        return reduce(cls.combine, snapshots, first)
+
+    def to_dict(self) -> dict:
+        """
+        Converts snapshot to a dictionary of plain python values, e.g. to be sent as JSON to another process
+        :return: a dictionary holding snapshot arrays, as lists, and metadata
+        """
+        return {"languages": [str(lang) for lang in self.__languages], "counts": np.asarray(self.__counts).tolist(),
+                "respondents": self.__respondents, "co_occurrence": np.asarray(self.__co_occurrence).tolist(),
+                "platforms": [str(p) for p in self.__platforms],
+                "platform_counts": np.asarray(self.__platform_counts).tolist(),
+                "platform_respondents": np.asarray(self.__platform_respondents).tolist(),
+                "prefix_to_remove": self.__prefix_to_remove}
+
+    @classmethod
+    def from_dict(cls, snapshot_dict: dict) -> "LanguagesStatsSnapshot":
+        """
+        Builds a snapshot from a dictionary returned by to_dict
+        :param snapshot_dict: snapshot dictionary
+        :return: a LanguagesStatsSnapshot
+        """
+        n_languages = len(snapshot_dict["languages"])
+        return cls(snapshot_dict["languages"], np.asarray(snapshot_dict["counts"], dtype=float),
+                   snapshot_dict["respondents"],
+                   np.asarray(snapshot_dict["co_occurrence"], dtype=np.int64).reshape(n_languages, n_languages),
+                   snapshot_dict["platforms"],
+                   np.asarray(snapshot_dict["platform_counts"], dtype=float).reshape(-1, n_languages),
+                   np.asarray(snapshot_dict["platform_respondents"], dtype=np.int64),
+                   prefix_to_remove=snapshot_dict["prefix_to_remove"])
+
+    def save(self, stats_path: str) -> None:
+        """
+        Stores snapshot on disk
+        :param stats_path: destination folder
+        """
+        os.makedirs(stats_path, exist_ok=True)
+        arrays = self.get_arrays()
+        for name in self.ARRAYS_NAMES:
+            np.save(os.path.join(stats_path, f"{name}.npy"), arrays[name])
+        metadata = {"languages": [str(lang) for lang in self.__languages], "respondents": self.__respondents,
+                    "platforms": [str(p) for p in self.__platforms], "prefix_to_remove": self.__prefix_to_remove}
+        with open(os.path.join(stats_path, self.METADATA_FILE_NAME), "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+
+    @classmethod
+    def load(cls, stats_path: str, mmap: bool = True) -> "LanguagesStatsSnapshot":
+        """
+        Loads a snapshot stored through save
+        :param stats_path: source folder
+        :param mmap: if True, arrays are memory-mapped rather than read
+        :return: a LanguagesStatsSnapshot
+        """
+        with open(os.path.join(stats_path, cls.METADATA_FILE_NAME), encoding="utf-8") as f:
+            metadata = json.load(f)
+        arrays = {name: np.load(os.path.join(stats_path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+                  for name in cls.ARRAYS_NAMES}
+        return cls(metadata["languages"], arrays["counts"], metadata["respondents"], arrays["co_occurrence"],
+                   metadata["platforms"], arrays["platform_counts"], arrays["platform_respondents"],
+                   prefix_to_remove=metadata["prefix_to_remove"])
+
+    def get_languages(self) -> list:
+        return list(self.__languages)
+
+    def get_platforms(self) -> list:
+        return list(self.__platforms)
+
+    def get_number_respondents(self) -> int:
+        return self.__respondents
+
+    def get_prefix_to_remove(self) -> str:
+        return self.__prefix_to_remove
+
+    def get_arrays(self) -> dict:
+        """
+        Retrieves snapshot arrays, read-only
+        :return: a dictionary in the form of {array name : array}, for each name of ARRAYS_NAMES
+        """
+        arrays = {"counts": self.__counts, "co_occurrence": self.__co_occurrence,
+                  "platform_counts": self.__platform_counts, "platform_respondents": self.__platform_respondents}
+        views = {}
+        for name in self.ARRAYS_NAMES:
+            views[name] = np.asarray(arrays[name]).view()
+            views[name].flags.writeable = False
+        return views
+
+    def compute_language_proficiency_ranking(self, ascending=False) -> pd.Series:
+        """
+        Retrieves language proficiency ranking
+        :param ascending: if True, the returning value will be ordered in ascending order.
+        :return: a Pandas Series containing language proficiency ranking
+        """
+        return pd.Series(np.asarray(self.__counts), index=self.__languages).sort_values(ascending=ascending)
+
+    def compute_top_ten_languages(self) -> pd.Series:
+        """
+        Retrieves top ten languages by proficiency
+        :return: a Pandas' series of at most 10 elements, ordered from the most to the least popular.
+        """
+        top_ten_languages = self.compute_language_proficiency_ranking().iloc[:10]
+        top_ten_languages.index = top_ten_languages.index.str.replace(self.__prefix_to_remove, '')
+        return top_ten_languages
+
+    def get_percentages(self) -> pd.Series:
+        """
+        Retrieves programmers proficiency percentages, using  all languages as reference
+        :return: full input data proficiency percentages
+        """
+        return (self.compute_language_proficiency_ranking() / self.__respondents) * 100
+
+    def get_top_ten_percentages(self) -> pd.Series:
+        """
+        Retrieves programmers proficiency percentages, using top ten languages only as reference
+        :return: top ten languages data proficiency percentages
+        """
+        return (self.compute_top_ten_languages() / self.__respondents) * 100
+
+    def get_stats(self) -> dict:
+        """Retrieve proficiency percentages.
+
+        :return: number of respondents, proficiency percentages and top ten languages percentages
+        """
+        return {'number respondents': self.__respondents,
+                'proficiency percentages': self.get_percentages(),
+                'top ten proficiency percentages': self.get_top_ten_percentages()}
+
+    def platform_shares(self, platform: str) -> pd.Series:
+        """
+        Retrieves languages proficiency on a platform
+        :param platform: name of the platform
+        :return: languages proficiency on the platform, in descending order
+        """
+        p = self.__platforms.get_loc(platform)
+        return pd.Series(np.asarray(self.__platform_counts[p]), index=self.__languages).sort_values(ascending=False)
+
+    def intersection_percentage(self, language_1: str, language_2: str, overall: bool = False) -> float:
+        """
+        Percentage of respondents having worked with language_1 that have worked with language_2 too
+        :param language_1: first language column name
+        :param language_2: second language column name
+        :param overall: if True, the percentage refers to all the respondents, otherwise to language_1 respondents
+        :return: overlap cardinality, in percentage
+        """
+        i, j = self.__languages.get_loc(language_1), self.__languages.get_loc(language_2)
+        base_count = self.__respondents if overall else self.__co_occurrence[i, i]
+        return (self.__co_occurrence[i, j] / base_count) * 100
+
+    def difference_percentage(self, language_1: str, language_2: str, union_relative: bool = False) -> float:
+        """
+        Percentage of respondents having worked with language_1 that have not worked with language_2
+        :param language_1: first language column name
+        :param language_2: second language column name
+        :param union_relative: as in LanguagesProficienciesPercentages.difference_percentage
+        :return: difference cardinality, in percentage
+        """
+        i, j = self.__languages.get_loc(language_1), self.__languages.get_loc(language_2)
+        difference_count = self.__co_occurrence[i, i] - self.__co_occurrence[i, j]
+        base_count = self.__co_occurrence[i, j] if union_relative else self.__co_occurrence[i, i]
+        return (difference_count / base_count) * 100
+
+
+def _shard_snapshot(shard: pd.DataFrame, transform, extractor_kwargs: dict,
+                    platform_key: str) -> LanguagesStatsSnapshot:
+    """
+    Computes the snapshot of a shard of respondents, in a worker process
+    :param shard: respondents data
+    :param transform: optional function applied to shard before stats extraction (e.g. a feature split)
+    :param extractor_kwargs: LanguagesRankingExtractor parameters
+    :param platform_key: optional platform column
+    :return: shard LanguagesStatsSnapshot
+    """
+    if transform is not None:
+        shard = transform(shard)
+    return LanguagesStatsSnapshot.from_extractor(LanguagesRankingExtractor(shard, **extractor_kwargs),
+                                                 platform_key=platform_key)
+
+
+def compute_sharded_snapshot(shards, columns_selection_criteria=None, exclusion_list=None, entries_merge_list=None,
+                             prefix_to_remove='', platform_key: str = None, transform=None,
+                             max_workers: int = None) -> LanguagesStatsSnapshot:
+    """
+    Computes the snapshot of respondents split into shards (e.g. chunks of a year, or years), each shard being
+    aggregated by a worker process, and shards snapshots being combined in shards order as they arrive. Results are
+    the ones of a single LanguagesRankingExtractor over all the respondents, without holding them all in one
+    process: no more than max_workers shards are submitted at once, so that shards can be read lazily.
+    :param shards: a non-empty iterable (e.g. a generator) of respondents dataframes, holding disjoint sets of
+    respondents
+    :param columns_selection_criteria: as in LanguagesRankingExtractor
+    :param exclusion_list: as in LanguagesRankingExtractor
+    :param entries_merge_list: as in LanguagesRankingExtractor
+    :param prefix_to_remove: as in LanguagesRankingExtractor
+    :param platform_key: optional platform column, used to compute per platform aggregates
+    :param transform: optional picklable function applied to each shard in its worker, before stats extraction
+    :param max_workers: number of worker processes, 1 to compute shards in the calling process
+    :return: the combined LanguagesStatsSnapshot
+    """
+    extractor_kwargs = {"columns_selection_criteria": columns_selection_criteria, "exclusion_list": exclusion_list,
+                        "entries_merge_list": entries_merge_list, "prefix_to_remove": prefix_to_remove}
+    if max_workers == 1:
+        return LanguagesStatsSnapshot.combine_all(_shard_snapshot(shard, transform, extractor_kwargs, platform_key)
+                                                  for shard in shards)
+    window = max_workers or os.cpu_count() or 1
+    combined = None
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = deque()
+        for shard in shards:
+            futures.append(executor.submit(_shard_snapshot, shard, transform, extractor_kwargs, platform_key))
+            del shard
+            if len(futures) >= window:
+                snapshot = futures.popleft().result()
+                combined = snapshot if combined is None else combined.combine(snapshot)
+        while futures:
+            snapshot = futures.popleft().result()
+            combined = snapshot if combined is None else combined.combine(snapshot)
+    if combined is None:
+        raise ValueError("at least one shard is required")
+    return combined
+
+
+class LanguagesTransitionExtractor(LanguagesStatsExtractor):
+    """
+    This class computes "worked with -> want to work with" languages transitions, from a single year survey holding
+    both answers as joint (separated) values columns.
+    """
+
+    def __init__(self, source_data: pd.DataFrame, worked_column: str = "LanguageHaveWorkedWith",
+                 wanted_column: str = "LanguageWantToWorkWith", sep: str = ";", normalize: str = "row"):
+        """
+        :param source_data: single year survey data
+        :param worked_column: column holding languages respondents have worked with
+        :param wanted_column: column holding languages respondents want to work with
+        :param sep: separator of multiple languages answers
+        :param normalize: transition matrix normalization, 'row' (with respect to respondents that have worked with
+        the row language), 'overall' (with respect to all the respondents) or None (counts).
+        """
+        if normalize not in ("row", "overall", None):
+            raise ValueError(f"normalize must be 'row', 'overall' or None, got '{normalize}'")
+        self.__source_data = source_data
+        self.__worked_column = worked_column
+        self.__wanted_column = wanted_column
+        self.__sep = sep
+        self.__normalize = normalize
+        self.__transition_counts = None
+        self.__worked_counts = None
+
+    def get_data_source(self) -> DataFrame:
+        return self.__source_data
+
+    def get_params(self) -> dict:
+        return {"source_data": self.__source_data, "worked_column": self.__worked_column,
+                "wanted_column": self.__wanted_column, "sep": self.__sep, "normalize": self.__normalize}
+
+    def compute_transition_counts(self) -> pd.DataFrame:
+        """
+        Computes the number of respondents that have worked with a language (rows) and want to work with a language
+        (columns), for every couple of languages, in a single sparse matrix product.
+        :return: a languages x languages dataframe of respondents counts
+        """
+        if self.__transition_counts is None:
+            indicators, languages = feature_split_sparse(self.__source_data, [self.__worked_column,
+                                                                              self.__wanted_column], sep=self.__sep)
+            worked = indicators[self.__worked_column]
+            wanted = indicators[self.__wanted_column]
+            counts = (worked.T @ wanted).toarray()
+            self.__transition_counts = pd.DataFrame(counts, index=pd.Index(languages, name="worked with"),
+                                                    columns=pd.Index(languages, name="want to work with"))
+            self.__worked_counts = pd.Series(np.asarray(worked.sum(axis=0)).ravel(), index=languages)
+        return self.__transition_counts
+
+    def compute_transition_matrix(self, normalize: str = None) -> pd.DataFrame:
+        """
+        Computes the languages transition matrix
+        :param normalize: overrides normalization given at construction time, see __init__
+        :return: a languages x languages dataframe of transitions, in percentage when normalized
+        """
+        if normalize is None:
+            normalize = self.__normalize
+        counts = self.compute_transition_counts()
+        if normalize == "row":
+            # languages nobody has worked with have no outgoing transition
+            return counts.div(self.__worked_counts.replace(0, np.nan), axis=0).fillna(0) * 100
+        if normalize == "overall":
+            return (counts / self.__source_data.shape[0]) * 100
+        return counts
+
+    def compute_retention(self) -> pd.Series:
+        """
+        Computes languages retention, i.e. the percentage of respondents that have worked with a language and want to
+        keep on working with it
+        :return: a series of retention percentages, in descending order
+        """
+        counts = self.compute_transition_counts()
+        retention = pd.Series(np.diag(counts.to_numpy()), index=counts.index) / self.__worked_counts.replace(0, np.nan)
+        return (retention.dropna() * 100).sort_values(ascending=False)
+
+    def get_stats(self) -> dict:
+        """
+        This method returns a dictionary holding transition counts, transition matrix and retention
+        :return: a dictionary holding transition counts, transition matrix and retention
+        """
+        return {'transition counts': self.compute_transition_counts(),
+                'transition matrix': self.compute_transition_matrix(),
+                'retention': self.compute_retention()}
+
+
+def compute_transitions_by_year(data_frames_dict: dict, worked_columns="LanguageHaveWorkedWith",
+                                wanted_columns="LanguageWantToWorkWith", sep: str = ";",
+                                normalize: str = "row") -> dict:
+    """
+    Computes languages transitions stats for several years
+    :param data_frames_dict: dataframe dictionary in the form of {year : dataframe}
+    :param worked_columns: worked with column name, or a dictionary in the form of {year : column name}
+    :param wanted_columns: want to work with column name, or a dictionary in the form of {year : column name}
+    :param sep: separator of multiple languages answers
+    :param normalize: transition matrix normalization, see LanguagesTransitionExtractor
+    :return: a dictionary in the form of {year : transitions stats}
+    """
+    transitions = {}
+    for year, df in data_frames_dict.items():
+        worked_column = worked_columns[year] if isinstance(worked_columns, dict) else worked_columns
+        wanted_column = wanted_columns[year] if isinstance(wanted_columns, dict) else wanted_columns
+        transitions[year] = LanguagesTransitionExtractor(df, worked_column, wanted_column, sep=sep,
+                                                         normalize=normalize).get_stats()
+    return transitions
+
+# experience buckets lower bounds (in years) and labels, buckets include lower bound and exclude upper bound
+EXPERIENCE_BINS = [0, 1, 2, 5, 10, 20, 30, np.inf]
+EXPERIENCE_LABELS = ["<1", "1-2", "2-5", "5-10", "10-20", "20-30", "30+"]
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+@lru_cache(maxsize=None)
+def parse_experience_value(value) -> float:
+    """Parse a years of experience answer into a representative number of years.
+
+    Answers format changes from year to year: plain numbers ('7'), ranges ('2-5', '2 - 5 years', '6 to 8 years',
+    '2/5'), lower bounds ('11+', '20 or more years', 'More than 50 years') and upper bounds ('<2',
+    'Less than 1 year', 'Less than a year'). Ranges are mapped to their midpoint, lower bounds to the bound itself and
+    upper bounds to half the bound. Results are cached, so that each distinct answer is parsed only once.
+
+    :param value: raw answer
+    :return: years of experience, NaN if the answer cannot be parsed
+    """
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    if not isinstance(value, str):
+        return np.nan
+    answer = value.strip().lower()
+    numbers = [float(n) for n in _NUMBER_RE.findall(answer)]
+    if not numbers and re.search(r"\ba year\b", answer):
+        numbers = [1.0]
+    if not numbers:
+        return np.nan
+    if answer.startswith("<") or "less than" in answer:
+        return numbers[0] / 2
+    if "+" in answer or "more than" in answer or "or more" in answer:
+        return numbers[0]
+    if len(numbers) > 1:
+        return (numbers[0] + numbers[1]) / 2
+    return numbers[0]
+
+
+def parse_experience_column(experience: pd.Series) -> pd.Series:
+    """
+    Parses a years of experience column into numbers of years, in a vectorized way: each distinct answer is parsed
+    once (see parse_experience_value) and the resulting mapping is applied to the whole column.
+    :param experience: years of experience raw answers
+    :return: a float series holding years of experience, NaN where the answer is missing or cannot be parsed
+    """
+    codes, uniques = pd.factorize(experience)
+    value_mapping = np.array([parse_experience_value(u) for u in uniques] + [np.nan], dtype=float)
+    # missing values have code -1, i.e. the trailing NaN in value_mapping
+    return pd.Series(value_mapping[codes], index=experience.index, name=experience.name)
+
+
+def experience_buckets(experience: pd.Series, bins: list = None, labels: list = None) -> pd.Series:
+    """
+    Parses a years of experience column into experience buckets
+    :param experience: years of experience raw answers
+    :param bins: buckets lower bounds, followed by the last bucket upper bound. Defaults to EXPERIENCE_BINS.
+    :param labels: buckets labels. Defaults to EXPERIENCE_LABELS.
+    :return: a categorical series holding experience buckets
+    """
+    if bins is None:
+        bins = EXPERIENCE_BINS
+        labels = EXPERIENCE_LABELS if labels is None else labels
+    return pd.cut(parse_experience_column(experience), bins=bins, labels=labels, right=False)
+
+
+def build_experience_language_cube(data_frames_dict: dict, experience_columns, columns_selection_criteria=None,
+                                   prefix_to_remove='', bins: list = None, labels: list = None) -> dict:
+    """Build a year x experience bucket x language respondents count cube.
+
+    Each year is aggregated in a single pass, as the product of the experience buckets one-hot matrix and the
+    languages indicators matrix. Violin plots and heatmaps can then slice the cube, with no further scan of raw data.
+
+    :param data_frames_dict: dataframe dictionary in the form of {year : dataframe}, with split languages columns
+    :param experience_columns: years of experience column name, or a dictionary in the form of {year : column name}
+    :param columns_selection_criteria: languages columns selection criteria (see select_columns), or a dictionary in
+    the form of {year : selection criteria}
+    :param prefix_to_remove: a string to be removed from languages column names, or a dictionary in the form of
+    {year : prefix}, so that the same language is named the same way over the years
+    :param bins: experience buckets bounds, see experience_buckets
+    :param labels: experience buckets labels, see experience_buckets
+    :return: a dictionary holding two values: 'counts', a dataframe indexed by (year, experience bucket) with a
+    column for each language, and 'respondents', a series holding the number of respondents for each (year, experience
+    bucket) couple.
+    """
+    counts = []
+    respondents = []
+    for year, df in data_frames_dict.items():
+        experience_column = experience_columns[year] if isinstance(experience_columns, dict) else experience_columns
+        criteria = columns_selection_criteria[year] \
+            if isinstance(columns_selection_criteria, dict) else columns_selection_criteria
+        prefix = prefix_to_remove[year] if isinstance(prefix_to_remove, dict) else prefix_to_remove
+
+        buckets = experience_buckets(df[experience_column], bins=bins, labels=labels)
+        df_languages = select_columns(df, criteria).select_dtypes(include="number")
+        languages = df_languages.columns.str.replace(prefix, '')
+
+        # respondents with no valid experience answer are left out
+        codes = buckets.cat.codes.to_numpy()
+        valid_rows = codes >= 0
+        n_buckets = len(buckets.cat.categories)
+        buckets_one_hot = np.zeros((valid_rows.sum(), n_buckets))
+        buckets_one_hot[np.arange(valid_rows.sum()), codes[valid_rows]] = 1
+        languages_indicators = (df_languages.to_numpy()[valid_rows] > 0).astype(float)
+
+        year_index = pd.MultiIndex.from_product([[year], buckets.cat.categories], names=["year", "experience"])
+        counts.append(pd.DataFrame(buckets_one_hot.T @ languages_indicators, index=year_index, columns=languages))
+        respondents.append(pd.Series(np.bincount(codes[valid_rows], minlength=n_buckets), index=year_index))
+
+    # languages missing in a year are counted as zero
+    counts_cube = pd.concat(counts).fillna(0).astype(int)
+    return {'counts': counts_cube, 'respondents': pd.concat(respondents).rename("respondents")}
+
+
+def distinct_profiles(indicators: np.ndarray) -> tuple:
+    """
+    Finds distinct rows (language profiles) of a respondents x languages indicators matrix
+    :param indicators: boolean respondents x languages matrix
+    :return: distinct profiles matrix, and the position of each respondent profile among them
+    """
+    packed = np.packbits(indicators, axis=1)
+    _, first_respondents, respondents_profile = np.unique(packed, axis=0, return_index=True, return_inverse=True)
+    return indicators[first_respondents], respondents_profile.ravel()
+
+
+def align_language_indicators(data_frames_dict: dict, columns_selection_criteria=None,
+                              prefix_to_remove='') -> pd.DataFrame:
+    """
+    Stacks several years languages indicators into a single respondents x languages frame, languages being aligned
+    over the years, so that language profiles can be compared across years.
+    :param data_frames_dict: dataframe dictionary in the form of {year : dataframe}, with split languages columns
+    :param columns_selection_criteria: languages columns selection criteria (see select_columns), or a dictionary in
+    the form of {year : selection criteria}
+    :param prefix_to_remove: a string to be removed from languages column names, or a dictionary in the form of
+    {year : prefix}
+    :return: a dataframe indexed by (year, respondent), holding a 0/1 column for each language
+    """
+    indicators = {}
+    for year, df in data_frames_dict.items():
+        criteria = columns_selection_criteria[year] \
+            if isinstance(columns_selection_criteria, dict) else columns_selection_criteria
+        prefix = prefix_to_remove[year] if isinstance(prefix_to_remove, dict) else prefix_to_remove
+        df_languages = select_columns(df, criteria).select_dtypes(include="number")
+        indicators[year] = pd.DataFrame((df_languages.to_numpy() > 0).astype(np.uint8), index=df.index,
+                                        columns=df_languages.columns.str.replace(prefix, ''))
+    # languages missing in a year are not used by any of its respondents
+    return pd.concat(indicators, names=["year", None]).fillna(0).astype(np.uint8)
+
+
+class LanguagesCommunitiesExtractor(LanguagesStatsExtractor):
+    """
+    This class finds communities of respondents with similar language profiles (the set of languages they use),
+    through MinHash signatures and locality-sensitive hashing (LSH), in near-linear time.
+
+    Respondents sharing the very same profile are handled once. Each profile gets a MinHash signature, made of
+    num_perm minimum ranks of its languages over random languages permutations, so that two signatures agree on a
+    position with probability equal to the Jaccard similarity of their profiles. Signatures are split in bands:
+    profiles sharing a whole band land in the same bucket, and only profiles sharing a bucket are compared.
+
+    Communities are built around leader profiles: a profile is a leader unless a more popular profile sharing one of
+    its buckets is similar enough (Jaccard similarity reaching threshold). Every other profile joins the most similar
+    leader among those sharing one of its buckets, so that no community is made of chained, dissimilar, profiles.
+    """
+
+    # number of profiles whose signatures are computed at once, bounding memory usage
+    SIGNATURES_CHUNK_SIZE = 4096
+
+    def __init__(self, source_data: pd.DataFrame, columns_selection_criteria=None, prefix_to_remove='',
+                 num_perm: int = 128, bands: int = 32, threshold: float = 0.5, seed: int = 0):
+        """
+        :param source_data: respondents data, holding languages indicator columns (see feature_split), e.g. a single
+        year survey, or several years aligned through align_language_indicators
+        :param columns_selection_criteria: languages columns selection criteria, see select_columns
+        :param prefix_to_remove: a string to be removed from languages column names
+        :param num_perm: number of random permutations, i.e. MinHash signature length
+        :param bands: number of LSH bands; it must divide num_perm. More bands find less similar profiles.
+        :param threshold: minimum estimated Jaccard similarity for two profiles in a bucket to be linked
+        :param seed: random permutations seed, for reproducible results
+        """
+        if num_perm % bands != 0:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.__source_data = source_data
+        df_languages = select_columns(source_data, columns_selection_criteria).select_dtypes(include="number")
+        self.__languages = pd.Index(df_languages.columns.str.replace(prefix_to_remove, ''))
+        self.__indicators = df_languages.to_numpy() > 0
+        self.__num_perm = num_perm
+        self.__bands = bands
+        self.__threshold = threshold
+        self.__seed = seed
+        self.__profiles = None
+        self.__respondents_profile = None
+        self.__signatures = None
+        self.__buckets = None
+        self.__clusters = None
+
+    def get_data_source(self) -> DataFrame:
+        return self.__source_data
+
+    def get_languages(self) -> list:
+        return list(self.__languages)
+
+    def get_params(self) -> dict:
+        return {"languages": list(self.__languages), "indicators": self.__indicators, "num_perm": self.__num_perm,
+                "bands": self.__bands, "threshold": self.__threshold, "seed": self.__seed}
+
+    def _compute_profiles(self) -> None:
+        """
+        Finds distinct language profiles, and the profile of each respondent
+        """
+        self.__profiles, self.__respondents_profile = distinct_profiles(self.__indicators)
+
+    def compute_signatures(self) -> np.ndarray:
+        """
+        Computes MinHash signatures of distinct language profiles. Profiles with no language get a signature made of
+        the number of languages, on every position.
+        :return: a profiles x num_perm array of minimum ranks
+        """
+        if self.__signatures is None:
+            self._compute_profiles()
+            n_languages = self.__profiles.shape[1]
+            rng = np.random.default_rng(self.__seed)
+            # with few languages, exact permutations replace hash functions
+            ranks = rng.permuted(np.tile(np.arange(n_languages), (self.__num_perm, 1)), axis=1)
+            ranks = np.ascontiguousarray(ranks.T, dtype=np.int32)
+            signatures = np.full((self.__profiles.shape[0], self.__num_perm), n_languages, dtype=np.int32)
+            for start in range(0, self.__profiles.shape[0], self.SIGNATURES_CHUNK_SIZE):
+                chunk = self.__profiles[start:start + self.SIGNATURES_CHUNK_SIZE]
+                chunk_signatures = signatures[start:start + len(chunk)]
+                # lowering, language after language, the minimum rank of the profiles using it
+                for language in range(n_languages):
+                    using = chunk[:, language]
+                    chunk_signatures[using] = np.minimum(chunk_signatures[using], ranks[language])
+            self.__signatures = signatures
+        return self.__signatures
+
+    def _compute_buckets(self) -> np.ndarray:
+        """
+        Hashes each band of profiles signatures into buckets
+        :return: a profiles x bands array of bucket ids, unique within each band
+        """
+        if self.__buckets is None:
+            signatures = self.compute_signatures()
+            rows = self.__num_perm // self.__bands
+            base = len(self.__languages) + 1
+            buckets = np.empty((signatures.shape[0], self.__bands), dtype=np.int64)
+            for band in range(self.__bands):
+                band_signatures = signatures[:, band * rows:(band + 1) * rows]
+                if base ** rows < 2 ** 62:
+                    # packing each band in a single integer key, as ranks are lower than base
+                    band_keys = band_signatures.astype(np.int64) @ (base ** np.arange(rows, dtype=np.int64))
+                    _, buckets[:, band] = np.unique(band_keys, return_inverse=True)
+                else:
+                    _, band_buckets = np.unique(band_signatures, axis=0, return_inverse=True)
+                    buckets[:, band] = band_buckets.ravel()
+            self.__buckets = buckets
+        return self.__buckets
+
+    def _jaccard(self, profiles_1: np.ndarray, profiles_2: np.ndarray) -> np.ndarray:
+        """
+        Computes exact Jaccard similarity between couples of distinct profiles
+        :param profiles_1: first profiles positions
+        :param profiles_2: second profiles positions
+        :return: Jaccard similarities, 0 for couples of empty profiles
+        """
+        intersection = (self.__profiles[profiles_1] & self.__profiles[profiles_2]).sum(axis=1)
+        union = (self.__profiles[profiles_1] | self.__profiles[profiles_2]).sum(axis=1)
+        return np.divide(intersection, union, out=np.zeros(len(union)), where=union > 0)
+
+    @staticmethod
+    def _bucket_best(band_buckets: np.ndarray, eligible: np.ndarray, priority: np.ndarray) -> np.ndarray:
+        """
+        Finds, for each profile, the eligible profile with the highest priority in its bucket
+        :param band_buckets: bucket id of each profile, in a band
+        :param eligible: eligible profiles mask
+        :param priority: profiles priority
+        :return: best profile position for each profile, -1 if its bucket holds no eligible profile
+        """
+        eligible_positions = np.flatnonzero(eligible)
+        ordered = eligible_positions[np.lexsort((-priority[eligible_positions], band_buckets[eligible_positions]))]
+        ordered_buckets = band_buckets[ordered]
+        bucket_first = np.r_[True, ordered_buckets[1:] != ordered_buckets[:-1]]
+        best_of_bucket = np.full(band_buckets.max() + 1, -1)
+        best_of_bucket[ordered_buckets[bucket_first]] = ordered[bucket_first]
+        return best_of_bucket[band_buckets]
+
+    def compute_clusters(self) -> pd.Series:
+        """
+        Assigns each respondent to a community. Communities are labelled by decreasing number of respondents;
+        respondents using no language get label -1.
+        :return: a series of community labels, sharing source data index
+        """
+        if self.__clusters is None:
+            buckets = self._compute_buckets()
+            n_profiles = buckets.shape[0]
+            positions = np.arange(n_profiles)
+            non_empty = self.__profiles.any(axis=1)
+            # ties in popularity are broken by profile position
+            popularity = np.bincount(self.__respondents_profile, minlength=n_profiles) + positions / (n_profiles + 1)
+
+            # leaders: no more popular and similar enough profile in any of their buckets
+            leaders = non_empty.copy()
+            for band in range(self.__bands):
+                best = self._bucket_best(buckets[:, band], non_empty, popularity)
+                followers = non_empty & (best != positions)
+                followers[followers] = self._jaccard(positions[followers], best[followers]) >= self.__threshold
+                leaders &= ~followers
+
+            # every profile joins its most similar leader, among those sharing a bucket
+            assignment = np.where(leaders, positions, -1)
+            assignment_similarity = np.where(leaders, 1.0, -1.0)
+            for band in range(self.__bands):
+                best = self._bucket_best(buckets[:, band], leaders, popularity)
+                candidates = non_empty & ~leaders & (best >= 0)
+                similarity = np.full(n_profiles, -1.0)
+                similarity[candidates] = self._jaccard(positions[candidates], best[candidates])
+                improved = (similarity >= self.__threshold) & (similarity > assignment_similarity)
+                assignment[improved] = best[improved]
+                assignment_similarity[improved] = similarity[improved]
+            # profiles with no similar enough leader make a community of their own
+            unassigned = non_empty & (assignment < 0)
+            assignment[unassigned] = positions[unassigned]
+
+            labels = assignment[self.__respondents_profile]
+            in_community = labels >= 0
+            # relabelling communities by decreasing size
+            roots, inverse, sizes = np.unique(labels[in_community], return_inverse=True, return_counts=True)
+            order = np.argsort(-sizes, kind="stable")
+            new_labels = np.empty_like(order)
+            new_labels[order] = np.arange(len(roots))
+            labels[in_community] = new_labels[inverse]
+            self.__clusters = pd.Series(labels, index=self.__source_data.index, name="community")
+        return self.__clusters
+
+    def describe_clusters(self, top: int = None) -> pd.DataFrame:
+        """
+        Describes communities by their size and the percentage of their members using each language
+        :param top: if provided, only the top largest communities are described
+        :return: a dataframe indexed by community label, holding a 'size' column and a column for each language
+        """
+        clusters = self.compute_clusters()
+        in_community = clusters.to_numpy() >= 0
+        df_languages = pd.DataFrame(self.__indicators[in_community], columns=self.__languages)
+        grouped = df_languages.groupby(clusters.to_numpy()[in_community])
+        description = grouped.mean() * 100
+        description.insert(0, "size", grouped.size())
+        description.index.name = "community"
+        return description if top is None else description.iloc[:top]
+
+    def nearest_neighbours(self, respondent, k: int = 10) -> pd.Series:
+        """
+        Finds the respondents whose language profile is the most similar to a respondent one, among LSH candidates
+        (profiles sharing a bucket with the respondent profile), ranked by exact Jaccard similarity
+        :param respondent: respondent index label in source data, whose index must be unique
+        :param k: number of neighbours to be returned
+        :return: a series of Jaccard similarities, indexed by respondent, in descending order
+        """
+        if not self.__source_data.index.is_unique:
+            raise ValueError("respondents cannot be told apart: source data index holds duplicated labels")
+        buckets = self._compute_buckets()
+        position = self.__source_data.index.get_loc(respondent)
+        profile = self.__respondents_profile[position]
+        candidates = np.flatnonzero((buckets == buckets[profile]).any(axis=1))
+        profiles_similarity = np.zeros(self.__profiles.shape[0])
+        profiles_similarity[candidates] = self._jaccard(candidates, np.full(len(candidates), profile))
+        is_candidate = np.zeros(self.__profiles.shape[0], dtype=bool)
+        is_candidate[candidates] = True
+
+        neighbours = np.flatnonzero(is_candidate[self.__respondents_profile])
+        neighbours = neighbours[neighbours != position]
+        similarity = pd.Series(profiles_similarity[self.__respondents_profile[neighbours]],
+                               index=self.__source_data.index[neighbours], name="jaccard")
+        return similarity.sort_values(ascending=False, kind="stable").iloc[:k]
+
+    def get_stats(self) -> dict:
+        """
+        This method returns a dictionary holding respondents communities and communities description
+        :return: a dictionary holding respondents communities and communities description
+        """
+        return {'communities': self.compute_clusters(), 'communities description': self.describe_clusters()}
+
+
+class LanguagesCombinationsExtractor(LanguagesStatsExtractor):
+    """
+    This class mines every frequent languages combination, i.e. every set of languages used together by at least
+    min_support percent of the respondents, along with the association rules between them.
+
+    Respondents sharing the very same languages (basket) are handled once, weighted by their number. Combinations
+    are grown depth first, each one over the projected baskets containing it: the supports of all its extensions
+    are computed at once, as a single weighted sum over the projected baskets.
+    """
+
+    def __init__(self, source_data: pd.DataFrame, columns_selection_criteria=None, prefix_to_remove='',
+                 min_support: float = 1.0, max_length: int = None, min_confidence: float = 0.0):
+        """
+        :param source_data: single year respondents data, holding languages indicator columns (see feature_split)
+        :param columns_selection_criteria: languages columns selection criteria, see select_columns
+        :param prefix_to_remove: a string to be removed from languages column names
+        :param min_support: minimum percentage of respondents using a combination
+        :param max_length: maximum number of languages in a combination, unlimited if None
+        :param min_confidence: minimum confidence percentage of association rules
+        """
+        self.__source_data = source_data
+        df_languages = select_columns(source_data, columns_selection_criteria).select_dtypes(include="number")
+        self.__languages = pd.Index(df_languages.columns.str.replace(prefix_to_remove, ''))
+        self.__indicators = df_languages.to_numpy() > 0
+        self.__min_support = min_support
+        self.__max_length = max_length
+        self.__min_confidence = min_confidence
+        self.__combinations = None
+        self.__rules = None
+
+    def get_data_source(self) -> DataFrame:
+        return self.__source_data
+
+    def get_params(self) -> dict:
+        return {"languages": list(self.__languages), "indicators": self.__indicators,
+                "min_support": self.__min_support, "max_length": self.__max_length,
+                "min_confidence": self.__min_confidence}
+
+    def compute_frequent_combinations(self) -> pd.DataFrame:
+        """
+        Mines frequent languages combinations
+        :return: a dataframe holding, for each combination, its languages ('combination', a tuple), its 'length', its
+        respondents 'count' and its 'support' (percentage of respondents), by decreasing support
+        """
+        if self.__combinations is None:
+            n_respondents = self.__indicators.shape[0]
+            baskets, respondents_basket = distinct_profiles(self.__indicators)
+            weights = np.bincount(respondents_basket, minlength=baskets.shape[0]).astype(np.float64)
+            min_count = max(self.__min_support / 100 * n_respondents, 1)
+            max_length = baskets.shape[1] if self.__max_length is None else self.__max_length
+
+            combinations = []
+            counts = []
+            # depth first search over projected baskets (rows holding a combination, columns of its candidate
+            # extensions): a combination projected baskets are taken from its parent ones, once it is expanded
+            stack = [((), baskets, weights, np.arange(baskets.shape[1]))]
+            while stack:
+                combination, projected, node_weights, candidates = stack.pop()
+                if len(combination) == max_length or len(candidates) == 0:
+                    continue
+                extensions_counts = node_weights @ projected.astype(np.float64)
+                frequent = np.flatnonzero(extensions_counts >= min_count)
+                for j in frequent[::-1]:
+                    combinations.append(combination + (candidates[j],))
+                    counts.append(round(extensions_counts[j]))
+                    # extending with later candidates only, so that each combination is found once
+                    later = frequent[frequent > j]
+                    if len(later) > 0 and len(combination) + 1 < max_length:
+                        rows = projected[:, j]
+                        stack.append((combination + (candidates[j],),
+                                      np.compress(rows, projected, axis=0).take(later, axis=1),
+                                      node_weights[rows], candidates[later]))
+
+            df_combinations = pd.DataFrame({
+                "combination": [tuple(self.__languages[list(c)]) for c in combinations],
+                "length": [len(c) for c in combinations],
+                "count": np.array(counts, dtype=np.int64),
+                "support": np.array(counts, dtype=float) / max(n_respondents, 1) * 100})
+            self.__combinations = df_combinations.sort_values(["support", "length"], ascending=[False, True],
+                                                              kind="stable").reset_index(drop=True)
+        return self.__combinations
+
+    def compute_association_rules(self, min_confidence: float = None) -> pd.DataFrame:
+        """
+        Derives association rules "antecedent -> consequent" from frequent combinations
+        :param min_confidence: overrides minimum confidence percentage given at construction time
+        :return: a dataframe holding, for each rule, its 'antecedent' and 'consequent' (tuples of languages), its
+        'support' (percentage of respondents using both), 'confidence' (percentage of antecedent respondents also
+        using consequent) and 'lift' (confidence over consequent support), by decreasing lift
+        """
+        from itertools import combinations as subsets
+
+        if min_confidence is None:
+            min_confidence = self.__min_confidence
+        if self.__rules is None:
+            df_combinations = self.compute_frequent_combinations()
+            # every subset of a frequent combination is frequent as well
+            supports = dict(zip(map(frozenset, df_combinations["combination"]), df_combinations["support"]))
+            rules = []
+            for combination, support in zip(df_combinations["combination"], df_combinations["support"]):
+                for antecedent_length in range(1, len(combination)):
+                    for antecedent in subsets(combination, antecedent_length):
+                        consequent = tuple(lang for lang in combination if lang not in antecedent)
+                        confidence = support / supports[frozenset(antecedent)] * 100
+                        lift = confidence / supports[frozenset(consequent)]
+                        rules.append((antecedent, consequent, support, confidence, lift))
+            self.__rules = pd.DataFrame(rules, columns=["antecedent", "consequent", "support", "confidence", "lift"])
+            self.__rules = self.__rules.sort_values("lift", ascending=False, kind="stable").reset_index(drop=True)
+        return self.__rules[self.__rules["confidence"] >= min_confidence].reset_index(drop=True)
+
+    def get_stats(self) -> dict:
+        """
+        This method returns a dictionary holding frequent combinations and association rules
+        :return: a dictionary holding frequent combinations and association rules
+        """
+        return {'frequent combinations': self.compute_frequent_combinations(),
+                'association rules': self.compute_association_rules()}
+
+
+def compute_frequent_combinations_by_year(data_frames_dict: dict, columns_selection_criteria=None,
+                                          prefix_to_remove='', min_support: float = 1.0, max_length: int = None,
+                                          min_confidence: float = 0.0) -> dict:
+    """
+    Mines frequent languages combinations and association rules for several years
+    :param data_frames_dict: dataframe dictionary in the form of {year : dataframe}, with split languages columns
+    :param columns_selection_criteria: languages columns selection criteria (see select_columns), or a dictionary in
+    the form of {year : selection criteria}
+    :param prefix_to_remove: a string to be removed from languages column names, or a dictionary in the form of
+    {year : prefix}
+    :param min_support: minimum percentage of respondents using a combination
+    :param max_length: maximum number of languages in a combination
+    :param min_confidence: minimum confidence percentage of association rules
+    :return: a dictionary in the form of {year : combinations stats}, see LanguagesCombinationsExtractor.get_stats
+    """
+    combinations = {}
+    for year, df in data_frames_dict.items():
+        criteria = columns_selection_criteria[year] \
+            if isinstance(columns_selection_criteria, dict) else columns_selection_criteria
+        prefix = prefix_to_remove[year] if isinstance(prefix_to_remove, dict) else prefix_to_remove
+        combinations[year] = LanguagesCombinationsExtractor(df, criteria, prefix, min_support=min_support,
+                                                            max_length=max_length,
+                                                            min_confidence=min_confidence).get_stats()
+    return combinations
@@ -1,12 +1,18 @@
 import re
-from typing import Dict, Optional
+import warnings
+from itertools import chain
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
 
 import pandas as pd
 from pandas import DataFrame
 
+from .data_polars import binarize_columns, check_backend, split_indicators
+
 
 def transform_unnamed_cols_base(df: pd.DataFrame, base_column_name: str, columns_look_ahead: int,
-                                new_column_name_prefix: str = None, inplace=False) -> object:
+                                new_column_name_prefix: str = None, inplace=False, deep_copy=True) -> object:
     """
     This function transforms a range of columns based assuming the presence of following schema in dataframe:
 
@@ -30,6 +36,8 @@ def transform_unnamed_cols_base(df: pd.DataFrame, base_column_name: str, columns
     has to be transformed
     :param new_column_name_prefix:  new column_name to be added as base_name to rename map
     :param inplace: If False, return a copy. Otherwise, do operation inplace and return None.
+    :param deep_copy: when inplace is False, if True the copy is a deep copy of the input dataframe, otherwise
+    untouched columns are shared with input dataframe and only transformed columns are allocated (see _output_frame)
     :return: input dataframe with Unnamed columns dropped and string values transformed to binary values (0,1)
     """
 
@@ -38,11 +46,12 @@ def transform_unnamed_cols_base(df: pd.DataFrame, base_column_name: str, columns
                                                                           columns_look_ahead)]
 
     return _even_out_categorical_as_binaries(df, df_target_columns,
-                                             new_column_name_prefix=new_column_name_prefix, inplace=inplace)
+                                             new_column_name_prefix=new_column_name_prefix, inplace=inplace,
+                                             deep_copy=deep_copy)
 
 
 def transform_unnamed_cols_range(df: pd.DataFrame, columns_range: range,
-                                 new_column_name_prefix: str, inplace=False) -> object:
+                                 new_column_name_prefix: str, inplace=False, deep_copy=True) -> object:
     """
     This function transforms a range of columns based assuming the presence of following schema in dataframe:
 
@@ -65,6 +74,7 @@ def transform_unnamed_cols_range(df: pd.DataFrame, columns_range: range,
     :param columns_range: range of columns from input dataframe to be transformed
     :param new_column_name_prefix: new column_name to be added as base_name to rename map
     :param inplace: If False, return a copy. Otherwise, do operation inplace and return None.
+    :param deep_copy: when inplace is False, if False only transformed columns are allocated (see _output_frame)
     :return: input dataframe with Unnamed columns dropped and string values transformed to binary values (0,1)
     """
 
@@ -72,21 +82,41 @@ def transform_unnamed_cols_range(df: pd.DataFrame, columns_range: range,
     df_target_columns = df.iloc[:, columns_range]
 
     return _even_out_categorical_as_binaries(df, df_target_columns.columns,
-                                             new_column_name_prefix=new_column_name_prefix, inplace=inplace)
+                                             new_column_name_prefix=new_column_name_prefix, inplace=inplace,
+                                             deep_copy=deep_copy)
+
+
+def _output_frame(df: pd.DataFrame, inplace: bool, deep_copy: bool = True) -> pd.DataFrame:
+    """
+    Returns the dataframe a transformation has to be applied to.
+
+    A shallow copy (deep_copy=False) shares column data with the input dataframe, so that only modified or new
+    columns get allocated: transformations applied to it must replace whole columns (df[col] = ...), never write
+    into existing ones (df.loc[rows, col] = ..., inplace methods).
+    :param df: input dataframe
+    :param inplace: if True, input dataframe itself is returned
+    :param deep_copy: if inplace is False, whether input dataframe is deep copied or shallow copied
+    :return: the dataframe to be transformed
+    """
+    if inplace:
+        return df
+    return df.copy(deep=deep_copy)
 
 
 def _even_out_categorical_as_binaries(df: pd.DataFrame, df_target_columns: pd.DataFrame,
-                                      new_column_name_prefix: str, inplace: bool) -> object:
+                                      new_column_name_prefix: str, inplace: bool, deep_copy: bool = True) -> object:
     """
     This function will even out a range of columns containing string values into a range of binary values in [0,1]
     :param df: input dataframe
     :param df_target_columns: target columns as dataframe
     :param new_column_name_prefix: string to be used as prefix
     :param inplace: If False, return a copy. Otherwise, do operation inplace and return None.
+    :param deep_copy: when inplace is False, if False only transformed columns are allocated (see _output_frame)
     :return: input dataframe with Unnamed columns dropped and string values transformed to binary values (0,1)
     """
     if not inplace:
-        df_out = df.copy(deep=True)
+        # binarization replaces whole columns, renaming only touches output dataframe axis
+        df_out = _output_frame(df, inplace, deep_copy)
         _categorical_columns_range_rename(df_out, df_target_columns.columns, new_column_name_prefix)
         return df_out
     else:
@@ -120,17 +150,19 @@ def _categorical_columns_range_rename(df: pd.DataFrame, target_columns: pd.Index
     df.rename(columns=columns_rename_map, inplace=True)
 
 
-def binarize_column(df: pd.DataFrame, col_name: str, true_val: str, inplace: bool = True) -> Optional[DataFrame]:
+def binarize_column(df: pd.DataFrame, col_name: str, true_val: str, inplace: bool = True,
+                    deep_copy: bool = True) -> Optional[DataFrame]:
     """
     Transforms a single column to binary values, converting specific values to '1' and all the other values to '0'
     :param df: input dataframe
     :param col_name: target column
     :param true_val: values to be converted to '1'
     :param inplace: If False, return a copy. Otherwise, do operation inplace and return None.
+    :param deep_copy: when inplace is False, if False only the binarized column is allocated (see _output_frame)
     :return optionally returns input df modified, if inplace is False
     """
     if not inplace:
-        df_out = df.copy(deep=True)
+        df_out = _output_frame(df, inplace, deep_copy)
         df_out[col_name] = df_out[col_name].apply(lambda x: 1 if x == true_val else 0)
         return df_out
     else:
@@ -139,7 +171,8 @@ def binarize_column(df: pd.DataFrame, col_name: str, true_val: str, inplace: boo
 
 
 def binarize_columns_range(df: pd.DataFrame, col_range: range, true_values: list,
-                           inplace: bool = True) -> Optional[DataFrame]:
+                           inplace: bool = True, deep_copy: bool = True,
+                           backend: str = "pandas") -> Optional[DataFrame]:
     """
     Transforms a set of columns (a dataframe) to binary values
     :param df: input dataframe
@@ -148,10 +181,20 @@ def binarize_columns_range(df: pd.DataFrame, col_range: range, true_values: list
     for each of the each of the values in this list respectively,
     writing a '1' in each cell that contains the value and a '0' in each cell that doesn't.
     :param inplace: If False, return a copy. Otherwise, do operation inplace and return None.
+    :param deep_copy: when inplace is False, if False only binarized columns are allocated (see _output_frame)
+    :param backend: 'pandas', or 'polars' to binarize all the columns in a single multi-threaded query
+    (see data_polars)
     :return: input dataframe updated according to binarization
     """
+    if check_backend(backend) == "polars":
+        df_out = _output_frame(df, inplace, deep_copy)
+        columns_positions = np.arange(df.shape[1])[col_range][:len(true_values)]
+        binarized = binarize_columns(df, columns_positions, true_values)
+        for i, position in enumerate(columns_positions):
+            df_out.isetitem(position, binarized.iloc[:, i].to_numpy())
+        return None if inplace else df_out
     if not inplace:
-        df_out = df.copy(deep=True)
+        df_out = _output_frame(df, inplace, deep_copy)
         for col, tv in zip(df_out.iloc[:, col_range].columns, true_values):
             binarize_column(df_out, col, tv, inplace=True)
         return df_out
@@ -170,8 +213,8 @@ def first_valid_value_index(column_name: str, column_data: pd.Series):
     return curr_valid_index
 
 
-def feature_split(df: pd.DataFrame,
-                  column_to_split: str, sep: str = ";", inplace: bool = True) -> Optional[pd.DataFrame]:
+def feature_split(df: pd.DataFrame, column_to_split: str, sep: str = ";", inplace: bool = True,
+                  deep_copy: bool = True, backend: str = "pandas") -> Optional[pd.DataFrame]:
     """
     This function splits data from a single column into a set of columns
     :rtype: object
@@ -180,6 +223,9 @@ def feature_split(df: pd.DataFrame,
     in dataframe and as a prefix of the output columns.
     :param sep: separator to be used in feature splitting
     :param inplace: If False, return a copy. Otherwise, do operation inplace and return None.
+    :param deep_copy: when inplace is False, if False only new columns, and columns holding missing values to be
+    filled, are allocated (see _output_frame)
+    :param backend: 'pandas', or 'polars' to split features in a single multi-threaded query (see data_polars)
     :return: optionally returns a new dataframe
     """
 
@@ -189,11 +235,25 @@ def feature_split(df: pd.DataFrame,
     # splitting columns
     # df_out = column_split(df, joint_features_series, sep, column_to_split, inplace)
 
-    df_out = optimized_column_split(df, joint_features_series, sep, column_to_split, inplace)
+    if check_backend(backend) == "polars":
+        df_out = _output_frame(df, inplace, deep_copy)
+        indicators = split_indicators(joint_features_series, sep, column_to_split)
+        existing = indicators.columns.intersection(df_out.columns)
+        for col in existing:
+            # as for the pandas backend, features already having a column are set into it
+            df_out[col] = df_out[col].mask(indicators[col] == 1, 1)
+        df_out[list(indicators.columns.difference(existing, sort=False))] = indicators.drop(columns=existing)
+    else:
+        df_out = optimized_column_split(df, joint_features_series, sep, column_to_split, inplace, deep_copy)
 
     # dropping columns that have been split
     df_out.drop(labels=column_to_split, axis=1, inplace=True)
-    df_out.fillna(value=0, inplace=True)
+    if inplace or deep_copy:
+        df_out.fillna(value=0, inplace=True)
+    else:
+        # filling shared columns inplace would write into input dataframe
+        for col in df_out.columns[df_out.isna().any().to_numpy()]:
+            df_out[col] = df_out[col].fillna(value=0)
     if not inplace:
         return df_out
     else:
@@ -201,7 +261,7 @@ def feature_split(df: pd.DataFrame,
 
 
 def column_split(input_df: pd.DataFrame, joint_column: pd.Series,
-                 separator: str, split_column_prefix: str, inplace: bool = True):
+                 separator: str, split_column_prefix: str, inplace: bool = True, deep_copy: bool = True):
     """
     This function splits input dataframe column containing all the languages separated by a separator,
     into a set of columns containing a single language for each column.
@@ -210,26 +270,25 @@ def column_split(input_df: pd.DataFrame, joint_column: pd.Series,
     :param split_column_prefix: prefix of the new column name
     :param separator:
     :param inplace:
+    :param deep_copy: when inplace is False, if False only new columns are allocated (see _output_frame)
     :return:
     """
-    if not inplace:
-        # copying input dataframe
-        df_out = input_df.copy(deep=True)
-    else:
-        df_out = input_df
+    df_out = _output_frame(input_df, inplace, deep_copy)
+    shared_columns = set() if inplace or deep_copy else set(input_df.columns)
 
     # iterating over features rows to populate features set
     # TODO: optimize the nested for loop. I assume that at least one level of nesting can be avoided.
-    for index, joint_features in joint_column.iteritems():
+    for index, joint_features in joint_column.items():
         if isinstance(joint_features, str):
             for feat in [feat.strip() for feat in joint_features.split(sep=separator)]:
                 column_name = split_column_prefix + ": " + feat
+                _unshare_column(df_out, column_name, shared_columns)
                 df_out.loc[index, column_name] = 1
     return df_out
 
 
 def optimized_column_split(input_df: pd.DataFrame, joint_column: pd.Series, separator: str, split_column_prefix: str,
-                           inplace: bool = True):
+                           inplace: bool = True, deep_copy: bool = True):
     """
     This function splits input dataframe column containing all the languages separated by a separator,
     into a set of columns containing a single language for each column.
@@ -238,24 +297,167 @@ def optimized_column_split(input_df: pd.DataFrame, joint_column: pd.Series, sepa
     :param split_column_prefix: prefix of the new column name
     :param separator:
     :param inplace:
+    :param deep_copy: when inplace is False, if False only new columns are allocated (see _output_frame)
     :return:
     """
-    if not inplace:
-        # copying input dataframe
-        df_out = input_df.copy(deep=True)
-    else:
-        df_out = input_df
+    df_out = _output_frame(input_df, inplace, deep_copy)
+    shared_columns = set() if inplace or deep_copy else set(input_df.columns)
 
     # iterating over features rows to populate features set
     for index, joint_features in joint_column.items():
         if isinstance(joint_features, str):
             for feat in joint_features.split(sep=separator):
                 column_name = split_column_prefix + ": " + feat.strip()
+                _unshare_column(df_out, column_name, shared_columns)
                 df_out.loc[index, column_name] = 1
 
     return df_out
 
 
+def _unshare_column(df_out: pd.DataFrame, column_name: str, shared_columns: set) -> None:
+    """
+    Replaces a column shared with the input dataframe of a shallow copy with its own copy, before it is written into
+    :param df_out: shallow copy of input dataframe
+    :param column_name: column about to be written into
+    :param shared_columns: columns still shared with input dataframe, updated accordingly
+    """
+    if column_name in shared_columns:
+        df_out[column_name] = df_out[column_name].copy()
+        shared_columns.discard(column_name)
+
+
+def _tokenize_columns(df: pd.DataFrame, columns_to_split: List[str],
+                      separator: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, pd.Index]:
+    """
+    Splits columns of joint features into their tokens, in a single pass over all the columns and with no python
+    loop over rows: each distinct answer is split once, and each distinct token is interned once into a vocabulary
+    shared by all the columns
+    :param df: input dataframe
+    :param columns_to_split: names of the columns to be split
+    :param separator: separator to be used in feature splitting
+    :return: the column number (position in columns_to_split) and row position of each token, in columns then rows
+    order, the vocabulary code of each token, and the vocabulary of stripped tokens, in order of first appearance
+    """
+    n_rows = df.shape[0]
+    answers = np.concatenate([df.loc[:, column].to_numpy(dtype=object) for column in columns_to_split]
+                             + [np.empty(0, dtype=object)])
+    answers_codes, distinct_answers = pd.factorize(answers)
+    # non-string values (i.e. missing answers) have no features
+    is_string = np.fromiter((isinstance(answer, str) for answer in distinct_answers), dtype=bool,
+                            count=len(distinct_answers))
+    split_answers = [answer.split(separator) for answer in distinct_answers[is_string]]
+    tokens_count = np.zeros(len(distinct_answers), dtype=np.int64)
+    tokens_count[is_string] = [len(answer_tokens) for answer_tokens in split_answers]
+    raw_codes, raw_tokens = pd.factorize(np.fromiter(chain.from_iterable(split_answers), dtype=object,
+                                                     count=tokens_count.sum()))
+    stripped_codes, vocabulary = pd.factorize(pd.Index(raw_tokens, dtype=object).str.strip())
+    tokens_codes = stripped_codes[raw_codes]
+
+    # tokens of each row answer, from the tokens of its distinct answer
+    tokens_start = np.cumsum(tokens_count) - tokens_count
+    positions = np.flatnonzero(answers_codes >= 0)
+    rows_tokens_count = tokens_count[answers_codes[positions]]
+    tokens_positions = np.repeat(positions, rows_tokens_count)
+    offsets = np.arange(rows_tokens_count.sum()) - np.repeat(np.cumsum(rows_tokens_count) - rows_tokens_count,
+                                                             rows_tokens_count)
+    codes = tokens_codes[np.repeat(tokens_start[answers_codes[positions]], rows_tokens_count) + offsets]
+    columns_numbers, rows = np.divmod(tokens_positions, max(n_rows, 1))
+    return columns_numbers, rows, codes, vocabulary
+
+
+def feature_split_sparse(df: pd.DataFrame, columns_to_split: List[str],
+                         sep: str = ";") -> Tuple[Dict[str, object], List[str]]:
+    """
+    This function splits data from a set of columns into aligned sparse indicator matrices, one per column, sharing
+    the same vocabulary: matrix column j stands for the same feature (e.g. the same language) in every matrix.
+    :param df: input dataframe
+    :param columns_to_split: names of the columns to be split
+    :param sep: separator to be used in feature splitting
+    :return: a dictionary in the form of {column name: scipy.sparse.csr_matrix} of respondents x features indicator
+    matrices, and the features vocabulary, in order of first appearance
+    """
+    from scipy import sparse
+
+    columns_numbers, rows, codes, vocabulary = _tokenize_columns(df, columns_to_split, sep)
+    boundaries = np.searchsorted(columns_numbers, np.arange(len(columns_to_split) + 1))
+
+    indicators = {}
+    for i, column in enumerate(columns_to_split):
+        start, end = boundaries[i], boundaries[i + 1]
+        matrix = sparse.csr_matrix((np.ones(end - start, dtype=np.int64), (rows[start:end], codes[start:end])),
+                                   shape=(df.shape[0], len(vocabulary)))
+        # repeated features in the same answer count once
+        matrix.data[:] = 1
+        indicators[column] = matrix
+    return indicators, list(vocabulary)
+
+
+def feature_split_batch(df: pd.DataFrame, columns_to_split: List[str], sep: str = ";",
+                        inplace: bool = True) -> Tuple[Optional[pd.DataFrame], Dict[str, List[str]]]:
+    """
+    This function splits data from a set of columns into a set of columns each, as feature_split called on each one
+    of them would, tokenizing all the columns in a single pass and adding all the indicator columns at once
+    :param df: input dataframe
+    :param columns_to_split: names of the columns to be split, each one being used as a prefix of its output columns
+    :param sep: separator to be used in feature splitting
+    :param inplace: If False, return a copy. Otherwise, do operation inplace and return None as dataframe.
+    :return: optionally a new dataframe, and a dictionary in the form of {column name: list of indicator columns},
+    indicator columns being in order of first appearance of their features
+    """
+    columns_numbers, rows, codes, vocabulary = _tokenize_columns(df, columns_to_split, sep)
+    boundaries = np.searchsorted(columns_numbers, np.arange(len(columns_to_split) + 1))
+
+    blocks = {}
+    # output feature (over all the columns) of each token
+    tokens_features = np.empty(len(codes), dtype=np.int64)
+    local_codes = np.empty(len(vocabulary), dtype=np.int64)
+    features_count = 0
+    for i, column in enumerate(columns_to_split):
+        column_codes = codes[boundaries[i]:boundaries[i + 1]]
+        features = pd.unique(column_codes)
+        local_codes[features] = np.arange(features_count, features_count + len(features))
+        tokens_features[boundaries[i]:boundaries[i + 1]] = local_codes[column_codes]
+        features_count += len(features)
+        blocks[column] = [f"{column}: {vocabulary[code]}" for code in features]
+
+    df_out = df if inplace else df.copy()
+    df_out.drop(labels=columns_to_split, axis=1, inplace=True)
+    # as in feature_split, features already having a column are set into it, the other ones get a new column
+    features_names = [name for names in blocks.values() for name in names]
+    existing = set(df_out.columns)
+    new_columns = [name for name in features_names if name not in existing]
+    new_positions = dict(zip(new_columns, range(len(new_columns))))
+    features_targets = np.array([new_positions.get(name, -1) for name in features_names], dtype=np.int64)
+    for feature in np.flatnonzero(features_targets < 0):
+        is_feature = np.zeros(df.shape[0], dtype=bool)
+        is_feature[rows[tokens_features == feature]] = True
+        df_out[features_names[feature]] = df_out[features_names[feature]].mask(is_feature, 1)
+    df_out.fillna(value=0, inplace=True)
+
+    tokens_targets = features_targets[tokens_features]
+    is_new = tokens_targets >= 0
+    new_rows, new_targets = rows[is_new], tokens_targets[is_new]
+    if not inplace:
+        # a single array holds all the new columns, wrapped as they are by the output dataframe
+        indicators = np.zeros((df.shape[0], len(new_columns)))
+        indicators[new_rows, new_targets] = 1
+        return pd.concat([df_out, pd.DataFrame(indicators, index=df.index, columns=new_columns, copy=False)],
+                         axis=1, copy=False), blocks
+
+    # inserted columns being copied, they are built one at a time, so that only output columns are allocated
+    order = np.argsort(new_targets, kind="stable")
+    new_rows = new_rows[order]
+    columns_boundaries = np.searchsorted(new_targets[order], np.arange(len(new_columns) + 1))
+    with warnings.catch_warnings():
+        # as in feature_split, each new column is inserted as its own block
+        warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+        for position, name in enumerate(new_columns):
+            indicator = np.zeros(df.shape[0])
+            indicator[new_rows[columns_boundaries[position]:columns_boundaries[position + 1]]] = 1
+            df_out[name] = indicator
+    return None, blocks
+
+
 def string_found(string1, string2):
     """
     This function looks for a string
@@ -268,16 +470,19 @@ def string_found(string1, string2):
     return False
 
 
-def df_2015_survey_preprocessing(df_surveys_15_in, lang_proficiencies_columns_range_of_interest_2015):
+def df_2015_survey_preprocessing(df_surveys_15_in, lang_proficiencies_columns_range_of_interest_2015,
+                                 deep_copy: bool = True):
     """
     This function preprocesses data from 2015 survey
     :param df_surveys_15_in:
     :param lang_proficiencies_columns_range_of_interest_2015:
+    :param deep_copy: if False, only binarized columns are allocated, other columns being shared with
+    df_surveys_15_in, so that writing into them in place also modifies the input dataframe (see _output_frame)
     :return:
     """
     tvi_list = [column_data.first_valid_index() - 1
                 for _, column_data in
-                df_surveys_15_in.iloc[:, lang_proficiencies_columns_range_of_interest_2015].iteritems()]
+                df_surveys_15_in.iloc[:, lang_proficiencies_columns_range_of_interest_2015].items()]
     true_values_coordinates_results_2015 = zip(tvi_list, lang_proficiencies_columns_range_of_interest_2015)
 
     lang_and_tech_in_2015_true_values = []
@@ -285,10 +490,76 @@ def df_2015_survey_preprocessing(df_surveys_15_in, lang_proficiencies_columns_ra
         lang_and_tech_in_2015_true_values.append(df_surveys_15_in.iat[row, col])
     df_surveys_15_out = binarize_columns_range(df=df_surveys_15_in,
                                                col_range=lang_proficiencies_columns_range_of_interest_2015,
-                                               true_values=lang_and_tech_in_2015_true_values, inplace=False)
+                                               true_values=lang_and_tech_in_2015_true_values, inplace=False,
+                                               deep_copy=deep_copy)
     return df_surveys_15_out
 
 
+def _shared_columns_aliases(columns: Union[list, dict]) -> Dict[str, list]:
+    """
+    Normalizes shared categorical columns definition to a {semantic name: column aliases list} dictionary
+    :param columns: a list of column names, or a dictionary mapping a semantic name to a list of column names
+    (e.g. the same question, named differently over the years)
+    :return: a dictionary mapping each semantic name to a list of column aliases
+    """
+    if isinstance(columns, dict):
+        return {name: [aliases] if isinstance(aliases, str) else list(aliases) for name, aliases in columns.items()}
+    return {name: [name] for name in columns}
+
+
+def build_shared_categories(data_frames_dict: dict, columns: Union[list, dict]) -> Dict[str, pd.CategoricalDtype]:
+    """
+    Builds a single categorical vocabulary for each semantic column, across all the dataframes, so that every
+    year can be encoded against the same categories.
+    :param data_frames_dict: dataframe dictionary in the form of {year : dataframe}
+    :param columns: a list of column names, or a dictionary mapping a semantic name to a list of column names
+    :return: a dictionary mapping each semantic name to its categorical dtype, holding categories in sorted order
+    """
+    shared_categories = {}
+    for name, aliases in _shared_columns_aliases(columns).items():
+        values = [np.asarray(df[alias].dropna().unique(), dtype=object)
+                  for df in data_frames_dict.values() for alias in aliases if alias in df.columns]
+        categories = pd.unique(np.concatenate(values)) if values else []
+        try:
+            categories = sorted(categories)
+        except TypeError:
+            # values of mixed types are kept in order of appearance
+            pass
+        shared_categories[name] = pd.CategoricalDtype(categories=categories)
+    return shared_categories
+
+
+def encode_shared_categories(df: pd.DataFrame, shared_categories: Dict[str, pd.CategoricalDtype],
+                             columns: Union[list, dict] = None, inplace: bool = False) -> Optional[DataFrame]:
+    """
+    Encodes dataframe columns against shared categorical vocabularies, built through build_shared_categories.
+    Encoded columns are renamed after their semantic name, when it differs from the column alias.
+    :param df: input dataframe
+    :param shared_categories: a dictionary mapping semantic names to categorical dtypes
+    :param columns: the columns definition used to build shared_categories. If None, semantic names are used as
+    column names.
+    :param inplace: If False, return a copy. Otherwise, do operation inplace and return None.
+    :return: optionally returns input df, with encoded columns, if inplace is False
+    """
+    if columns is None:
+        columns = list(shared_categories)
+    # column assignments below replace whole columns, hence a shallow copy leaves input dataframe untouched
+    df_out = df if inplace else df.copy(deep=False)
+    columns_rename_map: Dict[str, str] = {}
+    for name, aliases in _shared_columns_aliases(columns).items():
+        alias = next((alias for alias in aliases if alias in df_out.columns), None)
+        if alias is None:
+            continue
+        df_out[alias] = df_out[alias].astype(shared_categories[name])
+        if alias != name:
+            columns_rename_map[alias] = name
+    df_out.rename(columns=columns_rename_map, inplace=True)
+    if not inplace:
+        return df_out
+    else:
+        return None
+
+
 def drop_first_row(df_list, range_start, range_end):
     for y in range(range_start, range_end + 1):
         df_list[y].drop(axis=0, index=df_list[y].index[0], inplace=True)
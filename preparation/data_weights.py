@@ -0,0 +1,117 @@
+"""
+This module contains survey reweighting functions.
+
+Respondents weights are fitted by raking (iterative proportional fitting): weights are scaled, one categorical column
+(margin) at a time, until weighted shares of each margin categories (e.g. country, experience or employment) match
+target shares. Each scaling step is a weighted bincount over integer group codes, so that a full year is fitted in a
+few vectorized passes. Fitted weights are then given to LanguagesRankingExtractor, whose rankings, percentages and
+shares account for them.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+def align_weights(weights, index: pd.Index) -> np.ndarray:
+    """
+    Aligns respondents weights to respondents data
+    :param weights: a series of weights, labelled by respondents data index, or an array of weights, in respondents
+    data order
+    :param index: respondents data index
+    :return: an array of weights, in respondents data order
+    """
+    if isinstance(weights, pd.Series):
+        missing = index.difference(weights.index)
+        if len(missing) > 0:
+            raise ValueError(f"{len(missing)} respondents have no weight, e.g. {list(missing[:5])}")
+        weights = weights.reindex(index)
+    weights = np.array(weights, dtype=float)
+    if weights.shape != (len(index),):
+        raise ValueError(f"{len(index)} weights expected, got an array of shape {weights.shape}")
+    return weights
+
+
+def _normalized_target(target) -> pd.Series:
+    """
+    Converts a target marginal to shares summing to 1
+    :param target: a dictionary or a series, mapping categories to shares, percentages or counts
+    :return: a series of shares
+    """
+    target = pd.Series(target, dtype=float)
+    return target / target.sum()
+
+
+def compute_marginals(df: pd.DataFrame, columns: list, weights=None) -> dict:
+    """
+    Computes (weighted) marginals of categorical columns, e.g. to use a survey year population mix as the target of
+    another year
+    :param df: respondents data
+    :param columns: categorical columns names
+    :param weights: optional respondents weights, see align_weights
+    :return: a dictionary in the form of {column : series of categories shares}, missing values being left out
+    """
+    weights = np.ones(df.shape[0]) if weights is None else align_weights(weights, df.index)
+    marginals = {}
+    for column in columns:
+        codes, categories = pd.factorize(df[column])
+        valid = codes >= 0
+        totals = np.bincount(codes[valid], weights=weights[valid], minlength=len(categories))
+        marginals[column] = pd.Series(totals / totals.sum(), index=categories, name=column)
+    return marginals
+
+
+def rake(df: pd.DataFrame, targets: dict, base_weights=None, max_iter: int = 100, tol: float = 1e-6,
+         weight_bounds: tuple = None) -> pd.Series:
+    """
+    Fits respondents weights so that weighted shares of each target column match target shares, through iterative
+    proportional fitting.
+
+    Respondents whose value is missing, or not among target categories, are left out of that column adjustment, and
+    target shares apply to the weight of the remaining respondents. Target categories with no respondents are dropped,
+    the other ones being rescaled.
+    :param df: respondents data
+    :param targets: a dictionary in the form of {column : target marginal}, target marginals mapping categories to
+    shares, percentages or counts (see compute_marginals)
+    :param base_weights: optional starting weights (e.g. design weights), see align_weights, defaults to 1 for every
+    respondent
+    :param max_iter: maximum number of fitting cycles over all the target columns
+    :param tol: convergence tolerance, on the largest absolute difference between weighted and target shares
+    :param weight_bounds: optional (lower, upper) bounds of weights, relative to the mean weight, weights being
+    trimmed to them after each cycle
+    :return: a series of weights, sharing df index, normalized to a mean of 1
+    """
+    weights = np.ones(df.shape[0]) if base_weights is None else align_weights(base_weights, df.index)
+
+    margins = []
+    for column, target in targets.items():
+        target = _normalized_target(target)
+        codes = pd.Categorical(df[column], categories=target.index).codes.astype(np.int64)
+        valid = codes >= 0
+        # target categories with no respondents cannot be reached
+        present = np.bincount(codes[valid], minlength=len(target)) > 0
+        shares = np.where(present, target.to_numpy(), 0)
+        margins.append((column, codes[valid], valid, shares / shares.sum()))
+
+    max_difference = np.inf
+    for _ in range(max_iter):
+        for _, codes, valid, shares in margins:
+            valid_weights = weights[valid]
+            totals = np.bincount(codes, weights=valid_weights, minlength=len(shares))
+            factors = np.divide(shares * valid_weights.sum(), totals, out=np.ones(len(shares)), where=totals > 0)
+            weights[valid] = valid_weights * factors[codes]
+        if weight_bounds is not None:
+            mean_weight = weights.mean()
+            np.clip(weights, weight_bounds[0] * mean_weight, weight_bounds[1] * mean_weight, out=weights)
+
+        max_difference = 0
+        for _, codes, valid, shares in margins:
+            totals = np.bincount(codes, weights=weights[valid], minlength=len(shares))
+            max_difference = max(max_difference, np.abs(totals / totals.sum() - shares).max())
+        if max_difference < tol:
+            break
+    else:
+        warnings.warn(f"raking did not converge in {max_iter} iterations (largest share difference: "
+                      f"{max_difference:.3g})", RuntimeWarning)
+
+    return pd.Series(weights / weights.mean(), index=df.index, name="weight")
@@ -0,0 +1,120 @@
+"""
+This file contains functions needed to render analysis plots in batch
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .utils import map_languages_to_color_list
+
+# name of the file, in plots folder, storing a hash of the data and style of each rendered plot
+PLOTS_MANIFEST_NAME = ".plots_manifest.json"
+
+# plots style, as set in analysis notebooks
+DEFAULT_FIGSIZE = (20, 10)
+DEFAULT_FONT = {'weight': 'bold', 'size': 22}
+
+
+def _plot_hash(percentages: pd.Series, colors: list, figsize: tuple, font: dict) -> str:
+    """
+    Computes a hash of a plot input ranking and style options
+    :param percentages: languages percentages to be plotted
+    :param colors: bars colors
+    :param figsize: figure size, in inches
+    :param font: font properties
+    :return: hexadecimal digest
+    """
+    plot_description = {"languages": [str(lang) for lang in percentages.index],
+                        "values": [float(v) for v in percentages.values],
+                        "colors": colors, "figsize": list(figsize), "font": font}
+    return hashlib.sha256(json.dumps(plot_description, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def render_top_ten_plot(percentages: pd.Series, file_path: str, colors: list,
+                        figsize: tuple = DEFAULT_FIGSIZE, font: dict = None) -> str:
+    """
+    Renders a top ten languages bar plot to file, with a non-interactive backend. Values are annotated on top of
+    each bar, for readability.
+    :param percentages: languages percentages to be plotted, in plotting order
+    :param file_path: destination file path
+    :param colors: bars colors
+    :param figsize: figure size, in inches
+    :param font: font properties, defaults to DEFAULT_FONT
+    :return: destination file path
+    """
+    import matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if font is None:
+        font = DEFAULT_FONT
+    font_rc = {f"font.{key}": value for key, value in font.items()}
+    with matplotlib.rc_context(font_rc):
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        positions = range(len(percentages))
+        ax.bar(positions, percentages.values, width=0.5, color=colors)
+        ax.set_xticks(list(positions))
+        ax.set_xticklabels(percentages.index, rotation=90)
+        # annotating values on top of each bar, for readability
+        for p in ax.patches:
+            ax.annotate(str(round(p.get_height(), 2)), (p.get_x() * 1.005, p.get_height() * 1.005))
+        fig.savefig(file_path, bbox_inches='tight')
+    return file_path
+
+
+def render_top_ten_plots(top_ten_percentages: dict, languages_color_palette: dict, plots_path: str = "plots",
+                         file_name: str = "Q1_{year}.png", figsize: tuple = DEFAULT_FIGSIZE, font: dict = None,
+                         max_workers: int = None, force: bool = False) -> list:
+    """
+    Renders every year top ten languages plot, across a process pool. Plots whose input ranking and style options
+    did not change since last rendering are skipped.
+    :param top_ten_percentages: dictionary in the form of {year : top ten languages percentages series}
+    :param languages_color_palette: dictionary mapping languages to colors
+    :param plots_path: folder where plots are saved
+    :param file_name: plots file name, formatted with year
+    :param figsize: figure size, in inches
+    :param font: font properties, defaults to DEFAULT_FONT
+    :param max_workers: number of worker processes, defaults to the number of processors of the machine
+    :param force: if True, every plot is rendered again
+    :return: the list of years whose plot has been rendered
+    """
+    if font is None:
+        font = DEFAULT_FONT
+    os.makedirs(plots_path, exist_ok=True)
+    manifest_path = os.path.join(plots_path, PLOTS_MANIFEST_NAME)
+    manifest = {}
+    if os.path.isfile(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    jobs = {}
+    for year, percentages in top_ten_percentages.items():
+        plot_file_name = file_name.format(year=year)
+        colors = map_languages_to_color_list(languages_color_palette, percentages)
+        plot_hash = _plot_hash(percentages, colors, figsize, font)
+        file_path = os.path.join(plots_path, plot_file_name)
+        if not force and manifest.get(plot_file_name) == plot_hash and os.path.isfile(file_path):
+            continue
+        jobs[year] = (plot_file_name, plot_hash, (percentages, file_path, colors, figsize, font))
+
+    if len(jobs) == 1 or max_workers == 1:
+        for plot_file_name, plot_hash, args in jobs.values():
+            render_top_ten_plot(*args)
+            manifest[plot_file_name] = plot_hash
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(render_top_ten_plot, *args): (plot_file_name, plot_hash)
+                       for plot_file_name, plot_hash, args in jobs.values()}
+            for future, (plot_file_name, plot_hash) in futures.items():
+                future.result()
+                manifest[plot_file_name] = plot_hash
+
+    if jobs:
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    return list(jobs)
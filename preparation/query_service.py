@@ -0,0 +1,303 @@
+"""
+This file contains a local HTTP query service over precomputed survey statistics.
+
+Survey stats are loaded once, in a single process, and served as JSON to every client (analysts' kernels,
+dashboards), with hot query results kept in a bounded LRU cache. The service only relies on the standard library
+(asyncio), and it is meant to be bound to a local address.
+
+Endpoints (GET, except /refresh):
+    /years
+    /ranking?year=2019[&top=10]
+    /percentages?year=2019[&top=10]
+    /platform_shares?year=2019&platform=Android
+    /share?year=2019&languages=Java,Kotlin[&unison=1][&platform=Android][&platform_key=PlatformWorkedWith]
+    /intersection?year=2019&language_1=Java&language_2=Kotlin[&overall=1]
+    /refresh (POST): reloads survey stats and empties the cache
+"""
+import asyncio
+import json
+import math
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                500: "Internal Server Error"}
+
+# endpoints answering queries on a single year stats
+YEAR_ENDPOINTS = ("/ranking", "/percentages", "/platform_shares", "/share", "/intersection")
+
+
+class LRUCache:
+    """
+    Bounded, thread safe, least recently used cache
+    """
+
+    def __init__(self, max_size: int = 256):
+        """
+        :param max_size: maximum number of cached entries, least recently used entries being evicted first
+        """
+        self.__max_size = max_size
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key, default=None):
+        """
+        Retrieves a cached value, marking it as the most recently used
+        :param key: cache key
+        :param default: value returned on cache miss
+        :return: cached value, or default
+        """
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return self.__entries[key]
+            self.__misses += 1
+            return default
+
+    def put(self, key, value) -> None:
+        """
+        Caches a value, evicting the least recently used entry if the cache is full
+        :param key: cache key
+        :param value: value to be cached
+        """
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def cache_info(self) -> dict:
+        return {"hits": self.__hits, "misses": self.__misses, "size": len(self.__entries),
+                "max size": self.__max_size}
+
+
+class QueryError(Exception):
+    """
+    Error raised by invalid queries, carrying the HTTP status to be returned
+    """
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class SurveyStatsQueryService:
+    """
+    Serves ranking, percentage and share queries over survey stats, loaded once through a loader function.
+
+    The loader returns a dictionary in the form of {year : stats}, where stats are LanguagesProficienciesPercentages
+    objects or LanguagesStatsSnapshot objects (the latter do not answer 'share' queries).
+    """
+
+    def __init__(self, loader: Callable[[], dict], cache_size: int = 256):
+        """
+        :param loader: function loading survey stats, called at start up and on each refresh
+        :param cache_size: maximum number of cached query results
+        """
+        self.__loader = loader
+        self.__cache = LRUCache(cache_size)
+        self.__stats = None
+        # incremented on each refresh, so that results computed from previous stats are not cached
+        self.__generation = 0
+        self.__stats_lock = threading.Lock()
+        self.__load_lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """
+        Loads survey stats again, evicting every cached result
+        """
+        with self.__load_lock:
+            self._load()
+
+    def _load(self) -> None:
+        """
+        Loads survey stats, the caller holding the load lock
+        """
+        stats = self.__loader()
+        with self.__stats_lock:
+            self.__stats = stats
+            self.__generation += 1
+            self.__cache.clear()
+
+    def _get_stats(self) -> tuple:
+        """
+        Retrieves the current survey stats, loading them on first use
+        :return: a (stats, generation) tuple
+        """
+        with self.__stats_lock:
+            stats, generation = self.__stats, self.__generation
+        if stats is None:
+            with self.__load_lock:
+                # concurrent first queries load survey stats once
+                if self.__stats is None:
+                    self._load()
+            with self.__stats_lock:
+                stats, generation = self.__stats, self.__generation
+        return stats, generation
+
+    def cache_info(self) -> dict:
+        return self.__cache.cache_info()
+
+    def query(self, endpoint: str, params: dict):
+        """
+        Answers a query, from cache when possible
+        :param endpoint: query endpoint, e.g. '/ranking'
+        :param params: query parameters
+        :return: a JSON serializable result
+        """
+        if endpoint == "/refresh":
+            self.refresh()
+            return {"refreshed": True}
+        stats, generation = self._get_stats()
+        key = (endpoint, tuple(sorted(params.items())))
+        result = self.__cache.get(key)
+        if result is None:
+            result = self._compute(stats, endpoint, params)
+            with self.__stats_lock:
+                # stats refreshed meanwhile: the result is stale
+                if generation == self.__generation:
+                    self.__cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _compute(stats: dict, endpoint: str, params: dict):
+        """
+        Computes a query result
+        :param stats: survey stats, in the form of {year : stats}
+        :param endpoint: query endpoint
+        :param params: query parameters
+        :return: a JSON serializable result
+        """
+        if endpoint == "/years":
+            return sorted(stats)
+        if endpoint not in YEAR_ENDPOINTS:
+            raise QueryError(f"unknown endpoint '{endpoint}'", status=404)
+        try:
+            year = int(params["year"])
+        except (KeyError, ValueError) as e:
+            raise QueryError("a valid 'year' parameter is required") from e
+        if year not in stats:
+            raise QueryError(f"no stats for year {year}", status=404)
+        year_stats = stats[year]
+        try:
+            top = int(params["top"]) if "top" in params else None
+        except ValueError as e:
+            raise QueryError("'top' parameter must be an integer") from e
+
+        try:
+            if endpoint == "/ranking":
+                series = year_stats.compute_language_proficiency_ranking()
+            elif endpoint == "/percentages":
+                series = year_stats.get_percentages()
+            elif endpoint == "/platform_shares":
+                series = year_stats.platform_shares(params["platform"])
+            elif endpoint == "/share":
+                share_kwargs = {"unison": _flag(params, "unison"), "platform": params.get("platform")}
+                if "platform_key" in params:
+                    share_kwargs["platform_key"] = params["platform_key"]
+                return _json_number(year_stats.joint_share(params["languages"].split(","), **share_kwargs))
+            else:
+                return _json_number(year_stats.intersection_percentage(params["language_1"], params["language_2"],
+                                                                       overall=_flag(params, "overall")))
+        except (KeyError, AttributeError) as e:
+            raise QueryError(f"invalid query: {e}") from e
+        if top is not None:
+            series = series.iloc[:top]
+        return {str(k): _json_number(v) for k, v in series.items()}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Handles a single HTTP/1.1 request, answering with a JSON body
+        :param reader: client stream reader
+        :param writer: client stream writer
+        """
+        status = 200
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            # skipping headers
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            if len(request_line) < 2:
+                raise QueryError("malformed request")
+            method, target = request_line[0], request_line[1]
+            url = urlsplit(target)
+            if method != ("POST" if url.path == "/refresh" else "GET"):
+                raise QueryError(f"method {method} not allowed", status=405)
+            # computations run in a worker thread, so that slow queries do not block other clients
+            loop = asyncio.get_running_loop()
+            body = await loop.run_in_executor(None, self.query, url.path, dict(parse_qsl(url.query)))
+        except QueryError as e:
+            status, body = e.status, {"error": str(e)}
+        except Exception as e:  # pylint: disable=broad-except
+            status, body = 500, {"error": repr(e)}
+
+        try:
+            payload = json.dumps(body, allow_nan=False).encode("utf-8")
+        except ValueError as e:
+            # NaN and infinities are not valid JSON
+            status, payload = 500, json.dumps({"error": repr(e)}).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("latin-1") + payload)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """
+        Loads survey stats and starts serving queries
+        :param host: address to bind, local by default
+        :param port: port to bind, 0 picking a free one
+        :return: the running asyncio server
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self._get_stats)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+def _json_number(value) -> Optional[float]:
+    """
+    Converts a number to a JSON serializable float
+    :param value: a number
+    :return: value as a float, or None if it is not finite (NaN or infinite), as JSON cannot represent it
+    """
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _flag(params: dict, name: str) -> bool:
+    """
+    Reads a boolean query parameter
+    :param params: query parameters
+    :param name: parameter name
+    :return: True if the parameter is set to '1', 'true' or 'yes'
+    """
+    return params.get(name, "0").lower() in ("1", "true", "yes")
+
+
+def run_query_service(loader: Callable[[], dict], host: str = "127.0.0.1", port: int = 8765,
+                      cache_size: int = 256) -> None:
+    """
+    Runs a SurveyStatsQueryService until interrupted
+    :param loader: function loading survey stats, see SurveyStatsQueryService
+    :param host: address to bind, local by default
+    :param port: port to bind
+    :param cache_size: maximum number of cached query results
+    """
+    async def serve():
+        server = await SurveyStatsQueryService(loader, cache_size=cache_size).start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
@@ -0,0 +1,134 @@
+"""
+This file contains functions fitting languages popularity trends over the years, for every language at once.
+
+Input data is a year x language table, such as the one built by data_load.get_10most_popular_languages_by_year:
+each column is fitted through least squares, batched over the whole table, with no per-language loop.
+"""
+import numpy as np
+import pandas as pd
+
+# minimum number of years on each side of a change point
+MIN_SEGMENT_SIZE = 3
+
+
+def _batched_linear_fit(t: np.ndarray, values: np.ndarray) -> dict:
+    """
+    Fits a line for each column of values, by ordinary least squares, all columns at once. Missing values (NaN) are
+    left out of their own column fit.
+    :param t: years, shaped (n,)
+    :param values: values to be fitted, shaped (n, columns)
+    :return: a dictionary of arrays, shaped (columns,): 'slope', 'intercept', 'sse' (sum of squared errors),
+    'n' (number of fitted points), 't_mean' and 'sxx' (sum of squared deviations of fitted years)
+    """
+    mask = ~np.isnan(values)
+    y = np.where(mask, values, 0.0)
+    tt = np.where(mask, t[:, np.newaxis], 0.0)
+    n = mask.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_mean = tt.sum(axis=0) / n
+        y_mean = y.sum(axis=0) / n
+        dt = np.where(mask, t[:, np.newaxis] - t_mean, 0.0)
+        dy = np.where(mask, values - y_mean, 0.0)
+        sxx = (dt ** 2).sum(axis=0)
+        slope = (dt * dy).sum(axis=0) / sxx
+        intercept = y_mean - slope * t_mean
+        residuals = np.where(mask, values - (intercept + slope * t[:, np.newaxis]), 0.0)
+    return {"slope": slope, "intercept": intercept, "sse": (residuals ** 2).sum(axis=0), "n": n,
+            "t_mean": t_mean, "sxx": sxx}
+
+
+def fit_trends(languages_popularity_df: pd.DataFrame) -> pd.DataFrame:
+    """Fit linear trend, growth rate and change point of every language popularity.
+
+    - slope and intercept: linear trend, in popularity units per year
+    - r2: coefficient of determination of the linear trend
+    - growth rate: yearly compound growth rate, in percentage, from a log-linear fit (NaN when popularity is not
+      positive over all the fitted years)
+    - change point: first year of the second segment of the best two-segment piecewise linear fit, along with the
+      slopes before and after it, and the share of linear trend squared error explained by the split (change gain)
+
+    :param languages_popularity_df: a year x language dataframe, indexed by year
+    :return: a dataframe indexed by language, holding trend stats
+    """
+    # segments of the change point search are made of consecutive years
+    languages_popularity_df = languages_popularity_df.sort_index()
+    t = languages_popularity_df.index.to_numpy(dtype=float)
+    values = languages_popularity_df.to_numpy(dtype=float)
+
+    linear = _batched_linear_fit(t, values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sst = np.nansum((values - np.nanmean(values, axis=0)) ** 2, axis=0)
+        r2 = 1 - linear["sse"] / sst
+        log_values = np.log(np.where(values > 0, values, np.nan))
+    log_linear = _batched_linear_fit(t, log_values)
+    # languages with a non positive value have no meaningful compound growth
+    growth_rate = np.where(np.isnan(log_values).sum(axis=0) > np.isnan(values).sum(axis=0), np.nan,
+                           (np.exp(log_linear["slope"]) - 1) * 100)
+
+    # change point: best split, among candidates, of two independent linear fits
+    best_sse = np.full(values.shape[1], np.inf)
+    change_point = np.full(values.shape[1], np.nan)
+    slope_before = np.full(values.shape[1], np.nan)
+    slope_after = np.full(values.shape[1], np.nan)
+    for k in range(MIN_SEGMENT_SIZE, len(t) - MIN_SEGMENT_SIZE + 1):
+        before = _batched_linear_fit(t[:k], values[:k])
+        after = _batched_linear_fit(t[k:], values[k:])
+        sse = before["sse"] + after["sse"]
+        improved = sse < best_sse
+        best_sse = np.where(improved, sse, best_sse)
+        change_point = np.where(improved, t[k], change_point)
+        slope_before = np.where(improved, before["slope"], slope_before)
+        slope_after = np.where(improved, after["slope"], slope_after)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        change_gain = np.where(np.isfinite(best_sse), 1 - best_sse / linear["sse"], np.nan)
+
+    return pd.DataFrame({"slope": linear["slope"], "intercept": linear["intercept"], "r2": r2,
+                         "growth rate": growth_rate, "change point": change_point, "slope before": slope_before,
+                         "slope after": slope_after, "change gain": change_gain},
+                        index=languages_popularity_df.columns)
+
+
+def forecast_trends(languages_popularity_df: pd.DataFrame, horizon: int = 3, confidence: float = 0.95) -> dict:
+    """
+    Forecasts every language popularity for the years following the last one, from its linear trend, along with
+    prediction intervals.
+    :param languages_popularity_df: a year x language dataframe, indexed by year
+    :param horizon: number of years to be forecast
+    :param confidence: prediction intervals confidence level
+    :return: a dictionary holding three year x language dataframes: 'forecast', 'lower' and 'upper' (prediction
+    interval bounds)
+    """
+    from scipy import stats
+
+    t = languages_popularity_df.index.to_numpy(dtype=float)
+    values = languages_popularity_df.to_numpy(dtype=float)
+    fit = _batched_linear_fit(t, values)
+
+    future_years = np.arange(1, horizon + 1) + languages_popularity_df.index.max()
+    future_t = future_years.astype(float)[:, np.newaxis]
+    forecast = fit["intercept"] + fit["slope"] * future_t
+    with np.errstate(invalid="ignore", divide="ignore"):
+        degrees_of_freedom = fit["n"] - 2
+        residual_std = np.sqrt(fit["sse"] / degrees_of_freedom)
+        standard_error = residual_std * np.sqrt(1 + 1 / fit["n"] + (future_t - fit["t_mean"]) ** 2 / fit["sxx"])
+        margin = stats.t.ppf((1 + confidence) / 2, degrees_of_freedom) * standard_error
+
+    index = pd.Index(future_years, name=languages_popularity_df.index.name)
+    columns = languages_popularity_df.columns
+    return {"forecast": pd.DataFrame(forecast, index=index, columns=columns),
+            "lower": pd.DataFrame(forecast - margin, index=index, columns=columns),
+            "upper": pd.DataFrame(forecast + margin, index=index, columns=columns)}
+
+
+def rank_by_momentum(languages_popularity_df: pd.DataFrame, last_years: int = None) -> pd.Series:
+    """
+    Ranks languages by momentum, i.e. by their linear trend slope, over the whole period or the last years only
+    :param languages_popularity_df: a year x language dataframe, indexed by year
+    :param last_years: if provided, only the last years are fitted
+    :return: a series of slopes, in descending order
+    """
+    if last_years is not None:
+        languages_popularity_df = languages_popularity_df.sort_index().iloc[-last_years:]
+    t = languages_popularity_df.index.to_numpy(dtype=float)
+    slope = _batched_linear_fit(t, languages_popularity_df.to_numpy(dtype=float))["slope"]
+    return pd.Series(slope, index=languages_popularity_df.columns, name="slope").sort_values(ascending=False)
@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from preparation.data_clean import LanguageNameMatcher, normalize_language_name
+
+
+class TestLanguageNameMatcher(TestCase):
+    """TestCase for n-grams indexed matching of raw language names"""
+
+    def setUp(self) -> None:
+        self.vocabulary = ["JavaScript", "Java", "Python", "C++", "C#", "C", "Objective-C", "Go", "Ruby", "Node.js"]
+        self.matcher = LanguageNameMatcher(self.vocabulary)
+
+    def test_normalize_language_name(self):
+        """Versions, whitespaces and punctuation are dropped, symbols are kept"""
+        self.assertEqual(normalize_language_name(" Java Script "), "javascript")
+        self.assertEqual(normalize_language_name("C++11"), "c++")
+        self.assertEqual(normalize_language_name("Python 3.11"), "python")
+        self.assertEqual(normalize_language_name("node.js"), "nodejs")
+
+    def test_match(self):
+        """Spelling variants, aliases and typos are matched, unrelated names are not"""
+        expected = {"Javascript": "JavaScript", "java script": "JavaScript", "C++11": "C++", "Obj-C": "Objective-C",
+                    "golang": "Go", "Phyton": "Python", "Rubby": "Ruby", "c": "C", "C#": "C#", "Cobol": None}
+        for value, name in expected.items():
+            with self.subTest(value=value):
+                self.assertEqual(self.matcher.match(value), name)
+
+    def test_short_names(self):
+        """Short names are only matched exactly, aliases are mapped to the names the survey uses"""
+        matcher = LanguageNameMatcher(["SQL", "Go", "Bash/Shell/PowerShell", "VBA"])
+        expected = {"MySQL": None, "NoSQL": None, "sql": "SQL", "Goo": None, "Shell": "Bash/Shell/PowerShell",
+                    "bash": "Bash/Shell/PowerShell", "VB": None}
+        for value, name in expected.items():
+            with self.subTest(value=value):
+                self.assertEqual(matcher.match(value), name)
+
+    def test_match_series(self):
+        """Distinct values are matched once, missing values are not matched"""
+        series = pd.Series(["Javascript", np.nan, "Cobol", "Javascript", "phyton"], index=[5, 6, 7, 8, 9])
+        names = self.matcher.match_series(series)
+        pd.testing.assert_series_equal(names, pd.Series(["JavaScript", np.nan, np.nan, "JavaScript", "Python"],
+                                                        index=series.index, dtype=object))
+        self.assertDictEqual(self.matcher.cache_info(), {"size": 3, "matched": 2})
+
+    def test_normalize_answers(self):
+        """Answers names are matched and deduplicated, in order"""
+        answers = pd.Series(["Javascript, C++11, java script", np.nan, "Cobol", "golang,Fortran"], index=[1, 1, 2, 3])
+        expected = pd.Series(["JavaScript,C++", np.nan, np.nan, "Go"], index=[1, 1, 2, 3], dtype=object)
+        pd.testing.assert_series_equal(self.matcher.normalize_answers(answers, sep=","), expected)
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from preparation.data_cube import LanguagesPlatformCube
+
+
+class TestLanguagesPlatformCube(unittest.TestCase):
+    """Test case for year x platform x language cube"""
+
+    def setUp(self) -> None:
+        self.surveys = {
+            2018: pd.DataFrame(data={
+                "PlatformWorkedWith": ["Android;Linux", "Android", np.nan, "Windows"],
+                "LanguageWorkedWith: Java": [1, 1, 0, 1],
+                "LanguageWorkedWith: Kotlin": [1, 0, 0, 0],
+            }),
+            2019: pd.DataFrame(data={
+                "PlatformWorkedWith": ["Android", "Android;Windows"],
+                "LanguageWorkedWith: Kotlin": [1, 1],
+                "LanguageWorkedWith: Python": [0, 1],
+            }),
+        }
+        self.cube = LanguagesPlatformCube.from_surveys(self.surveys, columns_selection_criteria="LanguageWorkedWith",
+                                                       prefix_to_remove="LanguageWorkedWith: ")
+
+    def test_ranking(self):
+        """Rankings are sliced from the cube"""
+        ranking = self.cube.ranking(2018)
+        self.assertListEqual(list(ranking.index[:2]), ["Java", "Kotlin"])
+        np.testing.assert_array_equal(ranking.values, [3, 1, 0])
+        self.assertEqual(self.cube.ranking(2018, platform="Android")["Kotlin"], 1)
+
+    def test_percentages(self):
+        """Percentages refer to respondents on the platform"""
+        self.assertEqual(self.cube.percentages(2018, platform="Android")["Kotlin"], 50)
+        self.assertEqual(self.cube.percentages(2018)["Java"], 75)
+        # no 2019 respondent works on Linux
+        self.assertTrue((self.cube.percentages(2019, platform="Linux") == 0).all())
+
+    def test_duplicate_languages(self):
+        """Columns naming the same language once prefix is removed are aggregated, respondents being counted once"""
+        surveys = {2018: pd.concat([self.surveys[2018], pd.DataFrame({"LanguageWorkedWith: Kotlin": [0, 1, 0, 1]})],
+                                   axis=1)}
+        cube = LanguagesPlatformCube.from_surveys(surveys, columns_selection_criteria="LanguageWorkedWith",
+                                                  prefix_to_remove="LanguageWorkedWith: ")
+        self.assertListEqual(cube.get_languages(), ["Java", "Kotlin"])
+        self.assertEqual(cube.ranking(2018)["Kotlin"], 3)
+        self.assertEqual(cube.ranking(2018, platform="Android")["Kotlin"], 2)
+
+    def test_trend(self):
+        """Trends span the cube years, languages missing in a year count as zero"""
+        trend = self.cube.trend(["Kotlin", "Java"], platform="Android")
+        np.testing.assert_array_equal(trend["Kotlin"].values, [50, 100])
+        np.testing.assert_array_equal(trend["Java"].values, [100, 0])
+
+    def test_save_load(self):
+        """A stored cube answers the same queries"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "cube.npz")
+            self.cube.save(file_path)
+            loaded_cube = LanguagesPlatformCube.load(file_path)
+        pd.testing.assert_frame_equal(loaded_cube.trend(platform="Windows"), self.cube.trend(platform="Windows"))
+
+
+if __name__ == "__main__":
+    unittest.main()
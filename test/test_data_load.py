@@ -0,0 +1,174 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import pandas as pd
+
+from preparation import data_load
+from preparation.data_load import (load_from_csv, detect_encoding, FALLBACK_ENCODING, load_surveys_data_from_csv,
+                                   find_archive_member, iter_surveys, aiter_surveys)
+
+
+class TestLoadFromCsv(unittest.TestCase):
+    """Test case for CSV loading backends"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        # a survey-like file: unnamed and duplicated headers, missing values, booleans and dates
+        self.csv_content = ("Respondent,Country,,Country,Hobby,Empty,Date\n"
+                            "1,Italy,NA,2.5,True,,2020-01-01\n"
+                            "2,,Python;Java,,False,,2020-01-02\n"
+                            "3,Côte d'Ivoire,C,1.0,True,,2020-01-03\n")
+        self.utf8_path = os.path.join(self.tmp_dir.name, "2020_results.csv")
+        with open(self.utf8_path, "w", encoding="utf-8") as f:
+            f.write(self.csv_content)
+        self.latin1_path = os.path.join(self.tmp_dir.name, "2011_results.csv")
+        with open(self.latin1_path, "w", encoding=FALLBACK_ENCODING) as f:
+            f.write(self.csv_content)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_engines_return_same_frames(self):
+        """Arrow and pandas C parser backends return the same dataframe"""
+        df_c = load_from_csv(self.utf8_path, "utf-8", engine="c")
+        df_arrow = load_from_csv(self.utf8_path, "utf-8", engine="pyarrow")
+        pd.testing.assert_frame_equal(df_c, df_arrow)
+
+    def test_overflowing_integers(self):
+        """Integers overflowing int64 get the C parser dtypes from the Arrow backend too"""
+        file_path = os.path.join(self.tmp_dir.name, "2021_results.csv")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("Id,Big,Huge,Rate\n1,18446744073709551615,123456789012345678901,0.5\n2,3,4,\n")
+        df_c = load_from_csv(file_path, "utf-8", engine="c")
+        self.assertListEqual(list(df_c.dtypes.astype(str)), ["int64", "uint64", "object", "float64"])
+        pd.testing.assert_frame_equal(df_c, load_from_csv(file_path, "utf-8", engine="pyarrow"))
+
+    def test_temporal_columns_past_sample(self):
+        """Dates are kept as strings, whether they are found in the encoding sample or past it"""
+        expected = load_from_csv(self.utf8_path, "utf-8", engine="c")
+        with mock.patch.object(data_load, "ENCODING_SAMPLE_SIZE", 64):
+            pd.testing.assert_frame_equal(load_from_csv(self.utf8_path, "utf-8", engine="pyarrow"), expected)
+
+    def test_detect_encoding(self):
+        """UTF-8 and Latin-1 files are told apart"""
+        self.assertEqual(detect_encoding(self.utf8_path), "utf-8")
+        self.assertEqual(detect_encoding(self.latin1_path), FALLBACK_ENCODING)
+
+    def test_detected_encoding_is_cached(self):
+        """Encoding detection happens once per file"""
+        detect_encoding(self.latin1_path)
+        self.assertIn(data_load._source_signature(self.latin1_path), data_load._detected_encodings)
+        df = load_from_csv(self.latin1_path)
+        self.assertEqual(df.loc[2, "Country"], "Côte d'Ivoire")
+
+    def test_unknown_engine(self):
+        """Unknown parser backends are rejected"""
+        with self.assertRaises(ValueError):
+            load_from_csv(self.utf8_path, engine="fast")
+
+
+class TestLoadFromArchive(unittest.TestCase):
+    """Test case for loading survey data straight from zip archives"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_content = ("ResponseId,Country,LanguageHaveWorkedWith\n"
+                            "1,Italy,Python;Java\n"
+                            "2,Côte d'Ivoire,C\n")
+        self.csv_path = os.path.join(self.tmp_dir.name, "results.csv")
+        with open(self.csv_path, "w", encoding="utf-8") as f:
+            f.write(self.csv_content)
+        self.archive_path = os.path.join(self.tmp_dir.name, "stack-overflow-developer-survey-2023.zip")
+        with zipfile.ZipFile(self.archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("survey_results_schema.csv", "qid,question\nQ1,Country\n")
+            archive.writestr("survey_results_public.csv", self.csv_content.encode("utf-8"))
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_find_archive_member(self):
+        """Results file is found, schema file skipped"""
+        self.assertEqual(find_archive_member(self.archive_path), "survey_results_public.csv")
+
+    def test_archive_and_csv_return_same_frames(self):
+        """Reading from the archive gives the same dataframe as reading the extracted file"""
+        for engine in ("auto", "c"):
+            with self.subTest(engine=engine):
+                pd.testing.assert_frame_equal(load_from_csv(self.archive_path, engine=engine),
+                                              load_from_csv(self.csv_path, engine=engine))
+
+    def test_archive_opened_once(self):
+        """Archive member is decompressed by a single opening, detecting its encoding and reading it"""
+        for engine in ("pyarrow", "c"):
+            with self.subTest(engine=engine), \
+                    mock.patch.object(data_load, "open_source", wraps=data_load.open_source) as open_source:
+                load_from_csv(self.archive_path, engine=engine)
+                open_source.assert_called_once()
+
+    def test_archive_usecols(self):
+        """Column pruning works on archives too, keeping file order"""
+        for engine in ("auto", "c"):
+            with self.subTest(engine=engine):
+                df = load_from_csv(self.archive_path, engine=engine,
+                                   usecols=["LanguageHaveWorkedWith", "ResponseId"])
+                self.assertListEqual(list(df.columns), ["ResponseId", "LanguageHaveWorkedWith"])
+
+    def test_load_surveys_data_from_archives(self):
+        """Yearly archives are picked up when the extracted CSV file is missing"""
+        surveys = load_surveys_data_from_csv(years=[2023], data_path=self.tmp_dir.name)
+        self.assertEqual(surveys[2023].loc[1, "Country"], "Côte d'Ivoire")
+
+
+class TestIterSurveys(unittest.TestCase):
+    """Test case for pipelined per-year loading and processing"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.years = [2019, 2020, 2021, 2022]
+        for year in self.years:
+            with open(os.path.join(self.tmp_dir.name, f"{year}_results.csv"), "w", encoding="utf-8") as f:
+                f.write(f"Respondent,Age\n1,{year - 2000}\n2,30\n")
+        self.stages = [lambda df: df.assign(Age=df["Age"] * 2), lambda df: df["Age"].sum()]
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_iter_surveys(self):
+        """Years are yielded in order, processed by every stage"""
+        results = dict(iter_surveys(self.years, self.stages, data_path=self.tmp_dir.name))
+        self.assertDictEqual(results, {year: 2 * (year - 2000 + 30) for year in self.years})
+        raw = load_surveys_data_from_csv(self.years, data_path=self.tmp_dir.name)
+        for year, df in iter_surveys(self.years, data_path=self.tmp_dir.name):
+            pd.testing.assert_frame_equal(df, raw[year])
+
+    def test_iter_surveys_prefetch_bound(self):
+        """No more than prefetch years are loaded ahead of the yielded one"""
+        loaded = []
+        original_load = data_load._load_survey_year
+
+        def recording_load(year, *args):
+            loaded.append(year)
+            return original_load(year, *args)
+
+        with mock.patch.object(data_load, "_load_survey_year", recording_load):
+            surveys = iter_surveys(self.years, data_path=self.tmp_dir.name, prefetch=1)
+            next(surveys)
+            self.assertLessEqual(len(loaded), 2)
+            surveys.close()
+
+    def test_aiter_surveys(self):
+        """Asynchronous iteration yields the same results"""
+        async def collect():
+            return {year: result
+                    async for year, result in aiter_surveys(self.years, self.stages, data_path=self.tmp_dir.name)}
+
+        self.assertDictEqual(asyncio.run(collect()), dict(iter_surveys(self.years, self.stages,
+                                                                       data_path=self.tmp_dir.name)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import tempfile
+from functools import partial
+from unittest import TestCase, mock
+
+import numpy as np
+import pandas as pd
+
+from preparation import data_memo
+from preparation.data_memo import StatsMemo, fingerprint, frame_fingerprint
+from preparation.data_stats import LanguagesRankingExtractor, LanguagesProficienciesPercentages
+
+
+class TestFingerprint(TestCase):
+    """TestCase for inputs fingerprints"""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({"Proficient in Java": rng.integers(0, 2, 10_000),
+                                "Proficient in Go": rng.integers(0, 2, 10_000),
+                                "Country": rng.choice(["Italy", "India", None], 10_000)})
+
+    def test_frame_fingerprint(self):
+        """Fingerprints are stable, and change with schema, index and values, sampled or not"""
+        expected = frame_fingerprint(self.df)
+        self.assertEqual(frame_fingerprint(self.df.copy()), expected)
+        changed = [self.df.rename(columns={"Country": "country"}), self.df.astype({"Proficient in Go": float}),
+                   self.df.set_axis(self.df.index + 1), self.df.iloc[:-1]]
+        for row in (0, 5001):
+            df = self.df.copy()
+            df.iloc[row, 0] = 1 - df.iloc[row, 0]
+            changed.append(df)
+        for row in (0, 4321):
+            df = self.df.copy()
+            df.iloc[row, 2] = "Peru"
+            changed.append(df)
+        # values swapped between rows
+        df = self.df.copy()
+        df.iloc[[1, 2], 0] = [1, 0]
+        self.df.iloc[[1, 2], 0] = [0, 1]
+        changed.append(df)
+        expected = frame_fingerprint(self.df)
+        for df in changed:
+            self.assertNotEqual(frame_fingerprint(df), expected)
+
+    def test_fingerprint(self):
+        """Values fingerprints depend on extractors parameters"""
+        lre = LanguagesRankingExtractor(self.df, columns_selection_criteria="Proficient in ")
+        expected = fingerprint(lre, {"top": 10})
+        same_lre = LanguagesRankingExtractor(self.df.copy(), columns_selection_criteria="Proficient in ")
+        self.assertEqual(fingerprint(same_lre, {"top": 10}), expected)
+        self.assertNotEqual(fingerprint(LanguagesRankingExtractor(self.df, columns_selection_criteria="Proficient in ",
+                                                                  exclusion_list=["Proficient in Go"]), {"top": 10}),
+                            expected)
+        self.assertNotEqual(fingerprint(lre, {"top": 5}), expected)
+
+        class PatchedExtractor(LanguagesRankingExtractor):
+            def compute_top_ten_languages(self, ignore_case=True):
+                return super().compute_top_ten_languages(ignore_case=not ignore_case)
+
+        patched_lre = PatchedExtractor(self.df, columns_selection_criteria="Proficient in ")
+        self.assertNotEqual(fingerprint(patched_lre, {"top": 10}), expected)
+        with self.assertRaises(TypeError):
+            fingerprint(object())
+
+    def test_functions_fingerprint(self):
+        """Functions fingerprints depend on their code, default and closure values"""
+        self.assertNotEqual(fingerprint(lambda d: d * 2), fingerprint(lambda d: d * 3))
+        self.assertEqual(fingerprint(lambda d: d * 2), fingerprint(lambda d: d * 2))
+
+        def scale_by(factor):
+            return lambda d: d * factor
+
+        self.assertNotEqual(fingerprint(scale_by(2)), fingerprint(scale_by(3)))
+        self.assertNotEqual(fingerprint(partial(np.multiply, 2)), fingerprint(partial(np.multiply, 3)))
+        self.assertEqual(fingerprint(partial(np.multiply, 2)), fingerprint(partial(np.multiply, 2)))
+
+
+class TestStatsMemo(TestCase):
+    """TestCase for disk memoization of stats"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.memo = StatsMemo(self.tmp_dir.name)
+        self.df = pd.DataFrame({"Proficient in Java": [1, 0, 1], "Proficient in Go": [1, 1, 1]})
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_get_stats(self):
+        """Warm calls reuse stored stats, until input data changes"""
+        lre = LanguagesRankingExtractor(self.df, prefix_to_remove="Proficient in ")
+        expected = self.memo.get_stats(LanguagesProficienciesPercentages(lre))
+        with mock.patch.object(LanguagesProficienciesPercentages, "get_stats") as get_stats:
+            stats = StatsMemo(self.tmp_dir.name).get_stats(
+                LanguagesProficienciesPercentages(LanguagesRankingExtractor(self.df.copy(),
+                                                                            prefix_to_remove="Proficient in ")))
+            get_stats.assert_not_called()
+        pd.testing.assert_series_equal(stats["proficiency percentages"], expected["proficiency percentages"])
+
+        self.df.loc[1, "Proficient in Java"] = 1
+        stats = self.memo.get_stats(LanguagesProficienciesPercentages(lre))
+        self.assertEqual(stats["proficiency percentages"]["Proficient in Java"], 100)
+        self.assertEqual(self.memo.cache_info()["size"], 2)
+
+    def test_call_and_eviction(self):
+        """Function results are memoized, least recently used ones being evicted beyond the cache size"""
+        def scale(df, factor):
+            return df * factor
+
+        for factor in (1, 2, 1):
+            pd.testing.assert_frame_equal(self.memo.call(scale, self.df, factor=factor), self.df * factor)
+        self.assertDictEqual({k: self.memo.cache_info()[k] for k in ("hits", "misses", "size")},
+                             {"hits": 1, "misses": 2, "size": 2})
+
+        entry_size = self.memo.cache_info()["bytes"] // 2
+        small_memo = StatsMemo(self.tmp_dir.name, max_bytes=entry_size * 2)
+        old_time = os.path.getmtime(small_memo._path(small_memo.key(scale, self.df, factor=2))) - 10
+        for name in os.listdir(self.tmp_dir.name):
+            os.utime(os.path.join(self.tmp_dir.name, name), (old_time, old_time))
+        small_memo.call(scale, self.df, factor=1)
+        small_memo.call(scale, self.df, factor=3)
+        self.assertEqual(small_memo.cache_info()["size"], 2)
+        small_memo.call(scale, self.df, factor=1)
+        self.assertDictEqual({k: small_memo.cache_info()[k] for k in ("hits", "misses")}, {"hits": 2, "misses": 1})
+
+        self.assertListEqual(self.memo.call(lambda d: d * 2, [1, 2]), [1, 2, 1, 2])
+        self.assertListEqual(self.memo.call(lambda d: d * 3, [1, 2]), [1, 2, 1, 2, 1, 2])
+
+    def test_get_10most_popular_languages_by_year(self):
+        """Popularity table is filled in place, on cold and warm calls"""
+        stats = {2011: ({"full ranking": pd.Series({"Proficient in Java": 2, "Proficient in Go": 3})},
+                        {"proficiency percentages": pd.Series({"Proficient in Java": 40.0, "Proficient in Go": 60.0})})}
+        for _ in range(2):
+            df = pd.DataFrame()
+            self.memo.get_10most_popular_languages_by_year(df, stats, ["Java", "Go"])
+            self.assertEqual(df.loc[2011, "Go"], 3)
+            self.assertEqual(df.loc[2011, "Java percentage"], 40.0)
+        self.assertEqual(self.memo.cache_info()["hits"], 1)
+
+        def fill_zeros(df, stats_by_year, languages):
+            for year in stats_by_year:
+                df.loc[year, languages] = 0
+
+        # a changed filling function does not get stale results
+        with mock.patch.object(data_memo, "get_10most_popular_languages_by_year", fill_zeros):
+            df = pd.DataFrame()
+            self.memo.get_10most_popular_languages_by_year(df, stats, ["Java", "Go"])
+        self.assertEqual(df.loc[2011, "Go"], 0)
+        self.assertEqual(self.memo.cache_info()["hits"], 1)
@@ -0,0 +1,97 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from preparation.data_load import FALLBACK_ENCODING, load_from_csv, merge_dataframes
+from preparation.data_stats import LanguagesProficienciesPercentages, LanguagesRankingExtractor
+from preparation.data_transform import binarize_columns_range, feature_split
+
+POLARS_AVAILABLE = importlib.util.find_spec("polars") is not None
+
+
+@unittest.skipUnless(POLARS_AVAILABLE, "polars is not installed")
+class TestPolarsBackend(unittest.TestCase):
+    """Test case for the Polars backend: results must be the ones of the pandas backend"""
+
+    def setUp(self) -> None:
+        self.df_input = pd.DataFrame(data={
+            "LanguageWorkedWith": ["Java;Python", np.nan, "C ; Java", "Go"],
+            "PlatformWorkedWith": ["Linux", "Windows", "Linux", "Linux"],
+            "Proficient in C": ["C", np.nan, "C", np.nan],
+            "Proficient in Go": [np.nan, "Go", 3, "Go"],
+            "Age": [20.0, np.nan, 30.0, 40.0],
+        }, index=[10, 11, 12, 13])
+
+    def test_load_from_csv(self):
+        """Polars scan returns the frame of the pandas C parser"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "2011_results.csv")
+            with open(file_path, "w", encoding=FALLBACK_ENCODING) as f:
+                f.write("Respondent,Country,,Country,Empty\n1,Italy,NA,2.5,\n2,,x,,\n3,Côte d'Ivoire,C,1.0,\n")
+            df_c = load_from_csv(file_path, engine="c")
+            transcoded_dir = os.path.join(tmp_dir, "transcoded")
+            os.mkdir(transcoded_dir)
+            with mock.patch.object(tempfile, "tempdir", transcoded_dir):
+                pd.testing.assert_frame_equal(df_c, load_from_csv(file_path, engine="polars"))
+            # non UTF-8 sources are transcoded to a temporary file, removed once data is read
+            self.assertListEqual(os.listdir(transcoded_dir), [])
+            pd.testing.assert_frame_equal(load_from_csv(file_path, engine="c", usecols=["Country", "Respondent"]),
+                                          load_from_csv(file_path, engine="polars", usecols=["Country", "Respondent"]))
+
+    def test_feature_split(self):
+        """Features are split into the same columns"""
+        expected = feature_split(self.df_input, "LanguageWorkedWith", inplace=False)
+        pd.testing.assert_frame_equal(
+            expected, feature_split(self.df_input, "LanguageWorkedWith", inplace=False, backend="polars"))
+
+    def test_binarize_columns_range(self):
+        """Columns are binarized with the same values"""
+        expected = binarize_columns_range(self.df_input, range(2, 4), ["C", "Go"], inplace=False)
+        pd.testing.assert_frame_equal(
+            expected, binarize_columns_range(self.df_input, range(2, 4), ["C", "Go"], inplace=False,
+                                             backend="polars"))
+
+    def test_merge_dataframes(self):
+        """Years are merged on common columns, keeping index values"""
+        expected = merge_dataframes({2019: self.df_input.copy(), 2020: self.df_input.iloc[:, 1:].copy()})
+        merged = merge_dataframes({2019: self.df_input.copy(), 2020: self.df_input.iloc[:, 1:].copy()},
+                                  backend="polars")
+        pd.testing.assert_frame_equal(expected, merged)
+
+    def test_merge_dataframes_shared_categories(self):
+        """Columns encoded against shared categories keep the pandas categories, and codes"""
+        def surveys():
+            return {2019: pd.DataFrame({"Country": ["Italy", "France"], "Age": [30, 40]}),
+                    2020: pd.DataFrame({"Country": ["Spain", "Italy"], "Age": [20, 50]})}
+
+        expected = merge_dataframes(surveys(), categorical_columns=["Country"])
+        merged = merge_dataframes(surveys(), categorical_columns=["Country"], backend="polars")
+        pd.testing.assert_frame_equal(expected, merged)
+        np.testing.assert_array_equal(expected["Country"].cat.codes, merged["Country"].cat.codes)
+
+    def test_ranking_and_shares(self):
+        """Ranking sums and share counts are the same"""
+        df_split = feature_split(self.df_input, "LanguageWorkedWith", inplace=False)
+        lre = LanguagesRankingExtractor(df_split, columns_selection_criteria="LanguageWorkedWith: ")
+        pd.testing.assert_series_equal(lre.compute_language_proficiency_ranking(),
+                                       lre.compute_language_proficiency_ranking(backend="polars"))
+        lpp = LanguagesProficienciesPercentages(lre)
+        languages = ["LanguageWorkedWith: Java", "LanguageWorkedWith: Go"]
+        for unison in (False, True):
+            with self.subTest(unison=unison):
+                self.assertAlmostEqual(lpp.joint_share(languages, unison=unison, platform="Linux"),
+                                       lpp.joint_share(languages, unison=unison, platform="Linux", backend="polars"))
+
+    def test_unknown_backend(self):
+        """Unknown backends are rejected"""
+        with self.assertRaises(ValueError):
+            feature_split(self.df_input, "LanguageWorkedWith", inplace=False, backend="spark")
+
+
+if __name__ == '__main__':
+    unittest.main()
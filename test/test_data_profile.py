@@ -0,0 +1,74 @@
+import os
+import tempfile
+import zipfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from preparation.data_load import FALLBACK_ENCODING
+from preparation.data_profile import diff_profiles, profile_source, profile_surveys
+
+
+class TestDataProfile(TestCase):
+    """TestCase for chunked survey columns profiling and cross-year schema drift"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        languages = ["Java", "Python", "C#", "Go", "Rust", "C"]
+        n = 500
+        self.df_2019 = pd.DataFrame({
+            "Respondent": np.arange(n),
+            "LanguageWorkedWith": [";".join(rng.choice(languages, size=rng.integers(1, 4), replace=False))
+                                   for _ in range(n)],
+            "Employment": rng.choice(["Employed, full-time", "Employed, part-time", "Student"], size=n),
+            "Country": rng.choice(np.array(["Italy", "Côte d'Ivoire", None], dtype=object), size=n),
+            "ConvertedComp": rng.random(n) * 1000,
+            "Empty": np.nan,
+        })
+        self.df_2019.to_csv(os.path.join(self.tmp_dir.name, "2019_results.csv"), index=False,
+                            encoding=FALLBACK_ENCODING)
+        df_2020 = self.df_2019.rename(columns={"LanguageWorkedWith": "LanguageHaveWorkedWith"}).drop(
+            columns=["ConvertedComp"]).assign(YearsCode=rng.integers(0, 30, n))
+        with zipfile.ZipFile(os.path.join(self.tmp_dir.name, "2020_results.zip"), "w") as archive:
+            archive.writestr("survey_results_public.csv", df_2020.to_csv(index=False))
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_profile_source(self):
+        """Columns stats do not depend on chunks size"""
+        file_path = os.path.join(self.tmp_dir.name, "2019_results.csv")
+        profile = profile_source(file_path)
+        pd.testing.assert_frame_equal(profile_source(file_path, chunk_size=64), profile)
+        profile = profile.set_index("column")
+        self.assertListEqual(list(profile["inferred dtype"]), ["integer", "string", "string", "string", "float",
+                                                               "empty"])
+        self.assertListEqual(list(profile["separator"]), [None, ";", None, None, None, None])
+        self.assertAlmostEqual(profile.loc["Country", "null rate"], self.df_2019["Country"].isna().mean())
+        self.assertEqual(profile.loc["Empty", "null rate"], 1.0)
+        self.assertEqual(profile.loc["Respondent", "cardinality"], 500)
+        expected_top = self.df_2019["Employment"].value_counts()
+        self.assertEqual(profile.loc["Employment", "top values"][0], (expected_top.index[0], expected_top.iloc[0]))
+
+    def test_profile_header_only(self):
+        """Columns of a source holding no rows are profiled as empty"""
+        file_path = os.path.join(self.tmp_dir.name, "2021_results.csv")
+        self.df_2019.iloc[:0].to_csv(file_path, index=False)
+        profile = profile_source(file_path)
+        self.assertListEqual(list(profile["column"]), list(self.df_2019.columns))
+        self.assertListEqual(list(profile["inferred dtype"].unique()), ["empty"])
+        self.assertEqual(profile.attrs["rows"], 0)
+
+    def test_profile_surveys_and_diff(self):
+        """Years are profiled by worker processes, and renamed, new and removed columns are reported"""
+        profiles = profile_surveys([2019, 2020], data_path=self.tmp_dir.name, max_workers=2)
+        pd.testing.assert_frame_equal(profiles[2020],
+                                      profile_surveys([2020], data_path=self.tmp_dir.name, max_workers=1)[2020])
+        changes = diff_profiles(profiles).set_index("column")
+        self.assertEqual(changes.loc["LanguageHaveWorkedWith", "change"], "renamed")
+        self.assertEqual(changes.loc["LanguageHaveWorkedWith", "previous column"], "LanguageWorkedWith")
+        self.assertEqual(changes.loc["YearsCode", "change"], "new")
+        self.assertEqual(changes.loc["ConvertedComp", "change"], "removed")
+        self.assertEqual(changes.shape[0], 3)
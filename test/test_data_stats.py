@@ -1,9 +1,17 @@
+from functools import partial
+import tempfile
 from unittest import TestCase
 
 import numpy as np
 import pandas as pd
 
-from preparation.data_stats import map_any_case_to_lower, drop_columns_from_map, LanguagesRankingExtractor
+from preparation.data_stats import (map_any_case_to_lower, drop_columns_from_map, LanguagesRankingExtractor,
+                                    parse_experience_value, build_experience_language_cube,
+                                    LanguagesTransitionExtractor, LanguagesProficienciesPercentages,
+                                    LanguagesStatsSnapshot, compile_columns_rules, LanguagesCommunitiesExtractor,
+                                    align_language_indicators, LanguagesCombinationsExtractor,
+                                    compute_frequent_combinations_by_year, compute_sharded_snapshot, distinct_profiles)
+from preparation.data_transform import feature_split
 
 
 class TestDropColumnsFromLowerCaseMap(TestCase):
@@ -142,3 +150,309 @@ class TestLanguagesRankingExtractor(TestCase):
         # TODO add test
         self.lre.merge_entries(df_proficiencies=self.df_input, entries_merge_list=self.entries_merge_list)
         np.testing.assert_array_equal(self.df_input.columns, self.expected_output_columns_after_merge)
+
+
+class TestColumnsRulesPlan(TestCase):
+    """TestCase for compiled exclusion and merge rules"""
+
+    def setUp(self) -> None:
+        self.df_input = pd.DataFrame(data={
+            "tech: JavaScript": [1, 0, 0, 1],
+            "tech: SQL": [1, 1, 0, 0],
+            "tech: Node.js": [0, 1, 0, 1],
+            "tech: sql": [0, 0, 1, 0],
+            "tech: jQuery": [0, 0, 1, 0],
+            "tech: Go": [1, 0, 0, 0],
+        })
+
+    def test_compiled_rules(self):
+        """Exclusions match any case, merges fill merger misses, unmatched rules are reported"""
+        plan = compile_columns_rules(tuple(self.df_input.columns), ("tech: SQL", "tech: Fortran"),
+                                     (("JavaScript", "Node.js"), ("JavaScript", "jQuery"), ("Go", "Rust")),
+                                     "tech: ")
+        df_output = plan.apply(self.df_input)
+        self.assertListEqual(list(df_output.columns), ["tech: JavaScript", "tech: Go"])
+        self.assertListEqual(list(df_output["tech: JavaScript"]), [1, 1, 1, 1])
+        self.assertDictEqual(plan.get_report(), {"unmatched exclusions": ["tech: Fortran"],
+                                                 "unmatched merges": [("Go", "Rust")]})
+        # input dataframe is left untouched
+        self.assertEqual(self.df_input.shape, (4, 6))
+        self.assertListEqual(list(self.df_input["tech: JavaScript"]), [1, 0, 0, 1])
+
+    def test_inplace_and_copy_plans(self):
+        """Applying a plan in place keeps the columns a copy keeps, duplicated names being told apart by position"""
+        df_input = self.df_input.set_axis(["tech: JavaScript", "tech: SQL", "tech: Node.js", "tech: sql",
+                                           "tech: JavaScript", "tech: Go"], axis=1)
+        plan = compile_columns_rules(tuple(df_input.columns), ("tech: SQL",), (("Go", "Node.js"),), "tech: ")
+        expected = plan.apply(df_input)
+        self.assertListEqual(list(expected.columns), ["tech: JavaScript", "tech: JavaScript", "tech: Go"])
+        self.assertListEqual(list(expected.iloc[:, 1]), [0, 0, 1, 0])
+        df_output = df_input.copy()
+        self.assertIsNone(plan.apply(df_output, inplace=True))
+        pd.testing.assert_frame_equal(df_output, expected)
+
+    def test_extractor_rules_report(self):
+        """Extractor ranking relies on the compiled rules, and exposes their report"""
+        lre = LanguagesRankingExtractor(self.df_input, exclusion_list=["TECH: SQL"], prefix_to_remove="tech: ",
+                                        entries_merge_list=[("JavaScript", "Node.js")])
+        ranking = lre.compute_language_proficiency_ranking()
+        self.assertDictEqual(ranking.to_dict(), {"tech: JavaScript": 3, "tech: jQuery": 1, "tech: Go": 1})
+        self.assertDictEqual(lre.get_rules_report(), {"unmatched exclusions": [], "unmatched merges": []})
+
+
+class TestExperienceLanguageCube(TestCase):
+    """TestCase for experience parsing and experience x language cube"""
+
+    def setUp(self) -> None:
+        self.surveys = {
+            2017: pd.DataFrame(data={
+                "YearsProgram": ["Less than a year", "6 to 7 years", "20 or more years", np.nan],
+                "HaveWorkedLanguage: Python": [1, 0, 1, 1],
+                "HaveWorkedLanguage: Java": [0, 1, 1, 0],
+            }),
+            2020: pd.DataFrame(data={
+                "YearsCode": ["Less than 1 year", "7", "More than 50 years"],
+                "LanguageWorkedWith: Python": [1, 1, 0],
+                "LanguageWorkedWith: Go": [0, 1, 0],
+            }),
+        }
+
+    def test_parse_experience_value(self):
+        """Answers from different years are parsed into years of experience"""
+        expected = {"Less than 1 year": 0.5, "Less than a year": 0.5, "<2": 1, "2-5": 3.5, "2 - 5 years": 3.5,
+                    "6 to 7 years": 6.5, "11+": 11, "20 or more years": 20, "More than 50 years": 50, "7": 7}
+        for answer, years in expected.items():
+            with self.subTest(answer=answer):
+                self.assertEqual(parse_experience_value(answer), years)
+        self.assertTrue(np.isnan(parse_experience_value("I don't know")))
+
+    def test_build_experience_language_cube(self):
+        """Cube counts respondents by year, experience bucket and language"""
+        cube = build_experience_language_cube(
+            self.surveys, experience_columns={2017: "YearsProgram", 2020: "YearsCode"},
+            columns_selection_criteria={2017: "HaveWorkedLanguage", 2020: "LanguageWorkedWith"},
+            prefix_to_remove={2017: "HaveWorkedLanguage: ", 2020: "LanguageWorkedWith: "})
+        counts = cube["counts"]
+        self.assertListEqual(sorted(counts.columns), ["Go", "Java", "Python"])
+        self.assertEqual(counts.loc[(2017, "<1"), "Python"], 1)
+        self.assertEqual(counts.loc[(2017, "20-30"), "Java"], 1)
+        self.assertEqual(counts.loc[(2020, "5-10"), "Go"], 1)
+        self.assertEqual(counts.loc[(2020, "30+"), "Python"], 0)
+        # missing experience answer is left out
+        self.assertEqual(cube["respondents"].loc[2017].sum(), 3)
+
+
+class TestLanguagesTransitionExtractor(TestCase):
+    """TestCase for worked with -> want to work with transitions"""
+
+    def setUp(self) -> None:
+        self.df_input = pd.DataFrame(data={
+            "LanguageHaveWorkedWith": ["Java;Python", "Java", "Python", np.nan],
+            "LanguageWantToWorkWith": ["Python;Go", "Java;Go", "Python", "Go"],
+        })
+        self.lte = LanguagesTransitionExtractor(self.df_input)
+
+    def test_compute_transition_counts(self):
+        """Counts are computed for every couple of languages"""
+        counts = self.lte.compute_transition_counts()
+        self.assertEqual(counts.loc["Java", "Go"], 2)
+        self.assertEqual(counts.loc["Python", "Python"], 2)
+        self.assertEqual(counts.loc["Go", "Java"], 0)
+
+    def test_compute_transition_matrix(self):
+        """Row normalization refers to respondents that have worked with the row language"""
+        matrix = self.lte.compute_transition_matrix()
+        self.assertEqual(matrix.loc["Java", "Python"], 50)
+        self.assertEqual(self.lte.compute_transition_matrix(normalize="overall").loc["Java", "Go"], 50)
+
+    def test_compute_retention(self):
+        """Retention is the diagonal share of each language"""
+        retention = self.lte.compute_retention()
+        self.assertEqual(retention["Python"], 100)
+        self.assertEqual(retention["Java"], 50)
+        self.assertNotIn("Go", retention.index)
+
+
+class TestLanguagesStatsSnapshot(TestCase):
+    """TestCase for stats-only persistence of extractors"""
+
+    def setUp(self) -> None:
+        self.df_input = pd.DataFrame(data={
+            "PlatformWorkedWith": ["Android", "Android", "Linux", "Windows"],
+            "LanguageWorkedWith: Java": [1, 1, 0, 1],
+            "LanguageWorkedWith: Kotlin": [1, 0, 0, 0],
+            "LanguageWorkedWith: Python": [0, 1, 1, 1],
+        })
+        self.lre = LanguagesRankingExtractor(self.df_input, columns_selection_criteria="LanguageWorkedWith",
+                                             prefix_to_remove="LanguageWorkedWith: ")
+        self.lpp = LanguagesProficienciesPercentages(self.lre)
+
+    def test_export_load_stats(self):
+        """Reloaded snapshot gives the same percentages and shares as the extractor"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.lpp.export_stats(tmp_dir, platform_key="PlatformWorkedWith")
+            snapshot = LanguagesStatsSnapshot.load(tmp_dir)
+            pd.testing.assert_series_equal(snapshot.get_percentages(), self.lpp.get_percentages())
+            pd.testing.assert_series_equal(snapshot.get_top_ten_percentages(), self.lpp.get_top_ten_percentages())
+            for language_1, language_2 in [("LanguageWorkedWith: Java", "LanguageWorkedWith: Python"),
+                                           ("LanguageWorkedWith: Python", "LanguageWorkedWith: Kotlin")]:
+                self.assertAlmostEqual(snapshot.intersection_percentage(language_1, language_2),
+                                       self.lpp.intersection_percentage(language_1, language_2))
+                self.assertAlmostEqual(snapshot.difference_percentage(language_1, language_2),
+                                       self.lpp.difference_percentage(language_1, language_2))
+            self.assertEqual(snapshot.platform_shares("Android")["LanguageWorkedWith: Java"], 2)
+            self.assertEqual(snapshot.get_stats()["number respondents"], 4)
+            self.assertEqual(self.lpp.get_stats()["number respondents"], 4)
+
+    def test_combine_shards(self):
+        """Shards snapshots, holding different languages and platforms, combine into the whole data snapshot"""
+        expected = LanguagesStatsSnapshot.from_extractor(self.lre, platform_key="PlatformWorkedWith")
+        shards = [self.df_input.iloc[:1].drop(columns="LanguageWorkedWith: Python"),
+                  self.df_input.iloc[1:3].drop(columns="LanguageWorkedWith: Kotlin"), self.df_input.iloc[3:]]
+        snapshots = [LanguagesStatsSnapshot.from_extractor(
+            LanguagesRankingExtractor(shard, columns_selection_criteria="LanguageWorkedWith",
+                                      prefix_to_remove="LanguageWorkedWith: "), platform_key="PlatformWorkedWith")
+            for shard in shards]
+        left = snapshots[0].combine(snapshots[1]).combine(snapshots[2])
+        right = snapshots[0].combine(snapshots[1].combine(snapshots[2]))
+        for combined in (left, right, LanguagesStatsSnapshot.from_dict(left.to_dict())):
+            self.assertEqual(combined.to_dict(), expected.to_dict())
+        with self.assertRaises(ValueError):
+            left.get_arrays()["counts"][0] = 0
+        with self.assertRaises(ValueError):
+            snapshots[0].combine(LanguagesStatsSnapshot(["Java"], np.ones(1), 1, np.ones((1, 1), dtype=np.int64)))
+        with self.assertRaises(ValueError):
+            LanguagesStatsSnapshot.combine_all([])
+
+    def test_compute_sharded_snapshot(self):
+        """Shards computed by worker processes give the stats of a single extractor"""
+        rng = np.random.default_rng(0)
+        languages = np.array(["Java", "Python", "Go", "Rust", "C"])
+        df_raw = pd.DataFrame({
+            "LanguageWorkedWith": [";".join(rng.choice(languages, size=rng.integers(1, 4), replace=False))
+                                   for _ in range(300)],
+            "PlatformWorkedWith": rng.choice(["Linux", "Windows", "macOS"], size=300)})
+        transform = partial(feature_split, column_to_split="LanguageWorkedWith", inplace=False)
+        lre = LanguagesRankingExtractor(transform(df_raw), columns_selection_criteria="LanguageWorkedWith: ")
+        expected = LanguagesStatsSnapshot.from_extractor(lre, platform_key="PlatformWorkedWith")
+        for max_workers in (1, 2):
+            with self.subTest(max_workers=max_workers):
+                shards = (df_raw.iloc[start:start + 70] for start in range(0, 300, 70))
+                snapshot = compute_sharded_snapshot(shards, columns_selection_criteria="LanguageWorkedWith: ",
+                                                    platform_key="PlatformWorkedWith", transform=transform,
+                                                    max_workers=max_workers)
+                self.assertEqual(snapshot.get_number_respondents(), 300)
+                pd.testing.assert_series_equal(snapshot.get_percentages().sort_index(),
+                                               expected.get_percentages().sort_index())
+                pd.testing.assert_series_equal(snapshot.platform_shares("Linux").sort_index(),
+                                               expected.platform_shares("Linux").sort_index())
+                self.assertAlmostEqual(
+                    snapshot.intersection_percentage("LanguageWorkedWith: Go", "LanguageWorkedWith: Rust"),
+                    expected.intersection_percentage("LanguageWorkedWith: Go", "LanguageWorkedWith: Rust"))
+
+
+
+class TestLanguagesCommunitiesExtractor(TestCase):
+    """TestCase for MinHash LSH respondents communities"""
+
+    def setUp(self) -> None:
+        web = [[1, 1, 1, 0, 0, 0], [1, 1, 0, 0, 0, 0], [1, 1, 1, 0, 0, 0], [0, 1, 1, 0, 0, 0]]
+        systems = [[0, 0, 0, 1, 1, 1], [0, 0, 0, 1, 1, 1], [0, 0, 0, 1, 1, 0]]
+        self.df_input = pd.DataFrame(data=web + systems + [[0, 0, 0, 0, 0, 0]],
+                                     columns=["L: JavaScript", "L: TypeScript", "L: PHP", "L: C", "L: C++", "L: Rust"],
+                                     index=[f"r{i}" for i in range(8)])
+
+    def test_compute_clusters(self):
+        """Respondents with similar stacks share a community, respondents using no language get none"""
+        clusters = LanguagesCommunitiesExtractor(self.df_input, prefix_to_remove="L: ").compute_clusters()
+        self.assertListEqual(list(clusters), [0, 0, 0, 0, 1, 1, 1, -1])
+
+    def test_reproducible(self):
+        """Same seed, same signatures, made of the minimum ranks of profiles languages"""
+        signatures_1 = LanguagesCommunitiesExtractor(self.df_input, seed=7).compute_signatures()
+        signatures_2 = LanguagesCommunitiesExtractor(self.df_input, seed=7).compute_signatures()
+        np.testing.assert_array_equal(signatures_1, signatures_2)
+        profiles, _ = distinct_profiles(self.df_input.to_numpy() > 0)
+        ranks_upper_bound = np.full(signatures_1.shape[1], 6)
+        for profile, signature in zip(profiles, signatures_1):
+            if profile.any():
+                # a superset profile gets lower or equal minimum ranks
+                for other_profile, other_signature in zip(profiles, signatures_1):
+                    if (other_profile >= profile).all():
+                        self.assertTrue((other_signature <= signature).all())
+                self.assertTrue((signature < ranks_upper_bound).all())
+            else:
+                np.testing.assert_array_equal(signature, ranks_upper_bound)
+
+    def test_describe_clusters(self):
+        """Communities are described by size and languages percentages"""
+        description = LanguagesCommunitiesExtractor(self.df_input, prefix_to_remove="L: ").describe_clusters()
+        self.assertListEqual(list(description["size"]), [4, 3])
+        self.assertEqual(description.loc[0, "TypeScript"], 100)
+        self.assertEqual(description.loc[1, "JavaScript"], 0)
+
+    def test_nearest_neighbours(self):
+        """Neighbours are ranked by Jaccard similarity, respondent excluded"""
+        neighbours = LanguagesCommunitiesExtractor(self.df_input).nearest_neighbours("r0", k=2)
+        self.assertListEqual(list(neighbours.index), ["r2", "r1"])
+        self.assertListEqual(list(neighbours.round(3)), [1.0, 0.667])
+        with self.assertRaises(ValueError):
+            LanguagesCommunitiesExtractor(self.df_input.set_axis(["r0"] * 8)).nearest_neighbours("r0")
+
+    def test_align_language_indicators(self):
+        """Years are stacked on the union of their languages"""
+        aligned = align_language_indicators(
+            {2019: pd.DataFrame({"A: Go": [1, 0]}), 2020: pd.DataFrame({"B: Go": [0, 1], "B: Rust": [1, 0]})},
+            prefix_to_remove={2019: "A: ", 2020: "B: "})
+        self.assertListEqual(list(aligned.columns), ["Go", "Rust"])
+        self.assertListEqual(aligned.loc[2019, "Rust"].tolist(), [0, 0])
+        self.assertEqual(aligned.shape, (4, 2))
+
+
+class TestLanguagesCombinationsExtractor(TestCase):
+    """TestCase for frequent languages combinations and association rules"""
+
+    def setUp(self) -> None:
+        self.df_input = pd.DataFrame(data={
+            "L: Python": [1, 1, 1, 1, 0, 1, 0, 0],
+            "L: Go": [1, 1, 0, 1, 0, 0, 0, 0],
+            "L: TypeScript": [1, 1, 0, 0, 1, 0, 1, 0],
+            "L: Rust": [0, 0, 0, 0, 0, 0, 0, 1],
+        })
+
+    def test_compute_frequent_combinations(self):
+        """Combinations supports are the percentages of respondents using all their languages"""
+        lce = LanguagesCombinationsExtractor(self.df_input, prefix_to_remove="L: ", min_support=25)
+        combinations = lce.compute_frequent_combinations()
+        counts = dict(zip(combinations["combination"], combinations["count"]))
+        supports = dict(zip(combinations["combination"], combinations["support"]))
+        self.assertSetEqual(set(counts),
+                            {("Python",), ("Go",), ("TypeScript",), ("Python", "Go"), ("Python", "TypeScript"),
+                             ("Go", "TypeScript"), ("Python", "Go", "TypeScript")})
+        self.assertEqual(counts[("Python", "Go")], 3)
+        self.assertEqual(supports[("Python", "Go", "TypeScript")], 25)
+        # supports match brute force counts
+        for combination, count in counts.items():
+            columns = [f"L: {lang}" for lang in combination]
+            self.assertEqual(count, (self.df_input[columns] != 0).all(axis=1).sum())
+
+    def test_max_length(self):
+        """Combinations are not longer than max_length"""
+        lce = LanguagesCombinationsExtractor(self.df_input, prefix_to_remove="L: ", min_support=25, max_length=2)
+        self.assertEqual(lce.compute_frequent_combinations()["length"].max(), 2)
+
+    def test_compute_association_rules(self):
+        """Rules confidence and lift are derived from combinations supports"""
+        lce = LanguagesCombinationsExtractor(self.df_input, prefix_to_remove="L: ", min_support=25)
+        rules = lce.compute_association_rules(min_confidence=100)
+        rule = next(r for r in rules.itertuples() if r.antecedent == ("Go",) and r.consequent == ("Python",))
+        self.assertEqual(rule.confidence, 100)
+        self.assertAlmostEqual(rule.lift, 100 / 62.5)
+        self.assertTrue((rules["confidence"] >= 100).all())
+
+    def test_compute_frequent_combinations_by_year(self):
+        """Each year gets its combinations and rules"""
+        stats = compute_frequent_combinations_by_year({2022: self.df_input}, prefix_to_remove="L: ", min_support=50)
+        self.assertListEqual(list(stats[2022]["frequent combinations"]["combination"]),
+                             [("Python",), ("TypeScript",)])
+        self.assertTrue(stats[2022]["association rules"].empty)
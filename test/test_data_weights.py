@@ -0,0 +1,125 @@
+import warnings
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from preparation.data_stats import (LanguagesRankingExtractor, LanguagesProficienciesPercentages,
+                                    LanguagesStatsSnapshot)
+from preparation.data_weights import compute_marginals, rake
+
+
+class TestRake(TestCase):
+    """TestCase for respondents weights fitting by raking"""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        n = 2000
+        self.df = pd.DataFrame({
+            "Country": rng.choice(["Italy", "India", "United States"], size=n, p=[0.6, 0.1, 0.3]),
+            "Employment": rng.choice(["Full-time", "Student"], size=n, p=[0.3, 0.7]),
+        }, index=np.arange(n) + 100)
+        self.df.loc[self.df.index[:50], "Employment"] = np.nan
+        self.targets = {"Country": {"Italy": 20, "India": 50, "United States": 30},
+                        "Employment": pd.Series({"Full-time": 0.7, "Student": 0.3})}
+
+    def test_marginals_match_targets(self):
+        """Weighted marginals match (normalized) target marginals"""
+        weights = rake(self.df, self.targets)
+        self.assertTrue(weights.index.equals(self.df.index))
+        self.assertAlmostEqual(weights.mean(), 1.0)
+        marginals = compute_marginals(self.df, ["Country", "Employment"], weights)
+        np.testing.assert_allclose(marginals["Country"][["Italy", "India", "United States"]], [0.2, 0.5, 0.3],
+                                   atol=1e-5)
+        np.testing.assert_allclose(marginals["Employment"][["Full-time", "Student"]], [0.7, 0.3], atol=1e-5)
+
+    def test_missing_and_unreachable_categories(self):
+        """Respondents with missing values keep their weight ratio, unreachable categories are dropped"""
+        weights = rake(self.df, {"Employment": {"Full-time": 1, "Student": 1, "Retired": 2}})
+        marginals = compute_marginals(self.df, ["Employment"], weights)
+        np.testing.assert_allclose(marginals["Employment"][["Full-time", "Student"]], [0.5, 0.5])
+        self.assertEqual(weights[self.df["Employment"].isna()].nunique(), 1)
+
+    def test_weight_bounds(self):
+        """Weights are trimmed to bounds, relative to the mean weight"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            weights = rake(self.df, self.targets, weight_bounds=(0.5, 2.0), max_iter=20)
+        ratio = weights.max() / weights.min()
+        self.assertLessEqual(ratio, 4.0 + 1e-9)
+
+    def test_not_converged(self):
+        """A warning is raised when raking does not converge"""
+        with self.assertWarns(RuntimeWarning):
+            rake(self.df, self.targets, max_iter=1, tol=1e-12)
+
+    def test_large_population(self):
+        """A million respondents are fitted on three margins"""
+        rng = np.random.default_rng(1)
+        n = 1_000_000
+        df = pd.DataFrame({"Country": rng.integers(0, 150, n), "YearsCode": rng.integers(0, 50, n),
+                           "Employment": rng.integers(0, 8, n)})
+        targets = {column: pd.Series(rng.random(df[column].max() + 1) + 0.1) for column in df.columns}
+        weights = rake(df, targets)
+        marginals = compute_marginals(df, ["Country"], weights)
+        expected = targets["Country"] / targets["Country"].sum()
+        np.testing.assert_allclose(marginals["Country"].sort_index(), expected, atol=1e-5)
+
+
+class TestWeightedLanguagesStats(TestCase):
+    """TestCase for weighted rankings, percentages and shares"""
+
+    def setUp(self) -> None:
+        self.df = pd.DataFrame({
+            "LanguageWorkedWith: Java": [1, 0, 1, 1],
+            "LanguageWorkedWith: Python": [1, 1, 0, 0],
+            "LanguageWorkedWith: Go": [0, 1, 0, 1],
+            "PlatformWorkedWith": ["Linux", "Windows", "Linux", "Linux"],
+        }, index=[10, 11, 12, 13])
+        # a series is aligned on source data index
+        self.weights = pd.Series([1.0, 3.0, 0.5, 0.5], index=[10, 11, 12, 13]).iloc[::-1]
+        self.lre = LanguagesRankingExtractor(self.df, columns_selection_criteria="LanguageWorkedWith: ",
+                                             weights=self.weights)
+        self.lpp = LanguagesProficienciesPercentages(self.lre)
+
+    def test_ranking_and_percentages(self):
+        """Rankings sum weights, percentages are relative to the total weight"""
+        ranking = self.lre.compute_language_proficiency_ranking()
+        self.assertEqual(list(ranking.index), ["LanguageWorkedWith: Python", "LanguageWorkedWith: Go",
+                                               "LanguageWorkedWith: Java"])
+        np.testing.assert_allclose(ranking, [4.0, 3.5, 2.0])
+        np.testing.assert_allclose(self.lpp.get_percentages(), [80.0, 70.0, 40.0])
+
+    def test_shares(self):
+        """Shares are weighted, and unit weights give unweighted shares"""
+        self.assertAlmostEqual(self.lpp.joint_share(["LanguageWorkedWith: Java", "LanguageWorkedWith: Go"],
+                                                    unison=True, platform="Linux"), 0.5 / 2 * 100)
+        self.assertAlmostEqual(self.lpp.exclusive_share("LanguageWorkedWith: Python", ["LanguageWorkedWith: Java"]),
+                               60.0)
+        self.assertAlmostEqual(self.lpp.intersection_percentage("LanguageWorkedWith: Java",
+                                                                "LanguageWorkedWith: Python"), 50.0)
+        self.assertAlmostEqual(self.lpp.difference_percentage("LanguageWorkedWith: Python",
+                                                              "LanguageWorkedWith: Java"), 75.0)
+        self.assertEqual(list(self.lpp.platform_shares("Linux")), [2.0, 1.0, 0.5])
+
+        unweighted = LanguagesProficienciesPercentages(
+            LanguagesRankingExtractor(self.df, columns_selection_criteria="LanguageWorkedWith: "))
+        unit = LanguagesProficienciesPercentages(
+            LanguagesRankingExtractor(self.df, columns_selection_criteria="LanguageWorkedWith: ",
+                                      weights=np.ones(4)))
+        pd.testing.assert_series_equal(unweighted.get_percentages(), unit.get_percentages(), check_dtype=False)
+        self.assertAlmostEqual(unweighted.joint_share(["LanguageWorkedWith: Go"], platform="Linux"),
+                               unit.joint_share(["LanguageWorkedWith: Go"], platform="Linux"))
+
+    def test_missing_weights(self):
+        """Weights missing some respondents are rejected"""
+        with self.assertRaises(ValueError):
+            LanguagesRankingExtractor(self.df, columns_selection_criteria="LanguageWorkedWith: ",
+                                      weights=self.weights.iloc[1:])
+        with self.assertRaises(ValueError):
+            LanguagesRankingExtractor(self.df, columns_selection_criteria="LanguageWorkedWith: ", weights=np.ones(3))
+
+    def test_snapshot_rejects_weights(self):
+        """Snapshots hold counts, weighted extractors are rejected"""
+        with self.assertRaises(ValueError):
+            LanguagesStatsSnapshot.from_extractor(self.lre)
@@ -4,7 +4,8 @@ from typing import List
 import numpy as np
 import pandas as pd
 
-from preparation.data_transform import feature_split
+from preparation.data_transform import (binarize_column, df_2015_survey_preprocessing, feature_split,
+                                        feature_split_batch, feature_split_sparse)
 
 
 class TestFeatureSplit(unittest.TestCase):
@@ -51,5 +52,86 @@ class TestFeatureSplit(unittest.TestCase):
         # self.assertTrue(self.expected_binarized_features, binarized_features)
 
 
+class TestFeatureSplitSparse(unittest.TestCase):
+    """Sparse feature split test case
+    """
+
+    def setUp(self) -> None:
+        self.results_mockup = pd.DataFrame(
+            data={'worked': ["java;python", np.nan, "c;java"], 'wanted': ["go;python;go", "java", np.nan]})
+
+    def test_feature_split_sparse_aligned(self):
+        """test that matrices share the same vocabulary
+        """
+        indicators, vocabulary = feature_split_sparse(self.results_mockup, ['worked', 'wanted'])
+        self.assertListEqual(vocabulary, ["java", "python", "c", "go"])
+        np.testing.assert_array_equal(indicators['worked'].toarray(), [[1, 1, 0, 0], [0, 0, 0, 0], [1, 0, 1, 0]])
+        np.testing.assert_array_equal(indicators['wanted'].toarray(), [[0, 1, 0, 1], [1, 0, 0, 0], [0, 0, 0, 0]])
+
+
+class TestFeatureSplitBatch(unittest.TestCase):
+    """Batch feature split test case
+    """
+
+    def setUp(self) -> None:
+        self.results_mockup = pd.DataFrame(
+            data={'worked': ["java;python", np.nan, "c ;java", 3], 'age': [20.0, np.nan, 40.0, 30.0],
+                  'wanted': ["go;python;go", "java", np.nan, "c"], 'wanted: c': [np.nan, 1.0, np.nan, np.nan]},
+            index=[10, 11, 12, 13])
+
+    def test_feature_split_batch_as_feature_split(self):
+        """test that results are the ones of feature_split, called on each column
+        """
+        expected = feature_split(self.results_mockup, 'worked', inplace=False)
+        feature_split(expected, 'wanted', inplace=True)
+
+        df_out, blocks = feature_split_batch(self.results_mockup, ['worked', 'wanted'], inplace=False)
+        pd.testing.assert_frame_equal(df_out, expected)
+        self.assertDictEqual(blocks, {'worked': ["worked: java", "worked: python", "worked: c"],
+                                      'wanted': ["wanted: go", "wanted: python", "wanted: java", "wanted: c"]})
+        self.assertListEqual(list(self.results_mockup.columns), ['worked', 'age', 'wanted', 'wanted: c'])
+
+        df_none, inplace_blocks = feature_split_batch(self.results_mockup, ['worked', 'wanted'])
+        self.assertIsNone(df_none)
+        self.assertDictEqual(inplace_blocks, blocks)
+        pd.testing.assert_frame_equal(self.results_mockup, expected)
+
+
+class TestShallowCopyTransforms(unittest.TestCase):
+    """Copy avoiding (deep_copy=False) transforms test case
+    """
+
+    def setUp(self) -> None:
+        self.results_mockup = pd.DataFrame(
+            data={'tech_do': ["java;python", np.nan, "c;java"], 'tech_do: c': [np.nan, 1.0, np.nan],
+                  'age': [20.0, np.nan, 40.0], 'lang': ["python", "java", np.nan]})
+        self.original = self.results_mockup.copy(deep=True)
+
+    def test_feature_split_shallow_copy(self):
+        """test that a shallow copy split matches a deep copy split, leaving input dataframe untouched
+        """
+        deep_split = feature_split(self.results_mockup, 'tech_do', inplace=False)
+        shallow_split = feature_split(self.results_mockup, 'tech_do', inplace=False, deep_copy=False)
+        pd.testing.assert_frame_equal(deep_split, shallow_split)
+        pd.testing.assert_frame_equal(self.original, self.results_mockup)
+
+    def test_binarize_column_shallow_copy(self):
+        """test that a shallow copy binarization shares untouched columns, leaving input dataframe untouched
+        """
+        binarized = binarize_column(self.results_mockup, 'lang', 'python', inplace=False, deep_copy=False)
+        self.assertListEqual(list(binarized['lang']), [1, 0, 0])
+        self.assertTrue(np.shares_memory(binarized['age'].to_numpy(), self.results_mockup['age'].to_numpy()))
+        pd.testing.assert_frame_equal(self.original, self.results_mockup)
+
+    def test_2015_preprocessing_copy(self):
+        """test that 2015 preprocessing output is a deep copy, unless a shallow copy is asked for
+        """
+        survey = pd.DataFrame(data={'Java': ["Java", np.nan, "Java"], 'age': [20.0, 30.0, 40.0]})
+        preprocessed = df_2015_survey_preprocessing(survey, [0])
+        self.assertFalse(np.shares_memory(preprocessed['age'].to_numpy(), survey['age'].to_numpy()))
+        preprocessed = df_2015_survey_preprocessing(survey, [0], deep_copy=False)
+        self.assertTrue(np.shares_memory(preprocessed['age'].to_numpy(), survey['age'].to_numpy()))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+import unittest
+
+import preparation
+
+# heavy dependencies that importing the preparation package must not load
+HEAVY_MODULES = ("pandas", "numpy", "scipy", "polars", "matplotlib")
+
+
+class TestLazyImport(unittest.TestCase):
+    """Test case for lazy loading of preparation submodules"""
+
+    def _run(self, code: str) -> str:
+        return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+    def test_import_does_not_load_submodules(self):
+        """Importing the package loads neither submodules nor heavy dependencies"""
+        output = self._run(f"import sys, preparation; print(*sorted(name for name in sys.modules "
+                           f"if name.startswith('preparation.') or name.split('.')[0] in {HEAVY_MODULES!r}))")
+        self.assertEqual(output.split(), [])
+
+    def test_public_names(self):
+        """Every public name is resolved from its defining submodule"""
+        for name in preparation.__all__:
+            with self.subTest(name=name):
+                self.assertTrue(hasattr(preparation, name))
+        from preparation.data_stats import LanguagesRankingExtractor
+        self.assertIs(preparation.LanguagesRankingExtractor, LanguagesRankingExtractor)
+
+    def test_unknown_name(self):
+        """Unknown names raise AttributeError"""
+        with self.assertRaises(AttributeError):
+            getattr(preparation, "not_a_function")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from preparation.plotting import render_top_ten_plots
+
+
+class TestRenderTopTenPlots(unittest.TestCase):
+    """Test case for batch rendering of yearly ranking plots"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.palette = {"Java": "brown", "Python": "green", "C": "yellow"}
+        self.percentages = {
+            2011: pd.Series(data=[40.5, 30.25], index=["Java", "C"]),
+            2012: pd.Series(data=[45.0, 20.0], index=["Python", "Java"]),
+        }
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_render_top_ten_plots(self):
+        """Plots are rendered once, then only when their data change"""
+        rendered = render_top_ten_plots(self.percentages, self.palette, plots_path=self.tmp_dir.name, max_workers=2)
+        self.assertListEqual(rendered, [2011, 2012])
+        self.assertTrue(os.path.isfile(os.path.join(self.tmp_dir.name, "Q1_2011.png")))
+
+        self.assertListEqual(render_top_ten_plots(self.percentages, self.palette, plots_path=self.tmp_dir.name), [])
+
+        self.percentages[2012] = pd.Series(data=[46.0, 20.0], index=["Python", "Java"])
+        rendered = render_top_ten_plots(self.percentages, self.palette, plots_path=self.tmp_dir.name)
+        self.assertListEqual(rendered, [2012])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from preparation.data_stats import LanguagesRankingExtractor, LanguagesProficienciesPercentages
+from preparation.query_service import LRUCache, SurveyStatsQueryService
+
+
+def _load_stats() -> dict:
+    df = pd.DataFrame(data={
+        "PlatformWorkedWith": ["Android", "Android", "Linux", "Windows"],
+        "Java": [1, 1, 0, 1],
+        "Kotlin": [1, 0, 0, 0],
+        "Python": [0, 1, 1, 1],
+    })
+    lre = LanguagesRankingExtractor(df, columns_selection_criteria=range(1, 4))
+    return {2019: LanguagesProficienciesPercentages(lre)}
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test case for bounded LRU cache"""
+
+    def test_eviction(self):
+        """Least recently used entries are evicted first"""
+        cache = LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(len(cache), 2)
+
+
+class TestSurveyStatsQueryService(unittest.TestCase):
+    """Test case for local HTTP query service"""
+
+    def setUp(self) -> None:
+        self.loads = 0
+
+        def loader():
+            self.loads += 1
+            return _load_stats()
+
+        self.service = SurveyStatsQueryService(loader, cache_size=8)
+
+    async def _get(self, port: int, target: str, method: str = "GET") -> tuple:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, body = response.split(b"\r\n\r\n", 1)
+        return int(head.split()[1]), json.loads(body)
+
+    async def _run_queries(self) -> list:
+        server = await self.service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.gather(
+                self._get(port, "/percentages?year=2019&top=2"),
+                self._get(port, "/share?year=2019&languages=Kotlin,Python&platform=Android"),
+                self._get(port, "/percentages?year=2019&top=2"),
+                self._get(port, "/ranking?year=2020"),
+                self._get(port, "/refresh", method="POST"),
+                self._get(port, "/refresh"),
+                self._get(port, "/percentages?year=2019&top=abc"),
+                self._get(port, "/unknown"),
+            )
+
+    def test_queries(self):
+        """Queries are answered as JSON, from one loaded process"""
+        responses = asyncio.run(self._run_queries())
+        self.assertEqual(responses[0], (200, {"Java": 75.0, "Python": 75.0}))
+        self.assertEqual(responses[1], (200, 100.0))
+        self.assertEqual(responses[2], responses[0])
+        self.assertEqual(responses[3][0], 404)
+        self.assertEqual(responses[5][0], 405)
+        self.assertEqual(responses[6][0], 400)
+        self.assertEqual(responses[7][0], 404)
+        self.assertEqual(self.loads, 2)
+
+    def test_non_finite_values(self):
+        """NaN values are answered as null, NaN not being valid JSON"""
+        year_stats = mock.Mock(get_percentages=lambda: pd.Series({"Java": 50.0, "Go": float("nan")}))
+        service = SurveyStatsQueryService(lambda: {2019: year_stats})
+        result = service.query("/percentages", {"year": "2019"})
+        self.assertEqual(result, {"Java": 50.0, "Go": None})
+        json.dumps(result, allow_nan=False)
+
+    def test_cache_refresh(self):
+        """Repeated queries hit the cache, refresh empties it"""
+        self.service.query("/percentages", {"year": "2019"})
+        self.service.query("/percentages", {"year": "2019"})
+        self.assertEqual(self.service.cache_info()["hits"], 1)
+        self.service.query("/refresh", {})
+        self.assertEqual(self.service.cache_info()["size"], 0)
+
+    def test_refresh_during_query(self):
+        """Results computed from stats refreshed meanwhile are not cached"""
+        compute = SurveyStatsQueryService._compute
+
+        def compute_and_refresh(stats, endpoint, params):
+            self.service.refresh()
+            return compute(stats, endpoint, params)
+
+        self.service.query("/years", {})
+        with mock.patch.object(SurveyStatsQueryService, "_compute", side_effect=compute_and_refresh):
+            self.service.query("/percentages", {"year": "2019"})
+        self.assertEqual(self.service.cache_info()["size"], 0)
+
+    def test_concurrent_first_queries(self):
+        """Concurrent first queries load survey stats once"""
+        threads = [threading.Thread(target=self.service.query, args=("/years", {})) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.loads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from preparation.data_load import merge_dataframes
+from preparation.data_transform import build_shared_categories, encode_shared_categories
+
+
+class TestSharedCategories(unittest.TestCase):
+    """Test case for cross-year shared categorical vocabularies"""
+
+    def setUp(self) -> None:
+        self.surveys = {
+            2019: pd.DataFrame(data={"Country": ["Italy", "France", np.nan], "Age": [30, 40, 50]}),
+            2020: pd.DataFrame(data={"Country": ["Spain", "Italy"], "Age": [20, 25]}),
+        }
+        self.expected_categories = ["France", "Italy", "Spain"]
+
+    def test_build_shared_categories(self):
+        """Categories are the sorted union of values over the years"""
+        shared_categories = build_shared_categories(self.surveys, ["Country"])
+        self.assertListEqual(list(shared_categories["Country"].categories), self.expected_categories)
+
+    def test_encode_shared_categories_aliases(self):
+        """Aliased columns are encoded and renamed after their semantic name"""
+        surveys = {2011: pd.DataFrame(data={"What Country do you live in?": ["Italy", "Spain"]}),
+                   2020: self.surveys[2020]}
+        columns = {"Country": ["What Country do you live in?", "Country"]}
+        shared_categories = build_shared_categories(surveys, columns)
+        df_out = encode_shared_categories(surveys[2011], shared_categories, columns)
+        self.assertListEqual(list(df_out.columns), ["Country"])
+        np.testing.assert_array_equal(df_out["Country"].cat.codes.values, [0, 1])
+        # input dataframe is left untouched
+        self.assertEqual(surveys[2011]["What Country do you live in?"].dtype, object)
+
+    def test_merge_dataframes_categorical_columns(self):
+        """Merged frame holds consistent codes for every year"""
+        merged_df = merge_dataframes(self.surveys, categorical_columns=["Country"])
+        self.assertIsInstance(merged_df["Country"].dtype, pd.CategoricalDtype)
+        self.assertListEqual(list(merged_df["Country"].cat.categories), self.expected_categories)
+        np.testing.assert_array_equal(merged_df["Country"].cat.codes.values, [1, 0, -1, 2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from preparation.trends import fit_trends, forecast_trends, rank_by_momentum
+
+
+class TestTrends(unittest.TestCase):
+    """Test case for batched trend fitting and forecasting"""
+
+    def setUp(self) -> None:
+        years = pd.Index(range(2011, 2021), name="year")
+        t = np.arange(10, dtype=float)
+        self.popularity = pd.DataFrame(index=years, data={
+            "Python": 10 + 2 * t,
+            "Perl": 20 * 0.9 ** t,
+            # flat, then growing from 2016
+            "Kotlin": np.where(t < 5, 1.0, 5.0 + 3 * (t - 5)),
+            "Rust": [np.nan, np.nan, 1, 2, 3, 4, 5, 6, 7, 8],
+        })
+
+    def test_fit_trends(self):
+        """Slopes, growth rates and change points are fitted for every language"""
+        trends = fit_trends(self.popularity)
+        self.assertAlmostEqual(trends.loc["Python", "slope"], 2)
+        self.assertAlmostEqual(trends.loc["Python", "r2"], 1)
+        self.assertAlmostEqual(trends.loc["Perl", "growth rate"], -10)
+        self.assertAlmostEqual(trends.loc["Rust", "slope"], 1)
+        self.assertEqual(trends.loc["Kotlin", "change point"], 2016)
+        self.assertAlmostEqual(trends.loc["Kotlin", "slope after"], 3)
+        # years order does not matter
+        shuffled = self.popularity.sample(frac=1, random_state=0)
+        pd.testing.assert_frame_equal(fit_trends(shuffled), trends)
+
+    def test_forecast_trends(self):
+        """Forecasts extend linear trends, within prediction intervals"""
+        forecast = forecast_trends(self.popularity[["Python", "Kotlin"]], horizon=2)
+        self.assertListEqual(list(forecast["forecast"].index), [2021, 2022])
+        self.assertAlmostEqual(forecast["forecast"].loc[2021, "Python"], 30)
+        self.assertTrue((forecast["lower"]["Kotlin"] < forecast["forecast"]["Kotlin"]).all())
+        self.assertTrue((forecast["upper"]["Kotlin"] > forecast["forecast"]["Kotlin"]).all())
+
+    def test_rank_by_momentum(self):
+        """Languages are ranked by slope"""
+        self.assertListEqual(list(rank_by_momentum(self.popularity, last_years=4).index),
+                             ["Kotlin", "Python", "Rust", "Perl"])
+
+
+if __name__ == "__main__":
+    unittest.main()